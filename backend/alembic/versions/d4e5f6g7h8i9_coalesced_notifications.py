@@ -0,0 +1,34 @@
+"""coalesced vote notifications
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d4e5f6g7h8i9"
+down_revision: Union[str, None] = "c3d4e5f6g7h8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.add_column(sa.Column("group_key", sa.String(64), nullable=True))
+        batch_op.add_column(
+            sa.Column("actor_count", sa.Integer(), nullable=False, server_default=sa.text("1"))
+        )
+        batch_op.add_column(sa.Column("recent_actor_ids", sa.String(120), nullable=True))
+        batch_op.create_unique_constraint("uq_notification_group", ["user_id", "group_key"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.drop_constraint("uq_notification_group", type_="unique")
+        batch_op.drop_column("recent_actor_ids")
+        batch_op.drop_column("actor_count")
+        batch_op.drop_column("group_key")
@@ -0,0 +1,33 @@
+"""add unread_notification_count to users
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e5f6g7h8i9j0"
+down_revision: Union[str, None] = "d4e5f6g7h8i9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("unread_notification_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    # Backfill from existing unread notifications
+    op.execute(
+        "UPDATE users SET unread_notification_count = ("
+        "SELECT COUNT(*) FROM notifications "
+        "WHERE notifications.user_id = users.id AND notifications.is_read = false)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "unread_notification_count")
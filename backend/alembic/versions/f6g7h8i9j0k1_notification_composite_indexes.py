@@ -0,0 +1,30 @@
+"""composite indexes on notifications
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "f6g7h8i9j0k1"
+down_revision: Union[str, None] = "e5f6g7h8i9j0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_notifications_user_created", "notifications", ["user_id", "created_at"])
+    # Owned by b2c3d4e5f6g7; only databases built by create_all lack it
+    op.create_index(
+        "ix_notifications_user_unread", "notifications", ["user_id", "is_read"], if_not_exists=True
+    )
+    # Covered by the composite indexes' leading column
+    op.drop_index("ix_notifications_user_id", table_name="notifications")
+
+
+def downgrade() -> None:
+    op.create_index("ix_notifications_user_id", "notifications", ["user_id"])
+    op.drop_index("ix_notifications_user_created", table_name="notifications")
@@ -0,0 +1,34 @@
+"""add video_count to categories
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "g7h8i9j0k1l2"
+down_revision: Union[str, None] = "f6g7h8i9j0k1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "categories",
+        sa.Column("video_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    # Backfill with the number of active videos per category
+    op.execute(
+        "UPDATE categories SET video_count = ("
+        "SELECT COUNT(*) FROM video_categories "
+        "JOIN videos ON videos.id = video_categories.video_id "
+        "WHERE video_categories.category_id = categories.id AND videos.is_active = true)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("categories", "video_count")
@@ -0,0 +1,41 @@
+"""add video_neighbors and job_watermarks
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "h8i9j0k1l2m3"
+down_revision: Union[str, None] = "g7h8i9j0k1l2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_neighbors",
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("video_id", sa.String(36), sa.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("neighbor_id", sa.String(36), sa.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "video_id", "rank"),
+    )
+    op.create_index("ix_video_neighbors_neighbor_id", "video_neighbors", ["neighbor_id"])
+    op.create_table(
+        "job_watermarks",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_watermarks")
+    op.drop_index("ix_video_neighbors_neighbor_id", table_name="video_neighbors")
+    op.drop_table("video_neighbors")
@@ -0,0 +1,35 @@
+"""add timeline_entries
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "i9j0k1l2m3n4"
+down_revision: Union[str, None] = "h8i9j0k1l2m3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "timeline_entries",
+        sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("video_id", sa.String(36), sa.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("author_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "video_id"),
+    )
+    op.create_index(
+        "ix_timeline_entries_user_created", "timeline_entries", ["user_id", "created_at", "video_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timeline_entries_user_created", table_name="timeline_entries")
+    op.drop_table("timeline_entries")
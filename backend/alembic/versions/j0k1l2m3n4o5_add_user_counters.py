@@ -0,0 +1,39 @@
+"""add followers_count, following_count and video_count to users
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "j0k1l2m3n4o5"
+down_revision: Union[str, None] = "i9j0k1l2m3n4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("followers_count", "following_count", "video_count")
+
+
+def upgrade() -> None:
+    for name in COLUMNS:
+        op.add_column(
+            "users",
+            sa.Column(name, sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
+    # Backfill from existing follows and active videos
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT COUNT(*) FROM user_follows WHERE user_follows.following_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM user_follows WHERE user_follows.follower_id = users.id), "
+        "video_count = (SELECT COUNT(*) FROM videos "
+        "WHERE videos.submitted_by = users.id AND videos.is_active = true)"
+    )
+
+
+def downgrade() -> None:
+    for name in reversed(COLUMNS):
+        op.drop_column("users", name)
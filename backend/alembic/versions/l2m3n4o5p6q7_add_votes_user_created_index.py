@@ -0,0 +1,26 @@
+"""composite (user_id, created_at) index on votes
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "l2m3n4o5p6q7"
+down_revision: Union[str, None] = "k1l2m3n4o5p6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_votes_user_created", "votes", ["user_id", "created_at"])
+    # Covered by the composite index's leading column
+    op.drop_index("ix_votes_user_id", table_name="votes")
+
+
+def downgrade() -> None:
+    op.create_index("ix_votes_user_id", "votes", ["user_id"])
+    op.drop_index("ix_votes_user_created", table_name="votes")
@@ -0,0 +1,49 @@
+"""fractional playlist positions
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "m3n4o5p6q7r8"
+down_revision: Union[str, None] = "l2m3n4o5p6q7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("playlist_videos") as batch_op:
+        batch_op.alter_column(
+            "position", existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=False
+        )
+    # Spread the old 1..n positions apart so moves have room between neighbours
+    op.execute(f"UPDATE playlist_videos SET position = position * {POSITION_GAP}")
+    op.create_index(
+        "ix_playlist_videos_playlist_position", "playlist_videos", ["playlist_id", "position"]
+    )
+    # Covered by the composite index's leading column
+    op.drop_index("ix_playlist_videos_playlist_id", table_name="playlist_videos")
+
+
+def downgrade() -> None:
+    op.create_index("ix_playlist_videos_playlist_id", "playlist_videos", ["playlist_id"])
+    op.drop_index("ix_playlist_videos_playlist_position", table_name="playlist_videos")
+    # Collapse fractional ranks back to dense integers
+    op.execute(
+        "UPDATE playlist_videos SET position = ("
+        "SELECT COUNT(*) FROM playlist_videos AS pv "
+        "WHERE pv.playlist_id = playlist_videos.playlist_id "
+        "AND (pv.position < playlist_videos.position "
+        "OR (pv.position = playlist_videos.position AND pv.id <= playlist_videos.id)))"
+    )
+    with op.batch_alter_table("playlist_videos") as batch_op:
+        batch_op.alter_column(
+            "position", existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=False
+        )
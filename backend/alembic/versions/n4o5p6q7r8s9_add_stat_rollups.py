@@ -0,0 +1,39 @@
+"""add stat_rollups and admin dashboard indexes
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "n4o5p6q7r8s9"
+down_revision: Union[str, None] = "m3n4o5p6q7r8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the first run of tasks.stat_rollups (a full rebuild)
+    op.create_table(
+        "stat_rollups",
+        sa.Column("granularity", sa.String(8), nullable=False),
+        sa.Column("metric", sa.String(32), nullable=False),
+        sa.Column("bucket", sa.DateTime(), nullable=False),
+        sa.Column("dimension", sa.String(32), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("granularity", "metric", "bucket", "dimension"),
+    )
+    op.create_index("ix_users_created_at", "users", ["created_at"])
+    op.create_index("ix_reports_status_created", "reports", ["status", "created_at"])
+    op.create_index("ix_feedbacks_status_created", "feedbacks", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feedbacks_status_created", table_name="feedbacks")
+    op.drop_index("ix_reports_status_created", table_name="reports")
+    op.drop_index("ix_users_created_at", table_name="users")
+    op.drop_table("stat_rollups")
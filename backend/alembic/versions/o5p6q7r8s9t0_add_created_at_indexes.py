@@ -0,0 +1,29 @@
+"""created_at indexes for the stat rollup scans
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "o5p6q7r8s9t0"
+down_revision: Union[str, None] = "n4o5p6q7r8s9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Declared on the model but never created by a migration; databases
+    # built by create_all already have it
+    op.create_index("ix_votes_created_at", "votes", ["created_at"], if_not_exists=True)
+    # (status, created_at) cannot serve a bare created_at range
+    op.create_index("ix_reports_created_at", "reports", ["created_at"])
+    op.create_index("ix_feedbacks_created_at", "feedbacks", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_feedbacks_created_at", table_name="feedbacks")
+    op.drop_index("ix_reports_created_at", table_name="reports")
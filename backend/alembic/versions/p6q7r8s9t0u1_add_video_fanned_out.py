@@ -0,0 +1,45 @@
+"""videos.fanned_out marker for the following feed
+
+Revision ID: p6q7r8s9t0u1
+Revises: o5p6q7r8s9t0
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "p6q7r8s9t0u1"
+down_revision: Union[str, None] = "o5p6q7r8s9t0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("videos") as batch_op:
+        batch_op.add_column(
+            sa.Column("fanned_out", sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+    # Whether a video was fanned out is not recorded anywhere; treat it as
+    # fanned out if any timeline holds it or its author has no followers.
+    # Everything else (including videos skipped for authors who have since
+    # dropped below the threshold) is served by fan-out on read.
+    op.execute(
+        "UPDATE videos SET fanned_out = true"
+        " WHERE EXISTS (SELECT 1 FROM timeline_entries t WHERE t.video_id = videos.id)"
+        " OR NOT EXISTS (SELECT 1 FROM user_follows f WHERE f.following_id = videos.submitted_by)"
+    )
+    op.create_index(
+        "ix_videos_unfanned_author_created",
+        "videos",
+        ["submitted_by", "created_at"],
+        postgresql_where=sa.text("NOT fanned_out"),
+        sqlite_where=sa.text("NOT fanned_out"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_unfanned_author_created", table_name="videos")
+    with op.batch_alter_table("videos") as batch_op:
+        batch_op.drop_column("fanned_out")
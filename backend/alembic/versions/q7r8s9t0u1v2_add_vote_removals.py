@@ -0,0 +1,33 @@
+"""add vote_removals for counter reconciliation
+
+Revision ID: q7r8s9t0u1v2
+Revises: p6q7r8s9t0u1
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "q7r8s9t0u1v2"
+down_revision: Union[str, None] = "p6q7r8s9t0u1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vote_removals",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("video_id", sa.String(36), sa.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_vote_removals_video_id", "vote_removals", ["video_id"])
+    op.create_index("ix_vote_removals_created_at", "vote_removals", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vote_removals_created_at", table_name="vote_removals")
+    op.drop_index("ix_vote_removals_video_id", table_name="vote_removals")
+    op.drop_table("vote_removals")
@@ -0,0 +1,23 @@
+"""index videos.updated_at for incremental sitemap rebuilds
+
+Revision ID: r8s9t0u1v2w3
+Revises: q7r8s9t0u1v2
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "r8s9t0u1v2w3"
+down_revision: Union[str, None] = "q7r8s9t0u1v2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_videos_updated_at", "videos", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_updated_at", table_name="videos")
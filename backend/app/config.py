@@ -27,6 +27,26 @@ class Settings(BaseSettings):
     cookie_samesite: str = "none"  # "lax" when backend is on same domain (e.g. api.buzzclip.jp)
     discord_webhook_url: str = ""  # Discord webhook for admin notifications
     mass_post_threshold: int = 10  # alert if user posts more than this in 24h
+    notification_group_window_hours: int = 24  # votes on one video within this window share a notification
+    notification_retention_days: int = 90  # notifications older than this are pruned
+    notification_max_per_user: int = 500  # keep at most this many notifications per user
+    vote_buffer_enabled: bool = False  # defer videos.vote_count updates to batched flushes
+    vote_buffer_flush_ms: int = 250
+    rate_limit_storage_uri: str = "memory://"  # sqlite:///./ratelimit.db or redis://host:6379
+    rate_limit_flush_interval: float = 1.0  # seconds between batched counter flushes (sqlite)
+    rate_limit_max_keys: int = 100_000  # per-worker cap on in-memory limiter keys (sqlite)
+    compression_min_size: int = 1024  # bytes; smaller responses are sent uncompressed
+    compression_cache_size: int = 512  # cached compressed bodies per worker
+    sitemap_shard_size: int = 5000  # videos per sitemap shard
+    category_registry_ttl: int = 60  # seconds before a worker reloads categories
+    related_top_k: int = 20  # neighbors stored per video in the related index
+    covote_top_k: int = 50  # co-vote candidates stored per video for the for-you feed
+    feed_recent_votes: int = 50  # a user's latest votes used to seed the for-you feed
+    timeline_fanout_max_followers: int = 10_000  # above this, videos are merged into timelines at read time
+    timeline_fanout_batch: int = 1000  # follower timelines written per fan-out transaction
+    timeline_backfill: int = 20  # latest videos copied into a timeline on follow
+    follow_suggestions_top_k: int = 20  # follow suggestions stored per user
+    stats_hourly_hours: int = 48  # hourly stat rollups are kept this far back; older history is daily
 
     @property
     def effective_cookie_secure(self) -> bool:
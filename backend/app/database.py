@@ -2,6 +2,8 @@ import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -46,6 +48,17 @@ def utcnow() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
+def dialect_insert(session: AsyncSession, table):
+    """Return an INSERT construct supporting ON CONFLICT for the session's dialect.
+
+    PostgreSQL and SQLite expose the same on_conflict_do_nothing /
+    on_conflict_do_update API, so callers can build upserts portably.
+    """
+    if session.bind.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
+
 async def get_session() -> AsyncSession:
     async with async_session() as session:
         yield session
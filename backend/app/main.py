@@ -6,11 +6,11 @@ from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
-from app.database import init_db
+from app.database import async_session, init_db
 from app.services.auth import COOKIE_NAME
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,7 @@ from app.routers import (
     auth,
     badges,
     categories,
+    feed,
     feedback,
     follows,
     notifications,
@@ -30,7 +31,18 @@ from app.routers import (
     videos,
     votes,
 )
+from app.services.category_registry import category_registry
+from app.services.sitemap import refresh_sitemap
+from app.services.timeline import timeline_fanout
+from app.services.vote_buffer import vote_buffer
+from app.tasks.follow_suggestions import refresh_follow_suggestions
+from app.tasks.notification_retention import prune_notifications
+from app.tasks.playlist_rebalance import rebalance_playlists
+from app.tasks.reconcile_counters import reconcile_counters
+from app.tasks.related_index import refresh_related_index
 from app.tasks.snapshot import take_vote_snapshots
+from app.tasks.stat_rollups import refresh_stat_rollups
+from app.utils.compression import CompressionMiddleware
 from app.utils.limiter import limiter
 
 
@@ -43,11 +55,25 @@ logging.basicConfig(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    async with async_session() as session:
+        await category_registry.refresh(session)
     scheduler = AsyncIOScheduler()
     scheduler.add_job(take_vote_snapshots, "interval", minutes=15)
+    scheduler.add_job(prune_notifications, "interval", hours=6)
+    scheduler.add_job(reconcile_counters, "interval", hours=1)
+    scheduler.add_job(refresh_sitemap, "interval", minutes=10)
+    scheduler.add_job(refresh_related_index, "interval", minutes=30)
+    scheduler.add_job(refresh_follow_suggestions, "interval", hours=6)
+    scheduler.add_job(rebalance_playlists, "interval", minutes=5)
+    scheduler.add_job(refresh_stat_rollups, "interval", minutes=10)
     scheduler.start()
+    if settings.vote_buffer_enabled:
+        vote_buffer.start(settings.vote_buffer_flush_ms / 1000)
+    timeline_fanout.start()
     yield
     scheduler.shutdown()
+    await timeline_fanout.stop()
+    await vote_buffer.stop()
 
 
 app = FastAPI(
@@ -55,6 +81,7 @@ app = FastAPI(
     description="X(Twitter)動画キュレーションプラットフォーム",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.state.limiter = limiter
@@ -97,7 +124,7 @@ app.add_exception_handler(Exception, _unhandled_exception_handler)
 # FastAPI/Starlette: last-added middleware = outermost (runs first).
 # We need CORSMiddleware to be outermost so its headers are present
 # on ALL responses, including CSRF 403 rejections.
-# Order of addition: CSRF (1st/innermost) → security → CORS (last/outermost)
+# Order of addition: CSRF (1st/innermost) → security → compression → CORS (last/outermost)
 
 @app.middleware("http")
 async def csrf_protection(request: Request, call_next):
@@ -145,6 +172,13 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    cache_size=settings.compression_cache_size,
+)
+
+
 # CORSMiddleware MUST be added last so it wraps all other middleware.
 # This ensures CORS headers are present on every response, including
 # 403s from CSRF protection — otherwise the browser can't read errors.
@@ -161,6 +195,7 @@ app.include_router(admin.router)
 app.include_router(auth.router)
 app.include_router(badges.router)
 app.include_router(categories.router)
+app.include_router(feed.router)
 app.include_router(feedback.router)
 app.include_router(follows.router)
 app.include_router(notifications.router)
@@ -1,22 +1,29 @@
 from app.database import Base
 from app.models.category import Category
 from app.models.feedback import Feedback
+from app.models.job_watermark import JobWatermark
 from app.models.notification import Notification
 from app.models.playlist import Playlist
 from app.models.playlist_video import PlaylistVideo
+from app.models.stat_rollup import StatRollup
 from app.models.user import User
 from app.models.user_follow import UserFollow
 from app.models.user_hidden_category import UserHiddenCategory
 from app.models.user_mute import UserMute
+from app.models.user_suggestion import UserSuggestion
 from app.models.tag import Tag, video_tags
+from app.models.timeline_entry import TimelineEntry
 from app.models.video import Video, video_categories
+from app.models.video_neighbor import VideoNeighbor
 from app.models.vote import Vote
+from app.models.vote_removal import VoteRemoval
 from app.models.vote_snapshot import VoteSnapshot
 from app.models.report import Report
 
 __all__ = [
     "Base", "User", "UserFollow", "UserHiddenCategory", "UserMute",
-    "Video", "Vote", "VoteSnapshot", "Category", "Report", "video_categories",
+    "Video", "Vote", "VoteRemoval", "VoteSnapshot", "Category", "Report", "video_categories",
     "Playlist", "PlaylistVideo", "Notification", "Feedback",
-    "Tag", "video_tags",
+    "Tag", "video_tags", "VideoNeighbor", "JobWatermark",
+    "TimelineEntry", "UserSuggestion", "StatRollup",
 ]
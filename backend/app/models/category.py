@@ -15,6 +15,8 @@ class Category(Base):
     icon: Mapped[str | None] = mapped_column(String(10), nullable=True)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Active videos in this category, maintained on submit/update/delete/moderation
+    video_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, default=utcnow
     )
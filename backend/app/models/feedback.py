@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base, utcnow
@@ -9,6 +9,10 @@ from app.database import Base, utcnow
 
 class Feedback(Base):
     __tablename__ = "feedbacks"
+    __table_args__ = (
+        # Admin status filters and counts
+        Index("ix_feedbacks_status_created", "status", "created_at"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -20,5 +24,5 @@ class Feedback(Base):
     body: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="new")
     created_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=utcnow
+        nullable=False, default=utcnow, index=True
     )
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base, utcnow
+
+
+class JobWatermark(Base):
+    """Progress marker for incremental background jobs (rows before it are done)."""
+
+    __tablename__ = "job_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        nullable=False, default=utcnow, onupdate=utcnow
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, ForeignKey, String
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base, utcnow
@@ -8,10 +8,17 @@ from app.database import Base, utcnow
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Coalesced notifications share a group_key; NULL keys never conflict
+        UniqueConstraint("user_id", "group_key", name="uq_notification_group"),
+        # Listing (newest first) and unread lookups per user
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+        Index("ix_notifications_user_unread", "user_id", "is_read"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     type: Mapped[str] = mapped_column(String(20), nullable=False)
     actor_id: Mapped[str] = mapped_column(
@@ -20,6 +27,10 @@ class Notification(Base):
     video_id: Mapped[str | None] = mapped_column(
         String(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=True
     )
+    group_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    actor_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Latest actors first, comma-separated (see services.notifications)
+    recent_actor_ids: Mapped[str | None] = mapped_column(String(120), nullable=True)
     is_read: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, default=utcnow, index=True
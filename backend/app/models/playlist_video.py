@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base, utcnow
@@ -10,16 +10,18 @@ class PlaylistVideo(Base):
     __tablename__ = "playlist_videos"
     __table_args__ = (
         UniqueConstraint("playlist_id", "video_id", name="uq_playlist_video"),
+        Index("ix_playlist_videos_playlist_position", "playlist_id", "position"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     playlist_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("playlists.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("playlists.id", ondelete="CASCADE"), nullable=False
     )
     video_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True
     )
-    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Fractional rank; see services.playlist_positions
+    position: Mapped[float] = mapped_column(Float, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, default=utcnow
     )
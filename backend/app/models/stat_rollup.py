@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+GRANULARITY_DAY = "day"
+GRANULARITY_HOUR = "hour"  # kept for the recent window only (settings.stats_hourly_hours)
+
+
+class StatRollup(Base):
+    """Count of rows created per time bucket, one row per (metric, bucket, dimension).
+
+    Written by app.tasks.stat_rollups; read by the admin dashboard instead of
+    scanning the source tables.
+    """
+
+    __tablename__ = "stat_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)
+    # e.g. the platform for video submissions; "" when the metric has none
+    dimension: Mapped[str] = mapped_column(String(32), primary_key=True, default="")
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
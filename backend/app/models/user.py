@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, String, Text
+from sqlalchemy import Boolean, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base, utcnow
@@ -18,8 +18,14 @@ class User(Base):
     password_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     is_admin: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Denormalized; maintained by services.notifications
+    unread_notification_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Denormalized; maintained by services.user_counters
+    followers_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    following_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    video_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=utcnow
+        nullable=False, default=utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         nullable=False,
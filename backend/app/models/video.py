@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Table, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base, utcnow
@@ -15,6 +15,13 @@ video_categories = Table(
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # Following feed: videos merged at read time (see services.timeline)
+        Index(
+            "ix_videos_unfanned_author_created", "submitted_by", "created_at",
+            postgresql_where=text("NOT fanned_out"), sqlite_where=text("NOT fanned_out"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     url: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
@@ -31,6 +38,8 @@ class Video(Base):
     comment: Mapped[str | None] = mapped_column(String(200), nullable=True)
     was_trending: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Set once copied into follower timelines; videos without it are read directly
+    fanned_out: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     created_at: Mapped[datetime] = mapped_column(
         nullable=False, default=utcnow, index=True
     )
@@ -38,6 +47,7 @@ class Video(Base):
         nullable=False,
         default=utcnow,
         onupdate=utcnow,
+        index=True,
     )
 
     submitter = relationship("User", back_populates="videos", lazy="select")
@@ -0,0 +1,27 @@
+from sqlalchemy import Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+KIND_RELATED = "related"  # tags + categories + co-votes
+KIND_COVOTE = "covote"  # co-votes only, candidates for the for-you feed
+
+
+class VideoNeighbor(Base):
+    """Precomputed top-K similar videos, one ranked list per (kind, video).
+
+    Written by background index jobs (see app.tasks.related_index) and read
+    with a single primary-key range scan.
+    """
+
+    __tablename__ = "video_neighbors"
+
+    kind: Mapped[str] = mapped_column(String(16), primary_key=True)
+    video_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    neighbor_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
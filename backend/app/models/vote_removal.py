@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base, utcnow
+
+
+class VoteRemoval(Base):
+    """Recently deleted vote whose counter decrement may still be buffered.
+
+    Written only with VOTE_BUFFER_ENABLED, so counter reconciliation can
+    skip the video until every worker has flushed; pruned by that job.
+    """
+
+    __tablename__ = "vote_removals"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    video_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, default=utcnow, index=True
+    )
@@ -1,16 +1,25 @@
+from datetime import datetime, timedelta
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_session
+from app.database import get_session, utcnow
 from app.models.feedback import Feedback
 from app.models.report import Report
+from app.models.stat_rollup import GRANULARITY_DAY, GRANULARITY_HOUR, StatRollup
 from app.models.user import User
 from app.models.video import Video
 from app.schemas.feedback import FeedbackStatusUpdate
 from app.services.auth import get_admin_user
+from app.services.category_registry import category_registry
+from app.services.moderation import set_users_active, set_videos_active, video_filter
+from app.services.watermarks import get_watermark
+from app.tasks.stat_rollups import (
+    METRICS as ROLLUP_METRICS, WATERMARK as ROLLUP_WATERMARK, floor_bucket, tail_start,
+)
+from app.utils.metrics import metrics
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -27,6 +36,24 @@ class UserStatusUpdate(BaseModel):
     is_active: bool
 
 
+class BulkVideoModeration(BaseModel):
+    # Selection: any combination, at least one of video_ids / submitted_by
+    video_ids: list[str] | None = Field(None, max_length=1000)
+    submitted_by: list[str] | None = Field(None, max_length=100)
+    since_hours: int | None = Field(None, ge=1, le=24 * 30)
+    is_active: bool
+    resolve_reports: bool = False
+    dry_run: bool = False
+
+
+class BulkUserModeration(BaseModel):
+    user_ids: list[str] = Field(min_length=1, max_length=100)
+    is_active: bool
+    # On deactivation, also deactivate their videos and resolve reports on them
+    include_videos: bool = False
+    dry_run: bool = False
+
+
 @router.get("/reports")
 async def list_reports(
     page: int = Query(1, ge=1),
@@ -103,15 +130,23 @@ async def list_videos(
     admin: User = Depends(get_admin_user),
     session: AsyncSession = Depends(get_session),
 ):
-    query = select(Video)
-
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await session.execute(count_query)).scalar() or 0
-
-    query = query.order_by(Video.created_at.desc())
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await session.execute(query)
-    videos = list(result.scalars().all())
+    total = (await session.execute(select(func.count()).select_from(Video))).scalar() or 0
+
+    query = (
+        select(
+            Video.id,
+            Video.title,
+            Video.url,
+            Video.platform,
+            Video.is_active,
+            Video.vote_count,
+            Video.created_at,
+        )
+        .order_by(Video.created_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    videos = (await session.execute(query)).all()
 
     return {
         "items": [
@@ -140,35 +175,48 @@ async def update_video_status(
     admin: User = Depends(get_admin_user),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(Video).where(Video.id == video_id).options(selectinload(Video.tags))
-    )
-    video = result.scalar_one_or_none()
-    if video is None:
+    exists = (await session.execute(select(Video.id).where(Video.id == video_id))).first()
+    if exists is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Video not found",
         )
 
-    was_active = video.is_active
-    video.is_active = body.is_active
-
-    # Update tag video_count on activation change
-    if was_active and not body.is_active:
-        for tag in video.tags:
-            tag.video_count = max(0, tag.video_count - 1)
-    elif not was_active and body.is_active:
-        for tag in video.tags:
-            tag.video_count += 1
-
+    await set_videos_active(session, [Video.id == video_id], body.is_active)
     await session.commit()
+    category_registry.invalidate()
 
     return {
-        "id": video.id,
-        "is_active": video.is_active,
+        "id": video_id,
+        "is_active": body.is_active,
     }
 
 
+@router.post("/videos/bulk")
+async def bulk_update_video_status(
+    body: BulkVideoModeration,
+    admin: User = Depends(get_admin_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Activate or deactivate many videos in one transaction; dry_run only reports counts."""
+    if body.video_ids is None and body.submitted_by is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="video_ids または submitted_by を指定してください",
+        )
+    counts = await set_videos_active(
+        session,
+        video_filter(body.video_ids, body.submitted_by, body.since_hours),
+        body.is_active,
+        resolve_reports=body.resolve_reports,
+        dry_run=body.dry_run,
+    )
+    if not body.dry_run:
+        await session.commit()
+        category_registry.invalidate()
+    return {"dry_run": body.dry_run, **counts}
+
+
 # --- Feedbacks ---
 
 
@@ -289,32 +337,77 @@ async def update_user_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="自分自身のステータスは変更できません",
         )
-    result = await session.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if user is None:
+    exists = (await session.execute(select(User.id).where(User.id == user_id))).first()
+    if exists is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    user.is_active = body.is_active
+    await set_users_active(session, [user_id], body.is_active)
     await session.commit()
-    return {"id": user.id, "is_active": user.is_active}
+    return {"id": user_id, "is_active": body.is_active}
+
+
+@router.post("/users/bulk")
+async def bulk_update_user_status(
+    body: BulkUserModeration,
+    admin: User = Depends(get_admin_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Activate or deactivate many users in one transaction; dry_run only reports counts."""
+    if admin.id in body.user_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="自分自身のステータスは変更できません",
+        )
+    counts = await set_users_active(session, body.user_ids, body.is_active, dry_run=body.dry_run)
+    if body.include_videos and not body.is_active:
+        counts.update(await set_videos_active(
+            session,
+            video_filter(submitted_by=body.user_ids),
+            False,
+            resolve_reports=True,
+            dry_run=body.dry_run,
+        ))
+    if not body.dry_run:
+        await session.commit()
+        category_registry.invalidate()
+    return {"dry_run": body.dry_run, **counts}
 
 
 # --- Stats ---
 
 
+async def _created_total(session: AsyncSession, metric: str, created_at, watermark: datetime | None) -> int:
+    """Rows ever created: daily rollups before tail_start() plus a count of rows since (a full count before the first run).
+
+    The tail starts before the watermark so rows that committed after the
+    last run but carry an earlier created_at are not missed.
+    """
+    rolled_up = 0
+    tail = select(func.count()).select_from(created_at.table)
+    if watermark is not None:
+        cut = tail_start(watermark)
+        rolled_up = (await session.execute(
+            select(func.coalesce(func.sum(StatRollup.count), 0)).where(
+                StatRollup.granularity == GRANULARITY_DAY,
+                StatRollup.metric == metric,
+                StatRollup.bucket < cut,
+            )
+        )).scalar() or 0
+        tail = tail.where(created_at >= cut)
+    return rolled_up + ((await session.execute(tail)).scalar() or 0)
+
+
 @router.get("/stats")
 async def get_stats(
     admin: User = Depends(get_admin_user),
     session: AsyncSession = Depends(get_session),
 ):
-    total_users = (await session.execute(
-        select(func.count()).select_from(User)
-    )).scalar() or 0
-    total_videos = (await session.execute(
-        select(func.count()).select_from(Video)
-    )).scalar() or 0
+    # Totals = daily rollups + rows created since just before the rollup watermark
+    watermark = await get_watermark(session, ROLLUP_WATERMARK)
+    total_users = await _created_total(session, "signups", User.created_at, watermark)
+    total_videos = await _created_total(session, "videos", Video.created_at, watermark)
     pending_reports = (await session.execute(
         select(func.count()).select_from(Report).where(Report.status == "pending")
     )).scalar() or 0
@@ -328,3 +421,45 @@ async def get_stats(
         "pending_reports": pending_reports,
         "new_feedbacks": new_feedbacks,
     }
+
+
+@router.get("/stats/timeseries")
+async def get_stats_timeseries(
+    metric: str = Query(pattern=f"^({'|'.join(ROLLUP_METRICS)})$"),
+    granularity: str = Query(GRANULARITY_DAY, pattern=f"^({GRANULARITY_DAY}|{GRANULARITY_HOUR})$"),
+    days: int = Query(30, ge=1, le=366),
+    admin: User = Depends(get_admin_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Created-row counts per bucket (and dimension, e.g. video platform), oldest first.
+
+    Buckets are complete up to as_of; hourly data covers the recent window only.
+    """
+    since = floor_bucket(utcnow() - timedelta(days=days), granularity)
+    rows = (await session.execute(
+        select(StatRollup.bucket, StatRollup.dimension, StatRollup.count)
+        .where(
+            StatRollup.granularity == granularity,
+            StatRollup.metric == metric,
+            StatRollup.bucket >= since,
+        )
+        .order_by(StatRollup.bucket, StatRollup.dimension)
+    )).all()
+    as_of = await get_watermark(session, ROLLUP_WATERMARK)
+    return {
+        "metric": metric,
+        "granularity": granularity,
+        "as_of": as_of.isoformat() if as_of else None,
+        "items": [
+            {"bucket": r.bucket.isoformat(), "dimension": r.dimension, "count": r.count}
+            for r in rows
+        ],
+    }
+
+
+@router.get("/metrics")
+async def get_metrics(
+    admin: User = Depends(get_admin_user),
+):
+    """In-process metrics for the worker that served this request."""
+    return metrics.snapshot()
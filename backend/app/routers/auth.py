@@ -5,7 +5,9 @@ import time
 import uuid
 from collections import defaultdict
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from PIL import Image
 from pydantic import BaseModel
 from sqlalchemy import delete, select
@@ -21,6 +23,7 @@ from app.models.video import Video
 from app.models.vote import Vote
 from app.schemas.common import StatusResponse, MessageResponse
 from app.schemas.user import AuthResponse, LoginRequest, SignupRequest, UserBriefResponse, UserResponse, UserUpdateRequest
+from app.schemas.video import VideoCursorListResponse
 from app.services.auth import (
     REFRESH_COOKIE_NAME,
     clear_auth_cookies,
@@ -30,8 +33,10 @@ from app.services.auth import (
     verify_password,
     verify_refresh_token,
 )
+from app.services.video_reads import card_query, load_cards, load_voted_ids
+from app.utils.cursor import before_cursor, encode_cursor
 from app.utils.limiter import limiter
-from app.utils.response import video_to_response
+from app.utils.response import card_ndjson, cards_response, sections_response
 
 logger = logging.getLogger(__name__)
 
@@ -260,42 +265,134 @@ async def delete_avatar(
     return UserResponse.model_validate(current_user)
 
 
+PROFILE_PAGE_SIZE = 20
+EXPORT_BATCH = 200
+
+
+def _submitted_query(user: User):
+    return card_query(Video.created_at.label("sort_at"), Video.id.label("sort_id")).where(
+        Video.submitted_by == user.id, Video.is_active == True  # noqa: E712
+    ), Video.created_at, Video.id
+
+
+def _voted_query(user: User):
+    # Ordered by vote time; served by ix_votes_user_created
+    return card_query(Vote.created_at.label("sort_at"), Vote.id.label("sort_id")).join(
+        Vote, Vote.video_id == Video.id
+    ).where(
+        Vote.user_id == user.id, Video.is_active == True  # noqa: E712
+    ), Vote.created_at, Vote.id
+
+
+async def _profile_page(session: AsyncSession, section, cursor: str | None, limit: int, lite: bool):
+    """One keyset page of a profile section. Returns (key rows, cards, next cursor)."""
+    query, sort_col, id_col = section
+    rows = (await session.execute(
+        query.where(*before_cursor(sort_col, id_col, cursor))
+        .order_by(sort_col.desc(), id_col.desc())
+        .limit(limit + 1)
+    )).all()
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].sort_at, page[-1].sort_id) if len(rows) > limit else None
+    return page, await load_cards(session, page, lite=lite), next_cursor
+
+
 @router.get("/profile")
 async def get_profile(
+    limit: int = Query(PROFILE_PAGE_SIZE, ge=1, le=100),
+    lite: bool = Query(False),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    # Get submitted videos
-    result = await session.execute(
-        select(Video)
-        .where(Video.submitted_by == current_user.id, Video.is_active == True)  # noqa: E712
-        .options(selectinload(Video.submitter), selectinload(Video.categories), selectinload(Video.tags))
-        .order_by(Video.created_at.desc())
+    """First page of each section; fetch more via /profile/submitted and /profile/voted."""
+    _, submitted, submitted_cursor = await _profile_page(
+        session, _submitted_query(current_user), None, limit, lite
     )
-    submitted_videos = list(result.scalars().all())
-
-    # Get voted videos
-    result = await session.execute(
-        select(Video)
-        .join(Vote, Vote.video_id == Video.id)
-        .where(Vote.user_id == current_user.id, Video.is_active == True)  # noqa: E712
-        .options(selectinload(Video.submitter), selectinload(Video.categories), selectinload(Video.tags))
-        .order_by(Video.created_at.desc())
+    _, voted, voted_cursor = await _profile_page(session, _voted_query(current_user), None, limit, lite)
+    submitted_voted_ids = await load_voted_ids(session, current_user, [c.id for c in submitted])
+
+    return sections_response(
+        {
+            "user": UserResponse.model_validate(current_user).model_dump(mode="json"),
+            "submitted_next_cursor": submitted_cursor,
+            "voted_next_cursor": voted_cursor,
+        },
+        {
+            "submitted_videos": (submitted, submitted_voted_ids),
+            # For voted videos, user_voted is always True
+            "voted_videos": (voted, {c.id for c in voted}),
+        },
     )
-    voted_videos = list(result.scalars().all())
 
-    # For voted videos, user_voted is always True
-    voted_ids = {v.id for v in voted_videos}
 
-    return {
-        "user": UserResponse.model_validate(current_user),
-        "submitted_videos": [
-            video_to_response(v, user_voted=v.id in voted_ids) for v in submitted_videos
-        ],
-        "voted_videos": [
-            video_to_response(v, user_voted=True) for v in voted_videos
-        ],
-    }
+@router.get("/profile/submitted", response_model=VideoCursorListResponse)
+async def get_profile_submitted(
+    cursor: str | None = Query(None),
+    limit: int = Query(PROFILE_PAGE_SIZE, ge=1, le=100),
+    lite: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    _, cards, next_cursor = await _profile_page(session, _submitted_query(current_user), cursor, limit, lite)
+    voted_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
+    return cards_response({"next_cursor": next_cursor}, "items", cards, voted_ids)
+
+
+@router.get("/profile/voted", response_model=VideoCursorListResponse)
+async def get_profile_voted(
+    cursor: str | None = Query(None),
+    limit: int = Query(PROFILE_PAGE_SIZE, ge=1, le=100),
+    lite: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    _, cards, next_cursor = await _profile_page(session, _voted_query(current_user), cursor, limit, lite)
+    return cards_response({"next_cursor": next_cursor}, "items", cards, {c.id for c in cards})
+
+
+@router.get("/profile/export")
+@limiter.limit("5/hour")
+async def export_profile(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Full history as NDJSON: a user line, then submitted and voted videos, newest first."""
+    user_line = orjson.dumps(
+        {"section": "user", **UserResponse.model_validate(current_user).model_dump(mode="json")}
+    ) + b"\n"
+
+    async def lines():
+        # The dependency closes the session when this endpoint returns;
+        # it reconnects on first use here and is closed again at the end.
+        try:
+            yield user_line
+            for name, section in (("submitted", _submitted_query), ("voted", _voted_query)):
+                cursor = None
+                while True:
+                    rows, cards, cursor = await _profile_page(
+                        session, section(current_user), cursor, EXPORT_BATCH, False
+                    )
+                    if name == "voted":
+                        voted_ids = {c.id for c in cards}
+                    else:
+                        voted_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
+                    voted_at = {row.id: row.sort_at for row in rows}
+                    for card in cards:
+                        extra = {"section": name}
+                        if name == "voted":
+                            extra["voted_at"] = voted_at[card.id]
+                        yield card_ndjson(card, card.id in voted_ids, extra)
+                    if cursor is None:
+                        break
+        finally:
+            await session.close()
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="buzzclip-profile.ndjson"'},
+    )
 
 
 # --- Hidden Categories ---
@@ -1,46 +1,36 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
-from app.models.category import Category
-from app.models.video import Video, video_categories
 from app.schemas.video import CategoryResponse
+from app.services.category_registry import category_registry
+from app.utils import http_cache
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
 
 
 @router.get("", response_model=list[CategoryResponse])
 async def list_categories(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(
-            Category,
-            func.count(video_categories.c.video_id).label("video_count"),
-        )
-        .outerjoin(video_categories, Category.id == video_categories.c.category_id)
-        .outerjoin(
-            Video,
-            (Video.id == video_categories.c.video_id) & (Video.is_active == True),  # noqa: E712
-        )
-        .where(Category.is_active == True)  # noqa: E712
-        .group_by(Category.id)
-        .order_by(Category.sort_order)
-    )
+    # Served from the in-memory registry; counts are maintained on writes
+    await category_registry.ensure_fresh(session)
+    categories = category_registry.active()
 
-    items = []
-    for row in result:
-        cat = row[0]
-        count = row[1]
-        items.append(
-            CategoryResponse(
-                id=cat.id,
-                slug=cat.slug,
-                name_ja=cat.name_ja,
-                icon=cat.icon,
-                video_count=count,
-            )
-        )
+    etag = http_cache.make_etag(*((c.id, c.slug, c.name_ja, c.icon, c.video_count) for c in categories))
+    if (cached := http_cache.not_modified(request, etag, http_cache.CATEGORIES)) is not None:
+        return cached
+    http_cache.set_cache_headers(response, etag, http_cache.CATEGORIES)
 
-    return items
+    return [
+        CategoryResponse(
+            id=c.id,
+            slug=c.slug,
+            name_ja=c.name_ja,
+            icon=c.icon,
+            video_count=c.video_count,
+        )
+        for c in categories
+    ]
@@ -0,0 +1,150 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_session
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.models.user_hidden_category import UserHiddenCategory
+from app.models.user_mute import UserMute
+from app.models.video import Video, video_categories
+from app.models.video_neighbor import KIND_COVOTE, VideoNeighbor
+from app.models.vote import Vote
+from app.schemas.video import VideoCursorListResponse, VideoListResponse
+from app.services.auth import get_current_user
+from app.services.video_reads import card_query, load_cards, load_voted_ids
+from app.utils.cursor import before_cursor, encode_cursor
+from app.utils.response import cards_response, video_list_response
+
+router = APIRouter(prefix="/api/feed", tags=["feed"])
+
+# Weight of the i-th most recent vote is RECENCY_DECAY ** i
+RECENCY_DECAY = 0.95
+# Popular videos offered when a user has no usable vote history yet
+COLD_START_POOL = 200
+
+
+def _visible_to(user: User) -> list:
+    """Conditions hiding voted, own, muted-user and hidden-category videos."""
+    return [
+        Video.is_active == True,  # noqa: E712
+        ~exists().where(Vote.video_id == Video.id, Vote.user_id == user.id),
+        or_(
+            Video.submitted_by.is_(None),
+            (Video.submitted_by != user.id)
+            & ~Video.submitted_by.in_(
+                select(UserMute.muted_user_id).where(UserMute.user_id == user.id)
+            ),
+        ),
+        ~exists()
+        .where(
+            video_categories.c.video_id == Video.id,
+            UserHiddenCategory.category_id == video_categories.c.category_id,
+            UserHiddenCategory.user_id == user.id,
+        ),
+    ]
+
+
+async def _blend_candidates(session: AsyncSession, user: User) -> dict[str, float]:
+    """Sum co-vote neighbor scores over the user's recent votes, newest weighted most."""
+    recent = (await session.execute(
+        select(Vote.video_id)
+        .where(Vote.user_id == user.id)
+        .order_by(Vote.created_at.desc())
+        .limit(settings.feed_recent_votes)
+    )).scalars().all()
+    if not recent:
+        return {}
+    weight = {video_id: RECENCY_DECAY ** i for i, video_id in enumerate(recent)}
+    rows = await session.execute(
+        select(VideoNeighbor.video_id, VideoNeighbor.neighbor_id, VideoNeighbor.score)
+        .where(VideoNeighbor.kind == KIND_COVOTE, VideoNeighbor.video_id.in_(recent))
+    )
+    scores: dict[str, float] = {}
+    for seed_id, neighbor_id, score in rows:
+        scores[neighbor_id] = scores.get(neighbor_id, 0.0) + weight[seed_id] * score
+    return scores
+
+
+@router.get("/for-you", response_model=VideoListResponse)
+async def for_you_feed(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=50),
+    lite: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    scores = await _blend_candidates(session, current_user)
+    if scores:
+        key_rows = (await session.execute(
+            card_query().where(Video.id.in_(list(scores)), *_visible_to(current_user))
+        )).all()
+        key_rows.sort(key=lambda row: (-scores[row.id], row.id))
+    else:
+        key_rows = []
+    if not key_rows:
+        key_rows = (await session.execute(
+            card_query()
+            .where(*_visible_to(current_user))
+            .order_by(Video.vote_count.desc(), Video.created_at.desc())
+            .limit(COLD_START_POOL)
+        )).all()
+
+    total = len(key_rows)
+    offset = (page - 1) * per_page
+    cards = await load_cards(session, key_rows[offset:offset + per_page], lite=lite)
+    # Voted videos are excluded, so nothing in the feed is voted yet
+    return video_list_response(
+        cards, set(), total=total, page=page, per_page=per_page, has_next=offset + per_page < total
+    )
+
+
+@router.get("/following", response_model=VideoCursorListResponse)
+async def following_feed(
+    cursor: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    lite: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    # Fanned-out videos: one range scan of the user's timeline
+    materialized = (await session.execute(
+        card_query(TimelineEntry.created_at.label("sort_at"))
+        .join(TimelineEntry, TimelineEntry.video_id == Video.id)
+        .where(
+            TimelineEntry.user_id == current_user.id,
+            Video.is_active == True,  # noqa: E712
+            *before_cursor(TimelineEntry.created_at, TimelineEntry.video_id, cursor),
+        )
+        .order_by(TimelineEntry.created_at.desc(), TimelineEntry.video_id.desc())
+        .limit(limit + 1)
+    )).all()
+
+    # Videos not fanned out (authors too big for fan-out on write, or
+    # fan-out still queued) are read directly from followed authors
+    followed = select(UserFollow.following_id).where(UserFollow.follower_id == current_user.id)
+    pulled = (await session.execute(
+        card_query(Video.created_at.label("sort_at"))
+        .where(
+            Video.submitted_by.in_(followed),
+            Video.fanned_out == False,  # noqa: E712
+            Video.is_active == True,  # noqa: E712
+            *before_cursor(Video.created_at, Video.id, cursor),
+        )
+        .order_by(Video.created_at.desc(), Video.id.desc())
+        .limit(limit + 1)
+    )).all()
+
+    merged = sorted(
+        {row.id: row for row in [*materialized, *pulled]}.values(),
+        key=lambda row: (row.sort_at, row.id),
+        reverse=True,
+    )
+    page = merged[:limit]
+    next_cursor = encode_cursor(page[-1].sort_at, page[-1].id) if len(merged) > limit else None
+
+    cards = await load_cards(session, page, lite=lite)
+    voted_video_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
+    return cards_response({"next_cursor": next_cursor}, "items", cards, voted_video_ids)
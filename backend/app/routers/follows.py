@@ -1,22 +1,58 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func, select
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_session
-from app.models.notification import Notification
 from app.models.user import User
 from app.models.user_follow import UserFollow
-from app.schemas.follow import FollowActionResponse, FollowCountsResponse, FollowListResponse, FollowStatusResponse
+from app.models.user_mute import UserMute
+from app.models.user_suggestion import UserSuggestion
+from app.schemas.follow import (
+    FollowActionResponse,
+    FollowCountsResponse,
+    FollowListResponse,
+    FollowStatusResponse,
+    FollowSuggestionListResponse,
+)
 from app.schemas.user import UserBriefResponse
 from app.services.auth import get_current_user, get_optional_user
+from app.services.notifications import notify_follow
+from app.services.timeline import backfill_follow, remove_author
+from app.services.user_counters import adjust_user_counters
 from app.utils.limiter import limiter
 
 router = APIRouter(prefix="/api/follows", tags=["follows"])
 
 
+@router.get("/suggestions", response_model=FollowSuggestionListResponse)
+async def get_follow_suggestions(
+    limit: int = Query(10, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    # Precomputed by tasks.follow_suggestions; follows and mutes made since
+    # the last run are filtered here
+    result = await session.execute(
+        select(User)
+        .join(UserSuggestion, UserSuggestion.suggested_id == User.id)
+        .where(
+            UserSuggestion.user_id == current_user.id,
+            User.is_active == True,  # noqa: E712
+            ~exists().where(
+                UserFollow.follower_id == current_user.id, UserFollow.following_id == User.id
+            ),
+            ~exists().where(UserMute.user_id == current_user.id, UserMute.muted_user_id == User.id),
+        )
+        .order_by(UserSuggestion.rank)
+        .limit(limit)
+    )
+    users = [UserBriefResponse.model_validate(u) for u in result.scalars().all()]
+    return FollowSuggestionListResponse(users=users)
+
+
 @router.post("/{user_id}", response_model=FollowActionResponse, status_code=status.HTTP_201_CREATED)
 async def follow_user(
     user_id: str,
@@ -54,13 +90,11 @@ async def follow_user(
         follower_id=current_user.id,
         following_id=user_id,
     ))
+    await adjust_user_counters(session, current_user.id, following_count=1)
+    await adjust_user_counters(session, user_id, followers_count=1)
     # Notify the followed user
-    session.add(Notification(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        type="follow",
-        actor_id=current_user.id,
-    ))
+    await notify_follow(session, user_id, current_user.id)
+    await backfill_follow(session, current_user.id, user_id)
     await session.commit()
     return FollowActionResponse(status="followed")
 
@@ -72,12 +106,16 @@ async def unfollow_user(
     session: AsyncSession = Depends(get_session),
 ):
     from sqlalchemy import delete
-    await session.execute(
+    result = await session.execute(
         delete(UserFollow).where(
             UserFollow.follower_id == current_user.id,
             UserFollow.following_id == user_id,
         )
     )
+    if result.rowcount:
+        await adjust_user_counters(session, current_user.id, following_count=-1)
+        await adjust_user_counters(session, user_id, followers_count=-1)
+        await remove_author(session, current_user.id, user_id)
     await session.commit()
     return FollowActionResponse(status="unfollowed")
 
@@ -89,12 +127,10 @@ async def get_follow_counts(
     user_id: str,
     session: AsyncSession = Depends(get_session),
 ):
-    followers = (await session.execute(
-        select(func.count()).select_from(UserFollow).where(UserFollow.following_id == user_id)
-    )).scalar() or 0
-    following = (await session.execute(
-        select(func.count()).select_from(UserFollow).where(UserFollow.follower_id == user_id)
-    )).scalar() or 0
+    counts = (await session.execute(
+        select(User.followers_count, User.following_count).where(User.id == user_id)
+    )).one_or_none()
+    followers, following = counts or (0, 0)
     return FollowCountsResponse(followers_count=followers, following_count=following)
 
 
@@ -124,7 +160,7 @@ async def get_followers(
 ):
     base = select(UserFollow).where(UserFollow.following_id == user_id)
     total = (await session.execute(
-        select(func.count()).select_from(base.subquery())
+        select(User.followers_count).where(User.id == user_id)
     )).scalar() or 0
 
     result = await session.execute(
@@ -151,7 +187,7 @@ async def get_following(
 ):
     base = select(UserFollow).where(UserFollow.follower_id == user_id)
     total = (await session.execute(
-        select(func.count()).select_from(base.subquery())
+        select(User.following_count).where(User.id == user_id)
     )).scalar() or 0
 
     result = await session.execute(
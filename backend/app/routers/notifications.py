@@ -1,4 +1,8 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -15,6 +19,8 @@ from app.schemas.notification import (
 )
 from app.schemas.user import UserBriefResponse
 from app.services.auth import get_current_user
+from app.services.notification_hub import hub
+from app.services.notifications import adjust_unread_count, parse_recent_actor_ids, reset_unread_count
 from app.utils.limiter import limiter
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
@@ -45,12 +51,25 @@ async def list_notifications(
     result = await session.execute(query)
     notifications = list(result.scalars().all())
 
+    # Batch-load latest actors of grouped notifications
+    recent_ids = {n.id: parse_recent_actor_ids(n.recent_actor_ids) for n in notifications}
+    actor_ids = {a for ids in recent_ids.values() for a in ids}
+    actors_map = {}
+    if actor_ids:
+        actors_result = await session.execute(select(User).where(User.id.in_(actor_ids)))
+        actors_map = {u.id: u for u in actors_result.scalars().all()}
+
     items = []
     for n in notifications:
         items.append(NotificationResponse(
             id=n.id,
             type=n.type,
             actor=UserBriefResponse.model_validate(n.actor),
+            actor_count=n.actor_count,
+            recent_actors=[
+                UserBriefResponse.model_validate(actors_map[a])
+                for a in recent_ids[n.id] if a in actors_map
+            ],
             video_id=n.video_id,
             video_title=n.video.title if n.video else None,
             is_read=n.is_read,
@@ -68,15 +87,49 @@ async def list_notifications(
 async def get_unread_count(
     request: Request,
     current_user: User = Depends(get_current_user),
+):
+    # Served from the denormalized counter loaded with the user row
+    return UnreadCountResponse(count=current_user.unread_notification_count)
+
+
+STREAM_KEEPALIVE_SECONDS = 25
+
+
+def _sse(event_name: str, data: dict) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    count = (await session.execute(
-        select(func.count()).select_from(Notification).where(
-            Notification.user_id == current_user.id,
-            Notification.is_read == False,  # noqa: E712
-        )
-    )).scalar() or 0
-    return UnreadCountResponse(count=count)
+    """Server-Sent Events stream of unread counts and new notifications."""
+    user_id = current_user.id
+    initial_count = current_user.unread_notification_count
+    # Release the DB connection; the stream may stay open for a long time
+    await session.close()
+
+    async def event_stream():
+        queue = hub.subscribe(user_id)
+        try:
+            yield _sse("unread_count", {"type": "unread_count", "count": initial_count})
+            while not await request.is_disconnected():
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(data["type"], data)
+        finally:
+            hub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/mark-read", response_model=StatusResponse)
@@ -85,20 +138,23 @@ async def mark_read(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    if body.notification_ids:
-        await session.execute(
-            update(Notification)
-            .where(
-                Notification.user_id == current_user.id,
-                Notification.id.in_(body.notification_ids),
-            )
-            .values(is_read=True)
+    # Only unread rows are touched, so rowcount is the counter decrement.
+    # Clearing group_key closes coalesced groups, so later votes start a new
+    # unread notification instead of updating one the user already read.
+    query = (
+        update(Notification)
+        .where(
+            Notification.user_id == current_user.id,
+            Notification.is_read == False,  # noqa: E712
         )
+        .values(is_read=True, group_key=None)
+    )
+    if body.notification_ids:
+        result = await session.execute(query.where(Notification.id.in_(body.notification_ids)))
+        if result.rowcount:
+            await adjust_unread_count(session, current_user.id, -result.rowcount)
     else:
-        await session.execute(
-            update(Notification)
-            .where(Notification.user_id == current_user.id)
-            .values(is_read=True)
-        )
+        await session.execute(query)
+        await reset_unread_count(session, current_user.id)
     await session.commit()
     return {"status": "ok"}
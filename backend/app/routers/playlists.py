@@ -1,29 +1,39 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import case, delete, func, literal, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_session
+from app.database import dialect_insert, get_session, utcnow
 from app.models.playlist import Playlist
 from app.models.playlist_video import PlaylistVideo
 from app.models.user import User
 from app.models.video import Video
-from app.models.vote import Vote
 from app.schemas.playlist import (
     PlaylistBriefResponse,
     PlaylistCreateRequest,
     PlaylistDetailResponse,
+    PlaylistHeaderResponse,
     PlaylistListResponse,
+    PlaylistMembershipItem,
+    PlaylistMembershipResponse,
     PlaylistUpdateRequest,
+    PlaylistMoveRequest,
     PlaylistVideoRequest,
+    PlaylistVideosRequest,
 )
 from app.schemas.user import UserBriefResponse
+from app.schemas.video import VideoCursorListResponse
 from app.services.auth import get_current_user, get_optional_user
-from app.utils.response import video_to_response
+from app.services.playlist_membership import invalidate, load_membership
+from app.services.playlist_positions import MIN_GAP, POSITION_GAP, between, rebalance, request_rebalance
+from app.services.video_reads import card_query, load_cards, load_voted_ids
+from app.utils import http_cache
+from app.utils.cursor import after_position_cursor, encode_cursor
+from app.utils.response import cards_response
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +42,7 @@ router = APIRouter(prefix="/api/playlists", tags=["playlists"])
 DEFAULT_PLAYLIST_NAME = "お気に入り"
 MAX_PLAYLISTS_PER_USER = 10
 MAX_VIDEOS_PER_PLAYLIST = 100
+PLAYLIST_PAGE_SIZE = 20
 
 
 @router.get("", response_model=PlaylistListResponse)
@@ -54,6 +65,7 @@ async def list_my_playlists(
             )
             session.add(default)
             await session.commit()
+            invalidate(current_user.id)
         except IntegrityError:
             # Concurrent request already created the default playlist
             await session.rollback()
@@ -118,6 +130,7 @@ async def create_playlist(
     )
     session.add(playlist)
     await session.commit()
+    invalidate(current_user.id)
     return PlaylistBriefResponse(
         id=playlist.id, name=playlist.name, is_public=playlist.is_public,
         video_count=0, created_at=playlist.created_at,
@@ -130,88 +143,140 @@ async def get_playlists_containing_video(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    # Get all user's playlists
-    all_result = await session.execute(
-        select(Playlist).where(Playlist.user_id == current_user.id).order_by(Playlist.created_at.desc())
-    )
-    all_playlists = list(all_result.scalars().all())
-
-    # Get playlist IDs that contain this video
-    containing_result = await session.execute(
-        select(PlaylistVideo.playlist_id)
-        .join(Playlist, Playlist.id == PlaylistVideo.playlist_id)
-        .where(
-            Playlist.user_id == current_user.id,
-            PlaylistVideo.video_id == video_id,
-        )
-    )
-    containing_ids = {row[0] for row in containing_result}
-
+    membership = await load_membership(session, current_user.id)
+    containing_ids = membership.videos.get(video_id, set())
     return {
         "playlists": [
             {
-                "playlist_id": p.id,
-                "playlist_name": p.name,
-                "contains": p.id in containing_ids,
+                "playlist_id": playlist_id,
+                "playlist_name": name,
+                "contains": playlist_id in containing_ids,
             }
-            for p in all_playlists
+            for playlist_id, name in membership.playlists
         ]
     }
 
 
-@router.get("/{playlist_id}", response_model=PlaylistDetailResponse)
-async def get_playlist(
-    playlist_id: str,
-    current_user: User | None = Depends(get_optional_user),
+@router.get("/membership", response_model=PlaylistMembershipResponse)
+async def get_playlist_membership(
+    video_ids: list[str] = Query(..., max_length=MAX_VIDEOS_PER_PLAYLIST),
+    current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(Playlist)
-        .where(Playlist.id == playlist_id)
-        .options(selectinload(Playlist.owner))
+    """Which of the user's playlists contain each of video_ids (one cached lookup for a whole page)."""
+    membership = await load_membership(session, current_user.id)
+    return PlaylistMembershipResponse(
+        playlists=[
+            PlaylistMembershipItem(playlist_id=playlist_id, playlist_name=name)
+            for playlist_id, name in membership.playlists
+        ],
+        videos={
+            video_id: sorted(membership.videos.get(video_id, ()))
+            for video_id in video_ids
+        },
     )
-    playlist = result.scalar_one_or_none()
-    if playlist is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
 
+
+async def _visible_playlist(session: AsyncSession, playlist_id: str, current_user: User | None):
+    """Load (playlist, owner, active video count) in one query; 404 unless visible."""
+    active_count = (
+        select(func.count())
+        .select_from(PlaylistVideo)
+        .join(Video, Video.id == PlaylistVideo.video_id)
+        .where(PlaylistVideo.playlist_id == Playlist.id, Video.is_active == True)  # noqa: E712
+        .scalar_subquery()
+    )
+    row = (await session.execute(
+        select(Playlist, User, active_count)
+        .join(User, User.id == Playlist.user_id)
+        .where(Playlist.id == playlist_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+    playlist, owner, video_count = row
     if not playlist.is_public:
         if current_user is None or current_user.id != playlist.user_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+    return playlist, owner, video_count
 
-    # Fetch videos
-    pv_result = await session.execute(
-        select(PlaylistVideo)
-        .where(PlaylistVideo.playlist_id == playlist_id)
-        .options(
-            selectinload(PlaylistVideo.video).selectinload(Video.submitter),
-            selectinload(PlaylistVideo.video).selectinload(Video.categories),
-            selectinload(PlaylistVideo.video).selectinload(Video.tags),
-        )
-        .order_by(PlaylistVideo.position.asc())
-    )
-    pvs = list(pv_result.scalars().all())
-    videos = [pv.video for pv in pvs if pv.video and pv.video.is_active]
-
-    # Check user votes
-    voted_ids = set()
-    if current_user and videos:
-        video_ids = [v.id for v in videos]
-        vote_result = await session.execute(
-            select(Vote.video_id).where(
-                Vote.user_id == current_user.id,
-                Vote.video_id.in_(video_ids),
-            )
-        )
-        voted_ids = {row[0] for row in vote_result}
 
-    return PlaylistDetailResponse(
+def _header(playlist: Playlist, owner: User, video_count: int) -> dict:
+    return PlaylistHeaderResponse(
         id=playlist.id,
         name=playlist.name,
         is_public=playlist.is_public,
-        owner=UserBriefResponse.model_validate(playlist.owner),
-        videos=[video_to_response(v, user_voted=v.id in voted_ids) for v in videos],
+        owner=UserBriefResponse.model_validate(owner),
+        video_count=video_count,
         created_at=playlist.created_at,
-    )
+    ).model_dump(mode="json")
+
+
+async def _videos_page(
+    session: AsyncSession, playlist_id: str, current_user: User | None, cursor: str | None, limit: int, lite: bool
+):
+    """One page of active videos in position order. Returns (cards, voted ids, next cursor)."""
+    rows = (await session.execute(
+        card_query(PlaylistVideo.position.label("sort_position"), PlaylistVideo.id.label("sort_id"))
+        .join(PlaylistVideo, PlaylistVideo.video_id == Video.id)
+        .where(
+            PlaylistVideo.playlist_id == playlist_id,
+            Video.is_active == True,  # noqa: E712
+            *after_position_cursor(PlaylistVideo.position, PlaylistVideo.id, cursor),
+        )
+        .order_by(PlaylistVideo.position, PlaylistVideo.id)
+        .limit(limit + 1)
+    )).all()
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].sort_position, page[-1].sort_id) if len(rows) > limit else None
+    cards = await load_cards(session, page, lite=lite)
+    voted_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
+    return cards, voted_ids, next_cursor
+
+
+@router.get("/{playlist_id}", response_model=PlaylistDetailResponse)
+async def get_playlist(
+    playlist_id: str,
+    limit: int = Query(PLAYLIST_PAGE_SIZE, ge=1, le=MAX_VIDEOS_PER_PLAYLIST),
+    lite: bool = Query(False),
+    current_user: User | None = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Header plus the first page of videos."""
+    header = _header(*await _visible_playlist(session, playlist_id, current_user))
+    cards, voted_ids, next_cursor = await _videos_page(session, playlist_id, current_user, None, limit, lite)
+    return cards_response({**header, "next_cursor": next_cursor}, "videos", cards, voted_ids)
+
+
+@router.get("/{playlist_id}/header", response_model=PlaylistHeaderResponse)
+async def get_playlist_header(
+    request: Request,
+    playlist_id: str,
+    current_user: User | None = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_session),
+):
+    playlist, owner, video_count = await _visible_playlist(session, playlist_id, current_user)
+    # The header carries no per-user fields; only private playlists stay out of shared caches
+    private = not playlist.is_public
+    etag = http_cache.make_etag(playlist.id, playlist.updated_at, owner.updated_at, video_count)
+    if (cached := http_cache.not_modified(request, etag, http_cache.PLAYLIST, private)) is not None:
+        return cached
+    response = ORJSONResponse(_header(playlist, owner, video_count))
+    http_cache.set_cache_headers(response, etag, http_cache.PLAYLIST, private)
+    return response
+
+
+@router.get("/{playlist_id}/videos", response_model=VideoCursorListResponse)
+async def get_playlist_videos(
+    playlist_id: str,
+    cursor: str | None = Query(None),
+    limit: int = Query(PLAYLIST_PAGE_SIZE, ge=1, le=MAX_VIDEOS_PER_PLAYLIST),
+    lite: bool = Query(False),
+    current_user: User | None = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_session),
+):
+    await _visible_playlist(session, playlist_id, current_user)
+    cards, voted_ids, next_cursor = await _videos_page(session, playlist_id, current_user, cursor, limit, lite)
+    return cards_response({"next_cursor": next_cursor}, "items", cards, voted_ids)
 
 
 @router.patch("/{playlist_id}", response_model=PlaylistBriefResponse)
@@ -233,6 +298,7 @@ async def update_playlist(
     if body.is_public is not None:
         playlist.is_public = body.is_public
     await session.commit()
+    invalidate(current_user.id)
 
     vc = (await session.execute(
         select(func.count()).select_from(PlaylistVideo).where(PlaylistVideo.playlist_id == playlist_id)
@@ -259,9 +325,84 @@ async def delete_playlist(
 
     await session.delete(playlist)
     await session.commit()
+    invalidate(current_user.id)
     return {"status": "deleted"}
 
 
+def _owned(playlist_id: str, user_id: str):
+    return select(Playlist.id).where(Playlist.id == playlist_id, Playlist.user_id == user_id).exists()
+
+
+async def _require_playlist(session: AsyncSession, playlist_id: str, user_id: str) -> None:
+    if not (await session.execute(select(_owned(playlist_id, user_id)))).scalar():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+
+
+def _size_after_add(playlist_id: str, video_ids: list[str]):
+    """Playlist size once video_ids are added, counting only active videos."""
+    others = (
+        select(func.count()).select_from(PlaylistVideo)
+        .where(PlaylistVideo.playlist_id == playlist_id, PlaylistVideo.video_id.not_in(video_ids))
+        .scalar_subquery()
+    )
+    added = (
+        select(func.count()).select_from(Video)
+        .where(Video.id.in_(video_ids), Video.is_active == True)  # noqa: E712
+        .scalar_subquery()
+    )
+    return others + added
+
+
+async def _insert_videos(session: AsyncSession, playlist_id: str, user_id: str, video_ids: list[str]) -> int:
+    """Append videos in one INSERT ... SELECT. Returns rows inserted.
+
+    Ownership, active videos and the size cap are checked by the statement
+    itself; duplicates are skipped by ON CONFLICT DO NOTHING.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    base = (
+        select(func.coalesce(func.max(PlaylistVideo.position), 0.0))
+        .where(PlaylistVideo.playlist_id == playlist_id)
+        .scalar_subquery()
+    )
+    rank = case({vid: i + 1 for i, vid in enumerate(video_ids)}, value=Video.id)
+    new_id = case({vid: str(uuid.uuid4()) for vid in video_ids}, value=Video.id)
+    rows = select(
+        new_id, literal(playlist_id), Video.id, base + rank * POSITION_GAP, literal(utcnow())
+    ).where(
+        Video.id.in_(video_ids),
+        Video.is_active == True,  # noqa: E712
+        _owned(playlist_id, user_id),
+        _size_after_add(playlist_id, video_ids) <= MAX_VIDEOS_PER_PLAYLIST,
+    )
+    result = await session.execute(
+        dialect_insert(session, PlaylistVideo)
+        .from_select(["id", "playlist_id", "video_id", "position", "created_at"], rows)
+        .on_conflict_do_nothing()
+    )
+    return result.rowcount
+
+
+async def _delete_videos(session: AsyncSession, playlist_id: str, user_id: str, video_ids: list[str]) -> int:
+    result = await session.execute(
+        delete(PlaylistVideo)
+        .where(
+            PlaylistVideo.playlist_id == playlist_id,
+            PlaylistVideo.video_id.in_(video_ids),
+            _owned(playlist_id, user_id),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _full_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"1つのプレイリストに追加できる動画は最大{MAX_VIDEOS_PER_PLAYLIST}本です",
+    )
+
+
 @router.post("/{playlist_id}/videos", status_code=status.HTTP_201_CREATED)
 async def add_video_to_playlist(
     playlist_id: str,
@@ -269,74 +410,126 @@ async def add_video_to_playlist(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(Playlist).where(Playlist.id == playlist_id, Playlist.user_id == current_user.id)
-    )
-    if result.scalar_one_or_none() is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+    if await _insert_videos(session, playlist_id, current_user.id, [body.video_id]):
+        await session.commit()
+        invalidate(current_user.id)
+        return {"status": "added"}
 
-    # Check video count
-    vc = (await session.execute(
-        select(func.count()).select_from(PlaylistVideo).where(PlaylistVideo.playlist_id == playlist_id)
-    )).scalar() or 0
-    if vc >= MAX_VIDEOS_PER_PLAYLIST:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"1つのプレイリストに追加できる動画は最大{MAX_VIDEOS_PER_PLAYLIST}本です",
-        )
-
-    # Check video exists
-    video = await session.execute(
-        select(Video).where(Video.id == body.video_id, Video.is_active == True)  # noqa: E712
-    )
-    if video.scalar_one_or_none() is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="動画が見つかりません")
-
-    # Check duplicate
+    # Nothing inserted: work out why
+    await _require_playlist(session, playlist_id, current_user.id)
     dup = await session.execute(
-        select(PlaylistVideo).where(
+        select(PlaylistVideo.id).where(
             PlaylistVideo.playlist_id == playlist_id,
             PlaylistVideo.video_id == body.video_id,
         )
     )
-    if dup.scalar_one_or_none() is not None:
+    if dup.first() is not None:
         return {"status": "already_added"}
+    video = await session.execute(
+        select(Video.id).where(Video.id == body.video_id, Video.is_active == True)  # noqa: E712
+    )
+    if video.first() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="動画が見つかりません")
+    raise _full_error()
 
-    # Get max position
-    max_pos = (await session.execute(
-        select(func.coalesce(func.max(PlaylistVideo.position), 0))
-        .where(PlaylistVideo.playlist_id == playlist_id)
-    )).scalar() or 0
 
-    session.add(PlaylistVideo(
-        id=str(uuid.uuid4()),
-        playlist_id=playlist_id,
-        video_id=body.video_id,
-        position=max_pos + 1,
-    ))
+@router.post("/{playlist_id}/videos/bulk", status_code=status.HTTP_201_CREATED)
+async def add_videos_to_playlist(
+    playlist_id: str,
+    body: PlaylistVideosRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    added = await _insert_videos(session, playlist_id, current_user.id, body.video_ids)
+    if not added:
+        await _require_playlist(session, playlist_id, current_user.id)
+        size = (await session.execute(select(_size_after_add(playlist_id, body.video_ids)))).scalar()
+        if size > MAX_VIDEOS_PER_PLAYLIST:
+            raise _full_error()
     await session.commit()
-    return {"status": "added"}
+    invalidate(current_user.id)
+    # Already present or inactive videos are skipped
+    return {"added": added, "skipped": len(set(body.video_ids)) - added}
 
 
-@router.delete("/{playlist_id}/videos/{video_id}")
-async def remove_video_from_playlist(
+@router.post("/{playlist_id}/videos/bulk-remove")
+async def remove_videos_from_playlist(
+    playlist_id: str,
+    body: PlaylistVideosRequest,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    removed = await _delete_videos(session, playlist_id, current_user.id, body.video_ids)
+    if not removed:
+        await _require_playlist(session, playlist_id, current_user.id)
+    await session.commit()
+    invalidate(current_user.id)
+    return {"removed": removed}
+
+
+@router.post("/{playlist_id}/videos/{video_id}/move")
+async def move_video_in_playlist(
     playlist_id: str,
     video_id: str,
+    body: PlaylistMoveRequest,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(Playlist).where(Playlist.id == playlist_id, Playlist.user_id == current_user.id)
+    if body.after_video_id == video_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="移動先が不正です")
+
+    def position_of(vid: str):
+        return (
+            select(PlaylistVideo.position)
+            .where(PlaylistVideo.playlist_id == playlist_id, PlaylistVideo.video_id == vid)
+            .scalar_subquery()
+        )
+
+    # Read the new neighbours: the anchor and the first video after it
+    before = position_of(body.after_video_id) if body.after_video_id else None
+    next_query = select(func.min(PlaylistVideo.position)).where(
+        PlaylistVideo.playlist_id == playlist_id, PlaylistVideo.video_id != video_id
     )
-    if result.scalar_one_or_none() is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+    if before is not None:
+        next_query = next_query.where(PlaylistVideo.position > before)
+    for _ in range(2):
+        owned, current, prev, following = (await session.execute(select(
+            _owned(playlist_id, current_user.id),
+            position_of(video_id),
+            before if before is not None else literal(None),
+            next_query.scalar_subquery(),
+        ))).one()
+        if not owned:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="プレイリストが見つかりません")
+        if current is None or (body.after_video_id and prev is None):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="動画が見つかりません")
+        position = between(prev, following)
+        if position is not None:
+            break
+        # Precision exhausted between the neighbours: renumber now and retry
+        await rebalance(session, playlist_id)
 
-    from sqlalchemy import delete
     await session.execute(
-        delete(PlaylistVideo).where(
-            PlaylistVideo.playlist_id == playlist_id,
-            PlaylistVideo.video_id == video_id,
-        )
+        update(PlaylistVideo)
+        .where(PlaylistVideo.playlist_id == playlist_id, PlaylistVideo.video_id == video_id)
+        .values(position=position)
+        .execution_options(synchronize_session=False)
     )
     await session.commit()
+    if prev is not None and following is not None and following - prev < MIN_GAP:
+        request_rebalance(playlist_id)
+    return {"status": "moved", "position": position}
+
+
+@router.delete("/{playlist_id}/videos/{video_id}")
+async def remove_video_from_playlist(
+    playlist_id: str,
+    video_id: str,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    if not await _delete_videos(session, playlist_id, current_user.id, [video_id]):
+        await _require_playlist(session, playlist_id, current_user.id)
+    await session.commit()
+    invalidate(current_user.id)
     return {"status": "removed"}
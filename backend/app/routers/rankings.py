@@ -5,13 +5,11 @@ def _utcnow_naive() -> datetime:
     """Return current UTC time without tzinfo (for TIMESTAMP WITHOUT TIME ZONE columns)."""
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import get_session
-from app.models.category import Category
 from app.models.user import User
 from app.models.tag import Tag, video_tags
 from app.models.video import Video, video_categories
@@ -20,7 +18,10 @@ from app.models.vote_snapshot import VoteSnapshot
 from app.schemas.user import UserBriefResponse
 from app.schemas.video import VideoListResponse
 from app.services.auth import get_optional_user
-from app.utils.response import video_to_response
+from app.services.category_registry import category_registry
+from app.services.video_reads import Submitter, card_query, load_cards, load_voted_ids
+from app.utils import http_cache
+from app.utils.response import video_list_response
 
 router = APIRouter(prefix="/api/rankings", tags=["rankings"])
 
@@ -34,7 +35,9 @@ PERIOD_MAP = {
 
 @router.get("/trending", response_model=VideoListResponse)
 async def get_trending(
+    request: Request,
     platform: str | None = Query(None),
+    lite: bool = Query(False),
     current_user: User | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -112,12 +115,12 @@ async def get_trending(
         if trending_video_ids:
             is_real_trending = True
             # Mark videos as was_trending
-            trending_vids = await session.execute(
-                select(Video).where(Video.id.in_(trending_video_ids))
+            await session.execute(
+                update(Video)
+                .where(Video.id.in_(trending_video_ids), Video.was_trending == False)  # noqa: E712
+                .values(was_trending=True, updated_at=Video.updated_at)
+                .execution_options(synchronize_session=False)
             )
-            for tv in trending_vids.scalars().all():
-                if not tv.was_trending:
-                    tv.was_trending = True
             await session.commit()
 
     # Parse platform filter
@@ -126,77 +129,59 @@ async def get_trending(
     if not trending_video_ids:
         # Fallback: newest videos with highest votes in 24h
         since_24h = now - timedelta(hours=24)
-        fallback_query = (
-            select(Video, func.count(Vote.id).label("recent_votes"))
+        query = (
+            card_query(func.count(Vote.id).label("recent_votes"))
             .outerjoin(Vote, (Vote.video_id == Video.id) & (Vote.created_at >= since_24h))
             .where(Video.is_active == True)  # noqa: E712
-            .options(
-                selectinload(Video.submitter),
-                selectinload(Video.categories),
-                selectinload(Video.tags),
-            )
-            .group_by(Video.id)
+            .group_by(Video.id, Submitter.id)
             .order_by(func.count(Vote.id).desc(), Video.created_at.desc())
             .limit(10)
         )
-        if platform_list:
-            fallback_query = fallback_query.where(Video.platform.in_(platform_list))
-        result = await session.execute(fallback_query)
-        rows = list(result.all())
-        videos = [row[0] for row in rows]
     else:
         # Fetch trending videos
         query = (
-            select(Video)
+            card_query()
             .where(Video.id.in_(trending_video_ids), Video.is_active == True)  # noqa: E712
-            .options(
-                selectinload(Video.submitter),
-                selectinload(Video.categories),
-                selectinload(Video.tags),
-            )
             .order_by(Video.vote_count.desc())
             .limit(10)
         )
-        if platform_list:
-            query = query.where(Video.platform.in_(platform_list))
-        result = await session.execute(query)
-        videos = list(result.scalars().all())
-
-    # Check user votes
-    voted_video_ids = set()
-    if current_user and videos:
-        video_ids = [v.id for v in videos]
-        vote_result = await session.execute(
-            select(Vote.video_id).where(
-                Vote.user_id == current_user.id,
-                Vote.video_id.in_(video_ids),
-            )
-        )
-        voted_video_ids = {row[0] for row in vote_result}
-
-    items = [
-        video_to_response(v, user_voted=v.id in voted_video_ids, is_trending=is_real_trending)
-        for v in videos
-    ]
-
-    return VideoListResponse(
-        items=items,
-        total=len(items),
+    if platform_list:
+        query = query.where(Video.platform.in_(platform_list))
+    rows = (await session.execute(query)).all()
+    voted_video_ids = await load_voted_ids(session, current_user, [row.id for row in rows])
+
+    private = current_user is not None
+    etag = http_cache.make_etag(
+        is_real_trending, *(tuple(row) for row in rows), *sorted(voted_video_ids)
+    )
+    if (cached := http_cache.not_modified(request, etag, http_cache.RANKINGS, private)) is not None:
+        return cached
+
+    cards = await load_cards(session, rows, lite=lite)
+    response = video_list_response(
+        cards,
+        voted_video_ids,
+        total=len(cards),
         page=1,
         per_page=10,
         has_next=False,
-        trending_count=len(items) if is_real_trending else 0,
+        is_trending=is_real_trending,
+        trending_count=len(cards) if is_real_trending else 0,
     )
+    http_cache.set_cache_headers(response, etag, http_cache.RANKINGS, private)
+    return response
 
 
 @router.get("", response_model=VideoListResponse)
 async def get_rankings(
+    request: Request,
     period: str = Query("24h", pattern="^(24h|1w|1m|all)$"),
     category: str | None = Query(None),
     platform: str | None = Query(None),
     tag: str | None = Query(None, max_length=50),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    lite: bool = Query(False),
     current_user: User | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -207,33 +192,20 @@ async def get_rankings(
         since = _utcnow_naive() - cutoff_delta
 
         query = (
-            select(
-                Video,
-                func.count(Vote.id).label("period_votes"),
-            )
+            card_query(func.count(Vote.id).label("period_votes"))
             .outerjoin(
                 Vote,
                 (Vote.video_id == Video.id) & (Vote.created_at >= since),
             )
             .where(Video.is_active == True)  # noqa: E712
-            .options(
-                selectinload(Video.submitter),
-                selectinload(Video.categories),
-                selectinload(Video.tags),
-            )
-            .group_by(Video.id)
+            .group_by(Video.id, Submitter.id)
             .order_by(func.count(Vote.id).desc(), Video.created_at.desc())
         )
     else:
         # All-time: use denormalized vote_count
         query = (
-            select(Video, Video.vote_count.label("period_votes"))
+            card_query()
             .where(Video.is_active == True)  # noqa: E712
-            .options(
-                selectinload(Video.submitter),
-                selectinload(Video.categories),
-                selectinload(Video.tags),
-            )
             .order_by(Video.vote_count.desc(), Video.created_at.desc())
         )
 
@@ -245,8 +217,10 @@ async def get_rankings(
 
     # Category filter
     if category:
-        query = query.join(video_categories).join(Category).where(
-            Category.slug == category
+        await category_registry.ensure_fresh(session)
+        entry = category_registry.by_slug(category)
+        query = query.join(video_categories).where(
+            video_categories.c.category_id == (entry.id if entry else None)
         )
 
     # Tag filter
@@ -259,33 +233,26 @@ async def get_rankings(
 
     # Paginate
     query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await session.execute(query)
-    rows = list(result.all())
-    videos = [row[0] for row in rows]
-
-    # Check user votes
-    voted_video_ids = set()
-    if current_user and videos:
-        video_ids = [v.id for v in videos]
-        vote_result = await session.execute(
-            select(Vote.video_id).where(
-                Vote.user_id == current_user.id,
-                Vote.video_id.in_(video_ids),
-            )
-        )
-        voted_video_ids = {row[0] for row in vote_result}
-
-    items = [
-        video_to_response(v, user_voted=v.id in voted_video_ids) for v in videos
-    ]
-
-    return VideoListResponse(
-        items=items,
+    rows = (await session.execute(query)).all()
+    voted_video_ids = await load_voted_ids(session, current_user, [row.id for row in rows])
+
+    # Card keys (id, updated_at, vote counts) determine the page content
+    private = current_user is not None
+    etag = http_cache.make_etag(total, *(tuple(row) for row in rows), *sorted(voted_video_ids))
+    if (cached := http_cache.not_modified(request, etag, http_cache.RANKINGS, private)) is not None:
+        return cached
+
+    cards = await load_cards(session, rows, lite=lite)
+    response = video_list_response(
+        cards,
+        voted_video_ids,
         total=total,
         page=page,
         per_page=per_page,
         has_next=(page * per_page) < total,
     )
+    http_cache.set_cache_headers(response, etag, http_cache.RANKINGS, private)
+    return response
 
 
 @router.get("/contributors")
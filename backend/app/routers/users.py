@@ -1,17 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.database import get_session
 from app.models.user import User
 from app.models.user_follow import UserFollow
 from app.models.video import Video
-from app.models.vote import Vote
 from app.schemas.user import UserBriefResponse
 from app.services.auth import get_optional_user
+from app.services.video_reads import card_query, load_cards, load_voted_ids
 from app.utils.limiter import limiter
-from app.utils.response import video_to_response
+from app.utils.response import cards_response
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -23,6 +22,7 @@ async def get_public_profile(
     user_id: str,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    lite: bool = Query(False),
     current_user: User | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -37,68 +37,45 @@ async def get_public_profile(
             detail="ユーザーが見つかりません",
         )
 
-    # Combine counts into a single query (video total + followers + following)
-    counts_result = await session.execute(
-        select(
-            select(func.count()).select_from(Video)
-            .where(Video.submitted_by == user_id, Video.is_active == True)  # noqa: E712
-            .correlate(None).scalar_subquery().label("video_total"),
-            select(func.count()).select_from(UserFollow)
-            .where(UserFollow.following_id == user_id)
-            .correlate(None).scalar_subquery().label("followers"),
-            select(func.count()).select_from(UserFollow)
-            .where(UserFollow.follower_id == user_id)
-            .correlate(None).scalar_subquery().label("following"),
-        )
-    )
-    counts = counts_result.one()
-    total = counts[0] or 0
-    followers_count = counts[1] or 0
-    following_count = counts[2] or 0
+    # Denormalized counters (services.user_counters)
+    total = user.video_count
+    followers_count = user.followers_count
+    following_count = user.following_count
 
     # Fetch submitted videos (paginated)
     result = await session.execute(
-        select(Video)
+        card_query()
         .where(Video.submitted_by == user_id, Video.is_active == True)  # noqa: E712
-        .options(selectinload(Video.submitter), selectinload(Video.categories), selectinload(Video.tags))
         .order_by(Video.created_at.desc())
         .offset((page - 1) * per_page)
         .limit(per_page)
     )
-    videos = list(result.scalars().all())
+    cards = await load_cards(session, result.all(), lite=lite)
 
     # Check current user votes + follow status in batch
-    voted_video_ids = set()
+    voted_video_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
     is_following = False
-    if current_user:
-        video_ids = [v.id for v in videos]
-        if video_ids:
-            vote_result = await session.execute(
-                select(Vote.video_id).where(
-                    Vote.user_id == current_user.id,
-                    Vote.video_id.in_(video_ids),
-                )
-            )
-            voted_video_ids = {row[0] for row in vote_result}
-        if current_user.id != user_id:
-            follow_result = await session.execute(
-                select(UserFollow).where(
-                    UserFollow.follower_id == current_user.id,
-                    UserFollow.following_id == user_id,
-                )
+    if current_user and current_user.id != user_id:
+        follow_result = await session.execute(
+            select(UserFollow).where(
+                UserFollow.follower_id == current_user.id,
+                UserFollow.following_id == user_id,
             )
-            is_following = follow_result.scalar_one_or_none() is not None
+        )
+        is_following = follow_result.scalar_one_or_none() is not None
 
-    return {
-        "user": UserBriefResponse.model_validate(user),
-        "submitted_videos": [
-            video_to_response(v, user_voted=v.id in voted_video_ids) for v in videos
-        ],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "has_next": (page * per_page) < total,
-        "followers_count": followers_count,
-        "following_count": following_count,
-        "is_following": is_following,
-    }
+    return cards_response(
+        {
+            "user": UserBriefResponse.model_validate(user).model_dump(),
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "has_next": (page * per_page) < total,
+            "followers_count": followers_count,
+            "following_count": following_count,
+            "is_following": is_following,
+        },
+        "submitted_videos",
+        cards,
+        voted_video_ids,
+    )
@@ -2,27 +2,36 @@ import re
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from app.database import get_session
+from app.config import settings
+from app.database import get_session, utcnow
 from app.models.category import Category
 from app.models.tag import Tag, video_tags
 from app.models.user import User
 from app.models.video import Video, video_categories
-from app.models.vote import Vote
+from app.models.video_neighbor import KIND_RELATED, VideoNeighbor
 from app.schemas.video import (
+    VideoEmbedListResponse,
     VideoListResponse,
     VideoResponse,
     VideoSubmitRequest,
     VideoUpdateRequest,
 )
 from app.services.auth import get_current_user, get_optional_user
+from app.services.category_registry import adjust_category_counts, category_registry
 from app.services.oembed import fetch_oembed
+from app.services.sitemap import sitemap
+from app.services.timeline import timeline_fanout
+from app.services.user_counters import adjust_user_counters
+from app.services.video_reads import card_query, load_cards, load_embeds, load_voted_ids
+from app.utils import http_cache
 from app.utils.limiter import limiter
-from app.utils.response import video_to_response
+from app.utils.response import video_card_response, video_list_response, video_to_response
 from app.utils.url_validator import validate_video_url
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
@@ -119,7 +128,11 @@ async def submit_video(
         tags=tags,
     )
     session.add(video)
+    await adjust_category_counts(session, {c.id: 1 for c in categories})
+    await adjust_user_counters(session, current_user.id, video_count=1)
     await session.commit()
+    category_registry.invalidate()
+    timeline_fanout.enqueue(video.id, current_user.id, video.created_at)
     await session.refresh(video, ["submitter", "categories", "tags"])
 
     # Check for mass posting and alert via Discord
@@ -139,14 +152,11 @@ async def list_videos(
     sort: str = Query("new", pattern="^(new|hot)$"),
     platform: str | None = Query(None),
     tag: str | None = Query(None, max_length=50),
+    lite: bool = Query(False),
     current_user: User | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
 ):
-    query = select(Video).where(Video.is_active == True).options(  # noqa: E712
-        selectinload(Video.submitter),
-        selectinload(Video.categories),
-        selectinload(Video.tags),
-    )
+    query = card_query().where(Video.is_active == True)  # noqa: E712
 
     # Platform filter
     if platform:
@@ -174,8 +184,10 @@ async def list_videos(
 
     # Category filter
     if category:
-        query = query.join(video_categories).join(Category).where(
-            Category.slug == category
+        await category_registry.ensure_fresh(session)
+        entry = category_registry.by_slug(category)
+        query = query.join(video_categories).where(
+            video_categories.c.category_id == (entry.id if entry else None)
         )
 
     # Tag filter
@@ -194,28 +206,12 @@ async def list_videos(
 
     # Paginate
     query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await session.execute(query)
-    videos = list(result.scalars().all())
-
-    # Check user votes
-    voted_video_ids = set()
-    if current_user:
-        video_ids = [v.id for v in videos]
-        if video_ids:
-            vote_result = await session.execute(
-                select(Vote.video_id).where(
-                    Vote.user_id == current_user.id,
-                    Vote.video_id.in_(video_ids),
-                )
-            )
-            voted_video_ids = {row[0] for row in vote_result}
-
-    items = [
-        video_to_response(v, user_voted=v.id in voted_video_ids) for v in videos
-    ]
+    cards = await load_cards(session, (await session.execute(query)).all(), lite=lite)
+    voted_video_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
 
-    return VideoListResponse(
-        items=items,
+    return video_list_response(
+        cards,
+        voted_video_ids,
         total=total,
         page=page,
         per_page=per_page,
@@ -224,76 +220,112 @@ async def list_videos(
 
 
 @router.get("/sitemap")
-async def get_sitemap(session: AsyncSession = Depends(get_session)):
-    result = await session.execute(
-        select(Video.id, Video.created_at)
-        .where(Video.is_active == True)  # noqa: E712
-        .order_by(Video.created_at.desc())
-    )
-    urls = [{"id": row[0], "created_at": row[1].isoformat()} for row in result]
-    return {"urls": urls}
+async def get_sitemap(request: Request, session: AsyncSession = Depends(get_session)):
+    """Every active video in one document, streamed from the cached shards."""
+    await sitemap.ensure_built(session)
+    etag = http_cache.make_etag("sitemap", sitemap.version)
+    if (cached := http_cache.not_modified(request, etag, http_cache.SITEMAP)) is not None:
+        return cached
+    response = StreamingResponse(sitemap.iter_full(), media_type="application/json")
+    http_cache.set_cache_headers(response, etag, http_cache.SITEMAP)
+    return response
+
+
+@router.get("/sitemap/index")
+async def get_sitemap_index(request: Request, session: AsyncSession = Depends(get_session)):
+    await sitemap.ensure_built(session)
+    etag = http_cache.make_etag("sitemap-index", sitemap.version)
+    if (cached := http_cache.not_modified(request, etag, http_cache.SITEMAP)) is not None:
+        return cached
+    response = ORJSONResponse({
+        "shard_size": settings.sitemap_shard_size,
+        "shards": [
+            {"id": i, "count": shard.count, "lastmod": shard.lastmod, "etag": shard.etag}
+            for i, shard in enumerate(sitemap.shards)
+        ],
+    })
+    http_cache.set_cache_headers(response, etag, http_cache.SITEMAP)
+    return response
+
+
+@router.get("/sitemap/{shard_id}")
+async def get_sitemap_shard(
+    request: Request,
+    shard_id: int,
+    session: AsyncSession = Depends(get_session),
+):
+    await sitemap.ensure_built(session)
+    if not 0 <= shard_id < len(sitemap.shards):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="サイトマップが見つかりません",
+        )
+    shard = sitemap.shards[shard_id]
+    if (cached := http_cache.not_modified(request, shard.etag, http_cache.SITEMAP)) is not None:
+        return cached
+    response = Response(content=shard.body(), media_type="application/json")
+    http_cache.set_cache_headers(response, shard.etag, http_cache.SITEMAP)
+    return response
+
+
+@router.get("/embeds", response_model=VideoEmbedListResponse)
+async def get_embeds(
+    response: Response,
+    ids: str = Query(..., max_length=2000),
+    session: AsyncSession = Depends(get_session),
+):
+    """Embed HTML for the cards in view (companion to lite list mode)."""
+    video_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))[:50]
+    items = await load_embeds(session, video_ids) if video_ids else []
+    # Embed HTML is fixed at submission time
+    response.headers["Cache-Control"] = http_cache.EMBEDS
+    return {"items": items}
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
+    request: Request,
     video_id: str,
     current_user: User | None = Depends(get_optional_user),
     session: AsyncSession = Depends(get_session),
 ):
-    result = await session.execute(
-        select(Video)
-        .where(Video.id == video_id, Video.is_active == True)  # noqa: E712
-        .options(
-            selectinload(Video.submitter),
-            selectinload(Video.categories),
-            selectinload(Video.tags),
-        )
-    )
-    video = result.scalar_one_or_none()
-    if video is None:
+    rows = (await session.execute(
+        card_query().where(Video.id == video_id, Video.is_active == True)  # noqa: E712
+    )).all()
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="動画が見つかりません",
         )
 
-    user_voted = False
-    if current_user:
-        vote_result = await session.execute(
-            select(Vote).where(
-                Vote.user_id == current_user.id,
-                Vote.video_id == video_id,
-            )
-        )
-        user_voted = vote_result.scalar_one_or_none() is not None
-
-    return video_to_response(video, user_voted=user_voted)
+    user_voted = video_id in await load_voted_ids(session, current_user, [video_id])
+    private = current_user is not None
+    etag = http_cache.make_etag(*rows[0], user_voted)
+    if (cached := http_cache.not_modified(request, etag, http_cache.VIDEO, private)) is not None:
+        return cached
 
-
-@router.get("/{video_id}/related", response_model=VideoListResponse)
-async def get_related_videos(
-    video_id: str,
-    limit: int = Query(6, ge=1, le=20),
-    current_user: User | None = Depends(get_optional_user),
-    session: AsyncSession = Depends(get_session),
-):
-    # Fetch the source video with categories and tags
-    result = await session.execute(
-        select(Video)
-        .where(Video.id == video_id, Video.is_active == True)  # noqa: E712
-        .options(selectinload(Video.categories), selectinload(Video.tags))
-    )
-    video = result.scalar_one_or_none()
-    if video is None:
+    cards = await load_cards(session, rows)
+    if not cards:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="動画が見つかりません",
         )
+    response = video_card_response(cards[0], user_voted=user_voted)
+    http_cache.set_cache_headers(response, etag, http_cache.VIDEO, private)
+    return response
+
 
-    cat_ids = [c.id for c in video.categories]
-    tag_ids = [t.id for t in video.tags]
+async def _related_fallback(session: AsyncSession, video_id: str, limit: int) -> list:
+    """Videos sharing a category or tag, for videos not yet in the related index."""
+    cat_ids = list((await session.execute(
+        select(video_categories.c.category_id).where(video_categories.c.video_id == video_id)
+    )).scalars().all())
+    tag_ids = list((await session.execute(
+        select(video_tags.c.tag_id).where(video_tags.c.video_id == video_id)
+    )).scalars().all())
 
     if not cat_ids and not tag_ids:
-        return VideoListResponse(items=[], total=0, page=1, per_page=limit, has_next=False)
+        return []
 
     # Build OR conditions: videos sharing any category or any tag
     conditions = []
@@ -313,33 +345,60 @@ async def get_related_videos(
         conditions.append(Video.id.in_(tag_match))
 
     query = (
-        select(Video)
+        card_query()
         .where(Video.id != video_id, Video.is_active == True)  # noqa: E712
         .where(or_(*conditions))
-        .options(
-            selectinload(Video.submitter),
-            selectinload(Video.categories),
-            selectinload(Video.tags),
-        )
         .order_by(Video.vote_count.desc(), Video.created_at.desc())
         .limit(limit)
     )
-    result = await session.execute(query)
-    videos = list(result.scalars().all())
-
-    # Check user votes
-    voted_video_ids = set()
-    if current_user and videos:
-        vote_result = await session.execute(
-            select(Vote.video_id).where(
-                Vote.user_id == current_user.id,
-                Vote.video_id.in_([v.id for v in videos]),
-            )
+    return (await session.execute(query)).all()
+
+
+@router.get("/{video_id}/related", response_model=VideoListResponse)
+async def get_related_videos(
+    video_id: str,
+    limit: int = Query(6, ge=1, le=20),
+    lite: bool = Query(False),
+    current_user: User | None = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_session),
+):
+    # Precomputed neighbors (see app.tasks.related_index), read by primary key
+    source = aliased(Video)
+    source_active = (
+        select(source.id)
+        .where(source.id == video_id, source.is_active == True)  # noqa: E712
+        .exists()
+    )
+    key_rows = (await session.execute(
+        card_query()
+        .join(VideoNeighbor, VideoNeighbor.neighbor_id == Video.id)
+        .where(
+            VideoNeighbor.kind == KIND_RELATED,
+            VideoNeighbor.video_id == video_id,
+            Video.is_active == True,  # noqa: E712
+            source_active,
         )
-        voted_video_ids = {row[0] for row in vote_result}
+        .order_by(VideoNeighbor.rank)
+        .limit(limit)
+    )).all()
+
+    if not key_rows:
+        exists = (await session.execute(
+            select(Video.id).where(Video.id == video_id, Video.is_active == True)  # noqa: E712
+        )).scalar_one_or_none()
+        if exists is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="動画が見つかりません",
+            )
+        key_rows = await _related_fallback(session, video_id, limit)
 
-    items = [video_to_response(v, user_voted=v.id in voted_video_ids) for v in videos]
-    return VideoListResponse(items=items, total=len(items), page=1, per_page=limit, has_next=False)
+    cards = await load_cards(session, key_rows, lite=lite)
+    voted_video_ids = await load_voted_ids(session, current_user, [c.id for c in cards])
+
+    return video_list_response(
+        cards, voted_video_ids, total=len(cards), page=1, per_page=limit, has_next=False
+    )
 
 
 @router.delete("/{video_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -363,7 +422,20 @@ async def delete_video(
             detail="自分が投稿した動画のみ削除できます",
         )
     video.is_active = False
+    # Keep tag video_count in step with moderation (admin.moderate_video)
+    await session.execute(
+        update(Tag)
+        .where(Tag.id.in_(select(video_tags.c.tag_id).where(video_tags.c.video_id == video.id)))
+        .values(video_count=case((Tag.video_count > 0, Tag.video_count - 1), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    category_ids = (await session.execute(
+        select(video_categories.c.category_id).where(video_categories.c.video_id == video.id)
+    )).scalars().all()
+    await adjust_category_counts(session, {cid: -1 for cid in category_ids})
+    await adjust_user_counters(session, video.submitted_by, video_count=-1)
     await session.commit()
+    category_registry.invalidate()
 
 
 @router.patch("/{video_id}", response_model=VideoResponse)
@@ -401,8 +473,16 @@ async def update_video(
         cats_result = await session.execute(
             select(Category).where(Category.slug.in_(body.category_slugs[:3]))
         )
+        old_ids = {c.id for c in video.categories}
         video.categories = list(cats_result.scalars().all())
+        new_ids = {c.id for c in video.categories}
+        await adjust_category_counts(
+            session, {**{cid: -1 for cid in old_ids - new_ids}, **{cid: 1 for cid in new_ids - old_ids}}
+        )
+        # Association changes don't touch the row; bump it so cached fragments refresh
+        video.updated_at = utcnow()
 
     await session.commit()
+    category_registry.invalidate()
     await session.refresh(video, ["submitter", "categories", "tags"])
     return video_to_response(video)
@@ -1,21 +1,31 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy import select, update
+from sqlalchemy import case, delete, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
-from app.models.notification import Notification
+from app.config import settings
+from app.database import dialect_insert, get_session, utcnow
 from app.models.user import User
 from app.models.video import Video
 from app.models.vote import Vote
+from app.models.vote_removal import VoteRemoval
 from app.schemas.vote import VoteResponse
 from app.services.auth import get_current_user
+from app.services.notifications import notify_vote
+from app.services.vote_buffer import vote_buffer
 from app.utils.limiter import limiter
 
 router = APIRouter(prefix="/api/votes", tags=["votes"])
 
 
+async def _video_is_active(session: AsyncSession, video_id: str) -> bool:
+    result = await session.execute(
+        select(Video.id).where(Video.id == video_id, Video.is_active == True)  # noqa: E712
+    )
+    return result.scalar_one_or_none() is not None
+
+
 @router.post("/{video_id}", response_model=VoteResponse)
 @limiter.limit("30/minute")
 async def upvote(
@@ -24,61 +34,57 @@ async def upvote(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    # Check video exists
-    result = await session.execute(
-        select(Video).where(Video.id == video_id, Video.is_active == True)  # noqa: E712
-    )
-    video = result.scalar_one_or_none()
-    if video is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="動画が見つかりません",
-        )
-
-    # Check already voted
-    result = await session.execute(
-        select(Vote).where(
-            Vote.user_id == current_user.id,
-            Vote.video_id == video_id,
-        )
-    )
-    if result.scalar_one_or_none() is not None:
+    # Insert the vote only if the video is active; the unique constraint
+    # makes duplicate (or concurrent) votes a no-op instead of an error.
+    insert_vote = dialect_insert(session, Vote).from_select(
+        ["id", "user_id", "video_id", "created_at"],
+        select(
+            literal(str(uuid.uuid4())),
+            literal(current_user.id),
+            Video.id,
+            literal(utcnow()),
+        ).where(Video.id == video_id, Video.is_active == True),  # noqa: E712
+    ).on_conflict_do_nothing(index_elements=["user_id", "video_id"]).returning(Vote.id)
+
+    if (await session.execute(insert_vote)).scalar_one_or_none() is None:
+        # Slow path only: tell "no such video" apart from "already voted"
+        if not await _video_is_active(session, video_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="動画が見つかりません",
+            )
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="既にいいね済みです",
         )
 
-    vote = Vote(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        video_id=video_id,
-    )
-    session.add(vote)
-    await session.flush()
-
-    # Atomic increment to avoid race conditions
-    await session.execute(
-        update(Video).where(Video.id == video_id).values(
-            vote_count=Video.vote_count + 1
-        )
-    )
-    await session.refresh(video)
-
-    # Notify video submitter (don't notify self)
-    if current_user.id != video.submitted_by:
-        session.add(Notification(
-            id=str(uuid.uuid4()),
-            user_id=video.submitted_by,
-            type="vote",
-            actor_id=current_user.id,
-            video_id=video_id,
-        ))
+    if settings.vote_buffer_enabled:
+        # Counter update is deferred to the write-behind buffer
+        vote_count, submitted_by = (await session.execute(
+            select(Video.vote_count, Video.submitted_by).where(Video.id == video_id)
+        )).one()
+    else:
+        # Atomic increment; vote_count changes are not edits, keep updated_at
+        vote_count, submitted_by = (await session.execute(
+            update(Video)
+            .where(Video.id == video_id)
+            .values(vote_count=Video.vote_count + 1, updated_at=Video.updated_at)
+            .returning(Video.vote_count, Video.submitted_by)
+            .execution_options(synchronize_session=False)
+        )).one()
+
+    # Notify video submitter (don't notify self); coalesced per video
+    if submitted_by and current_user.id != submitted_by:
+        await notify_vote(session, submitted_by, current_user.id, video_id)
 
     await session.commit()
 
+    if settings.vote_buffer_enabled:
+        vote_count = max(0, vote_count + vote_buffer.add(video_id, 1))
+
     return VoteResponse(
         video_id=video_id,
-        new_vote_count=video.vote_count,
+        new_vote_count=vote_count,
         user_voted=True,
     )
 
@@ -91,48 +97,55 @@ async def remove_vote(
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    # Check video exists
-    result = await session.execute(
-        select(Video).where(Video.id == video_id, Video.is_active == True)  # noqa: E712
-    )
-    video = result.scalar_one_or_none()
-    if video is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="動画が見つかりません",
-        )
-
-    # Find vote
-    result = await session.execute(
-        select(Vote).where(
+    deleted = (await session.execute(
+        delete(Vote)
+        .where(
             Vote.user_id == current_user.id,
             Vote.video_id == video_id,
+            Vote.video_id.in_(
+                select(Video.id).where(Video.id == video_id, Video.is_active == True)  # noqa: E712
+            ),
         )
-    )
-    vote = result.scalar_one_or_none()
-    if vote is None:
+        .returning(Vote.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+
+    if deleted is None:
+        if not await _video_is_active(session, video_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="動画が見つかりません",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="いいねが見つかりません",
         )
 
-    await session.delete(vote)
-    await session.flush()
-
-    # Atomic decrement to avoid race conditions
-    await session.execute(
-        update(Video).where(Video.id == video_id).values(
-            vote_count=Video.vote_count - 1
-        )
-    )
-    await session.refresh(video)
-    # Ensure vote_count doesn't go negative
-    if video.vote_count < 0:
-        video.vote_count = 0
-    await session.commit()
+    if settings.vote_buffer_enabled:
+        # The row is gone but the decrement is buffered: let counter
+        # reconciliation see the pending change
+        session.add(VoteRemoval(id=str(uuid.uuid4()), video_id=video_id))
+        vote_count = (await session.execute(
+            select(Video.vote_count).where(Video.id == video_id)
+        )).scalar_one()
+        await session.commit()
+        vote_count = max(0, vote_count + vote_buffer.add(video_id, -1))
+    else:
+        # Atomic decrement, clamped at zero in SQL
+        vote_count = (await session.execute(
+            update(Video)
+            .where(Video.id == video_id)
+            .values(
+                vote_count=case((Video.vote_count > 0, Video.vote_count - 1), else_=0),
+                updated_at=Video.updated_at,
+            )
+            .returning(Video.vote_count)
+            .execution_options(synchronize_session=False)
+        )).scalar_one()
+        await session.commit()
 
     return VoteResponse(
         video_id=video_id,
-        new_vote_count=video.vote_count,
+        new_vote_count=vote_count,
         user_voted=False,
     )
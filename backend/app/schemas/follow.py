@@ -22,3 +22,7 @@ class FollowListResponse(BaseModel):
     page: int
     per_page: int
     has_next: bool
+
+
+class FollowSuggestionListResponse(BaseModel):
+    users: list[UserBriefResponse]
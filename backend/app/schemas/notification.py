@@ -9,6 +9,9 @@ class NotificationResponse(BaseModel):
     id: str
     type: str
     actor: UserBriefResponse
+    # Coalesced vote notifications: total actors and the latest few
+    actor_count: int = 1
+    recent_actors: list[UserBriefResponse] = []
     video_id: str | None = None
     video_title: str | None = None
     is_read: bool
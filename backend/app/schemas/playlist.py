@@ -26,18 +26,45 @@ class PlaylistBriefResponse(BaseModel):
     created_at: datetime
 
 
-class PlaylistDetailResponse(BaseModel):
+class PlaylistHeaderResponse(BaseModel):
     id: str
     name: str
     is_public: bool
     owner: UserBriefResponse
-    videos: list[VideoResponse]
+    # Active videos only
+    video_count: int
     created_at: datetime
 
 
+class PlaylistDetailResponse(PlaylistHeaderResponse):
+    # First page; fetch more via /api/playlists/{id}/videos
+    videos: list[VideoResponse]
+    next_cursor: str | None = None
+
+
 class PlaylistVideoRequest(BaseModel):
     video_id: str
 
 
+class PlaylistVideosRequest(BaseModel):
+    video_ids: list[str] = Field(min_length=1, max_length=100)
+
+
+class PlaylistMoveRequest(BaseModel):
+    # None moves the video to the top
+    after_video_id: str | None = None
+
+
 class PlaylistListResponse(BaseModel):
     playlists: list[PlaylistBriefResponse]
+
+
+class PlaylistMembershipItem(BaseModel):
+    playlist_id: str
+    playlist_name: str
+
+
+class PlaylistMembershipResponse(BaseModel):
+    playlists: list[PlaylistMembershipItem]
+    # video id -> ids of the user's playlists that contain it
+    videos: dict[str, list[str]]
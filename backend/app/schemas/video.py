@@ -55,6 +55,20 @@ class VideoResponse(BaseModel):
     created_at: datetime
 
 
+class VideoEmbedResponse(BaseModel):
+    id: str
+    oembed_html: str | None = None
+
+
+class VideoEmbedListResponse(BaseModel):
+    items: list[VideoEmbedResponse]
+
+
+class VideoCursorListResponse(BaseModel):
+    items: list[VideoResponse]
+    next_cursor: str | None = None
+
+
 class VideoListResponse(BaseModel):
     items: list[VideoResponse]
     total: int
@@ -0,0 +1,98 @@
+"""Process-wide registry of categories.
+
+There are only a handful of categories and they almost never change, so
+each worker keeps them in memory: read paths hydrate category labels from
+video_categories ids and serve /api/categories without touching the
+categories table. The registry reloads (a single-table read of a few rows)
+when it is older than CATEGORY_REGISTRY_TTL or after this worker changed
+counts, so counts maintained by other workers show up within the TTL.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, case, select, update
+
+from app.config import settings
+from app.models.category import Category
+
+
+@dataclass(frozen=True)
+class CategoryEntry:
+    id: str
+    slug: str
+    name_ja: str
+    icon: str | None
+    sort_order: int
+    is_active: bool
+    video_count: int
+
+    def label(self) -> dict:
+        """Category as embedded in video responses."""
+        return {"id": self.id, "slug": self.slug, "name_ja": self.name_ja, "icon": self.icon, "video_count": 0}
+
+
+class CategoryRegistry:
+    def __init__(self):
+        self._by_id: dict[str, CategoryEntry] = {}
+        self._by_slug: dict[str, CategoryEntry] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, session) -> None:
+        rows = (await session.execute(
+            select(
+                Category.id,
+                Category.slug,
+                Category.name_ja,
+                Category.icon,
+                Category.sort_order,
+                Category.is_active,
+                Category.video_count,
+            )
+        )).all()
+        entries = [CategoryEntry(*row) for row in rows]
+        self._by_id = {e.id: e for e in entries}
+        self._by_slug = {e.slug: e for e in entries}
+        self._loaded_at = time.monotonic()
+
+    async def ensure_fresh(self, session) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < settings.category_registry_ttl:
+            return
+        async with self._lock:
+            # Another request may have refreshed while we waited
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= settings.category_registry_ttl:
+                await self.refresh(session)
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def get(self, category_id: str) -> CategoryEntry | None:
+        return self._by_id.get(category_id)
+
+    def by_slug(self, slug: str) -> CategoryEntry | None:
+        return self._by_slug.get(slug)
+
+    def active(self) -> list[CategoryEntry]:
+        return sorted((e for e in self._by_id.values() if e.is_active), key=lambda e: e.sort_order)
+
+
+category_registry = CategoryRegistry()
+
+
+async def adjust_category_counts(session, deltas: dict[str, int]) -> None:
+    """Apply per-category video_count deltas in the caller's transaction.
+
+    Call category_registry.invalidate() once the transaction commits.
+    """
+    deltas = {cid: d for cid, d in deltas.items() if d}
+    if not deltas:
+        return
+    table = Category.__table__
+    new_count = table.c.video_count + bindparam("b_delta")
+    await session.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(video_count=case((new_count > 0, new_count), else_=0)),
+        [{"b_id": cid, "b_delta": d} for cid, d in deltas.items()],
+    )
@@ -0,0 +1,157 @@
+"""Set-based moderation writes shared by the single and bulk admin endpoints.
+
+Each operation is a fixed number of UPDATE statements over the selected
+rows, whatever their number: denormalized counters (tag, category and
+user video_count) are adjusted by correlated counts of the videos that
+actually change state, then the rows themselves are flipped. Counts are
+taken first with the same selection, so a dry run reports exactly what a
+real run would touch. Callers commit, then call
+category_registry.invalidate().
+"""
+from datetime import timedelta
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import utcnow
+from app.models.category import Category
+from app.models.report import Report
+from app.models.tag import Tag, video_tags
+from app.models.user import User
+from app.models.video import Video, video_categories
+from app.utils.metrics import metrics
+
+OPEN_REPORT_STATUSES = ("pending", "reviewing")
+
+
+def video_filter(
+    video_ids: list[str] | None = None,
+    submitted_by: list[str] | None = None,
+    since_hours: int | None = None,
+) -> list:
+    """WHERE conditions on Video for a moderation selection."""
+    conditions = []
+    if video_ids is not None:
+        conditions.append(Video.id.in_(video_ids))
+    if submitted_by is not None:
+        conditions.append(Video.submitted_by.in_(submitted_by))
+    if since_hours is not None:
+        conditions.append(Video.created_at >= utcnow() - timedelta(hours=since_hours))
+    return conditions
+
+
+def _clamped(column, delta):
+    return case((column + delta > 0, column + delta), else_=0)
+
+
+async def set_videos_active(
+    session: AsyncSession,
+    conditions: list,
+    is_active: bool,
+    *,
+    resolve_reports: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """Activate or deactivate the videos matching conditions. Returns affected counts."""
+    # Only videos whose state changes move the counters
+    changing = [*conditions, Video.is_active == (not is_active)]
+    selected = select(Video.id).where(*conditions)
+    changing_ids = select(Video.id).where(*changing)
+    open_reports = [Report.video_id.in_(selected), Report.status.in_(OPEN_REPORT_STATUSES)]
+
+    counts = {
+        "videos": (await session.execute(select(func.count()).select_from(Video).where(*changing))).scalar() or 0,
+        "tags": (await session.execute(
+            select(func.count(func.distinct(video_tags.c.tag_id)))
+            .where(video_tags.c.video_id.in_(changing_ids))
+        )).scalar() or 0,
+        "categories": (await session.execute(
+            select(func.count(func.distinct(video_categories.c.category_id)))
+            .where(video_categories.c.video_id.in_(changing_ids))
+        )).scalar() or 0,
+        "reports": 0,
+    }
+    if resolve_reports:
+        counts["reports"] = (await session.execute(
+            select(func.count()).select_from(Report).where(*open_reports)
+        )).scalar() or 0
+    if dry_run:
+        return counts
+
+    if resolve_reports and counts["reports"]:
+        await session.execute(
+            update(Report)
+            .where(*open_reports)
+            .values(status="resolved")
+            .execution_options(synchronize_session=False)
+        )
+    if counts["videos"]:
+        sign = 1 if is_active else -1
+        tag_delta = sign * (
+            select(func.count()).select_from(video_tags)
+            .where(video_tags.c.tag_id == Tag.id, video_tags.c.video_id.in_(changing_ids))
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(Tag)
+            .where(Tag.id.in_(select(video_tags.c.tag_id).where(video_tags.c.video_id.in_(changing_ids))))
+            .values(video_count=_clamped(Tag.video_count, tag_delta))
+            .execution_options(synchronize_session=False)
+        )
+        category_delta = sign * (
+            select(func.count()).select_from(video_categories)
+            .where(video_categories.c.category_id == Category.id, video_categories.c.video_id.in_(changing_ids))
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(Category)
+            .where(Category.id.in_(
+                select(video_categories.c.category_id).where(video_categories.c.video_id.in_(changing_ids))
+            ))
+            .values(video_count=_clamped(Category.video_count, category_delta))
+            .execution_options(synchronize_session=False)
+        )
+        user_delta = sign * (
+            select(func.count()).select_from(Video)
+            .where(Video.submitted_by == User.id, *changing)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(User)
+            .where(User.id.in_(select(Video.submitted_by).where(*changing)))
+            # Counter bumps are not profile edits; keep updated_at untouched
+            .values(video_count=_clamped(User.video_count, user_delta), updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        # Last: the counter statements above select on the old is_active
+        await session.execute(
+            update(Video)
+            .where(*changing)
+            .values(is_active=is_active)
+            .execution_options(synchronize_session=False)
+        )
+    metrics.incr("moderation.videos", counts["videos"])
+    return counts
+
+
+async def set_users_active(
+    session: AsyncSession,
+    user_ids: list[str],
+    is_active: bool,
+    *,
+    dry_run: bool = False,
+) -> dict:
+    """Activate or deactivate users. Returns {"users": count}."""
+    changing = [User.id.in_(user_ids), User.is_active == (not is_active)]
+    counts = {
+        "users": (await session.execute(select(func.count()).select_from(User).where(*changing))).scalar() or 0,
+    }
+    if not dry_run and counts["users"]:
+        await session.execute(
+            update(User)
+            .where(*changing)
+            .values(is_active=is_active)
+            .execution_options(synchronize_session=False)
+        )
+        metrics.incr("moderation.users", counts["users"])
+    return counts
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Events queued on a session are published only after it commits
+_PENDING_KEY = "pending_notification_events"
+QUEUE_SIZE = 100
+
+
+class NotificationHub:
+    """In-process pub/sub for per-user notification events (SSE streams).
+
+    Subscribers only see events published by the same worker process;
+    clients receive an authoritative unread count whenever they
+    (re)connect, so cross-worker gaps heal on reconnect.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event_data: dict) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event_data)
+            except asyncio.QueueFull:
+                logger.debug("Dropping notification event for slow subscriber %s", user_id)
+
+    def subscriber_count(self) -> int:
+        return sum(len(q) for q in self._subscribers.values())
+
+
+hub = NotificationHub()
+
+
+def queue_event(session, user_id: str, event_data: dict) -> None:
+    """Publish an event once the session's transaction commits."""
+    session.info.setdefault(_PENDING_KEY, []).append((user_id, event_data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for user_id, event_data in session.info.pop(_PENDING_KEY, []):
+        hub.publish(user_id, event_data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
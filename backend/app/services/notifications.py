@@ -0,0 +1,147 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import case, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import dialect_insert, utcnow
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_hub import queue_event
+
+MAX_RECENT_ACTORS = 3
+# 36-char UUIDs joined by commas
+_RECENT_ACTORS_LEN = MAX_RECENT_ACTORS * 37 - 1
+
+
+def vote_group_key(video_id: str, now: datetime) -> str:
+    """Group key shared by all vote notifications for a video in one window."""
+    window = settings.notification_group_window_hours * 3600
+    bucket = int(now.timestamp()) // window
+    return f"vote:{video_id}:{bucket}"
+
+
+def parse_recent_actor_ids(value: str | None) -> list[str]:
+    """Split the stored actor list, dropping repeat voters."""
+    if not value:
+        return []
+    return list(dict.fromkeys(a for a in value.split(",") if a))[:MAX_RECENT_ACTORS]
+
+
+async def notify_vote(
+    session: AsyncSession, recipient_id: str, actor_id: str, video_id: str
+) -> bool:
+    """Record a vote on recipient's video, coalescing into an unread group.
+
+    Votes on the same video within the grouping window update one row
+    (actor_count + latest actors) instead of inserting a row each.
+    Returns True when a new notification row was created.
+    """
+    now = utcnow()
+    notification_id = str(uuid.uuid4())
+    stmt = dialect_insert(session, Notification).values(
+        id=notification_id,
+        user_id=recipient_id,
+        type="vote",
+        actor_id=actor_id,
+        video_id=video_id,
+        group_key=vote_group_key(video_id, now),
+        actor_count=1,
+        recent_actor_ids=actor_id,
+        is_read=False,
+        created_at=now,
+    )
+    # A repeat vote (vote, unvote, vote) by an actor already in the group
+    # leaves the row untouched, so actor_count counts distinct actors and
+    # recent_actor_ids holds no duplicates. The list is never longer than
+    # MAX_RECENT_ACTORS, so an actor that has scrolled out of it is counted
+    # again; that is rare and harmless.
+    is_new_actor = ~(
+        ("," + func.coalesce(Notification.recent_actor_ids, "") + ",").contains(
+            "," + stmt.excluded.actor_id + ","
+        )
+    )
+
+    def if_new(new_value, column):
+        return case((is_new_actor, new_value), else_=column)
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Notification.user_id, Notification.group_key],
+        set_={
+            "actor_id": if_new(stmt.excluded.actor_id, Notification.actor_id),
+            "actor_count": if_new(Notification.actor_count + 1, Notification.actor_count),
+            "recent_actor_ids": if_new(
+                func.substr(
+                    stmt.excluded.actor_id + "," + func.coalesce(Notification.recent_actor_ids, ""),
+                    1,
+                    _RECENT_ACTORS_LEN,
+                ),
+                Notification.recent_actor_ids,
+            ),
+            "created_at": if_new(stmt.excluded.created_at, Notification.created_at),
+        },
+    ).returning(Notification.id, Notification.actor_count, Notification.created_at)
+    row_id, actor_count, created_at = (await session.execute(stmt)).one()
+    if created_at != now:
+        # Repeat vote: nothing changed
+        return False
+    created = row_id == notification_id
+    if created:
+        await adjust_unread_count(session, recipient_id, 1)
+    queue_event(session, recipient_id, {
+        "type": "notification",
+        "notification_type": "vote",
+        "video_id": video_id,
+        "actor_id": actor_id,
+        "actor_count": actor_count,
+    })
+    return created
+
+
+async def notify_follow(session: AsyncSession, recipient_id: str, actor_id: str) -> None:
+    """Record a new follower."""
+    session.add(Notification(
+        id=str(uuid.uuid4()),
+        user_id=recipient_id,
+        type="follow",
+        actor_id=actor_id,
+        recent_actor_ids=actor_id,
+    ))
+    await adjust_unread_count(session, recipient_id, 1)
+    queue_event(session, recipient_id, {
+        "type": "notification",
+        "notification_type": "follow",
+        "actor_id": actor_id,
+    })
+
+
+async def adjust_unread_count(session: AsyncSession, user_id: str, delta: int) -> int:
+    """Apply delta to the user's denormalized unread counter (never below 0).
+
+    The new value is pushed to the user's live streams after commit.
+    """
+    new_value = User.unread_notification_count + delta
+    count = (await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            unread_notification_count=case((new_value > 0, new_value), else_=0),
+            # Counter bumps are not profile edits; keep updated_at untouched
+            updated_at=User.updated_at,
+        )
+        .returning(User.unread_notification_count)
+        .execution_options(synchronize_session=False)
+    )).scalar_one()
+    queue_event(session, user_id, {"type": "unread_count", "count": count})
+    return count
+
+
+async def reset_unread_count(session: AsyncSession, user_id: str) -> None:
+    await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notification_count=0, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    queue_event(session, user_id, {"type": "unread_count", "count": 0})
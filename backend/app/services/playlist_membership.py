@@ -0,0 +1,65 @@
+"""Per-user playlist membership cache.
+
+A user has at most MAX_PLAYLISTS_PER_USER playlists of at most
+MAX_VIDEOS_PER_PLAYLIST videos, so their whole membership (which of their
+playlists hold which videos) is loaded with one query and answers "is this
+video saved?" for any number of videos. Playlist writes call invalidate();
+the TTL bounds staleness across worker processes.
+
+invalidate() also bumps a per-user generation. A load only caches its
+result if the generation is unchanged since before its query, so a read
+that raced a write cannot store pre-write membership after the write's
+invalidate() has run.
+"""
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.playlist import Playlist
+from app.models.playlist_video import PlaylistVideo
+from app.utils.cache import TTLCache
+from app.utils.metrics import metrics
+
+_cache = TTLCache(ttl_seconds=300, max_size=10000)
+# user id -> number of invalidations; one int per user who wrote a playlist
+_generations: dict[str, int] = {}
+
+
+class Membership(NamedTuple):
+    # (playlist id, name), newest playlist first
+    playlists: list[tuple[str, str]]
+    # video id -> ids of the user's playlists containing it
+    videos: dict[str, set[str]]
+
+
+async def load_membership(session: AsyncSession, user_id: str) -> Membership:
+    cached = _cache.get(user_id)
+    if cached is not None:
+        metrics.incr("playlist_membership.hit")
+        return cached
+    metrics.incr("playlist_membership.miss")
+    generation = _generations.get(user_id, 0)
+    rows = (await session.execute(
+        select(Playlist.id, Playlist.name, PlaylistVideo.video_id)
+        .outerjoin(PlaylistVideo, PlaylistVideo.playlist_id == Playlist.id)
+        .where(Playlist.user_id == user_id)
+        .order_by(Playlist.created_at.desc(), Playlist.id)
+    )).all()
+    playlists: dict[str, str] = {}
+    videos: dict[str, set[str]] = {}
+    for playlist_id, name, video_id in rows:
+        playlists[playlist_id] = name
+        if video_id is not None:
+            videos.setdefault(video_id, set()).add(playlist_id)
+    membership = Membership(list(playlists.items()), videos)
+    if _generations.get(user_id, 0) == generation:
+        _cache.set(user_id, membership)
+    else:
+        metrics.incr("playlist_membership.stale_load")
+    return membership
+
+
+def invalidate(user_id: str) -> None:
+    _generations[user_id] = _generations.get(user_id, 0) + 1
+    _cache.delete(user_id)
@@ -0,0 +1,64 @@
+"""Fractional playlist positions.
+
+playlist_videos.position is a float rank. Appends go POSITION_GAP past the
+current maximum and a move writes the midpoint of its new neighbours, so
+adding or reordering a video updates a single row. Repeated moves into
+the same slot halve the gap each time; once it drops below MIN_GAP the
+playlist is queued for rebalancing, which renumbers it to evenly spaced
+ranks in the background. If precision actually runs out before that
+happens, the mover rebalances inline.
+
+The queue is in-memory: a lost entry only means a later move pays for the
+inline rebalance.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.playlist_video import PlaylistVideo
+from app.utils.metrics import metrics
+
+POSITION_GAP = 1024.0
+MIN_GAP = 1e-6
+
+_pending: set[str] = set()
+
+
+def between(before: float | None, after: float | None) -> float | None:
+    """Position strictly between two neighbours (None = list end), or None if no room."""
+    if before is None and after is None:
+        return POSITION_GAP
+    if before is None:
+        return after - POSITION_GAP
+    if after is None:
+        return before + POSITION_GAP
+    mid = (before + after) / 2
+    if not before < mid < after:
+        return None
+    return mid
+
+
+def request_rebalance(playlist_id: str) -> None:
+    _pending.add(playlist_id)
+
+
+def pending_rebalances() -> list[str]:
+    """Take every queued playlist id."""
+    ids = list(_pending)
+    _pending.clear()
+    return ids
+
+
+async def rebalance(session: AsyncSession, playlist_id: str) -> int:
+    """Renumber a playlist to POSITION_GAP spacing (caller's transaction). Returns rows."""
+    ids = (await session.execute(
+        select(PlaylistVideo.id)
+        .where(PlaylistVideo.playlist_id == playlist_id)
+        .order_by(PlaylistVideo.position, PlaylistVideo.id)
+    )).scalars().all()
+    if ids:
+        await session.execute(
+            update(PlaylistVideo),
+            [{"id": pv_id, "position": (i + 1) * POSITION_GAP} for i, pv_id in enumerate(ids)],
+        )
+    metrics.incr("playlist.rebalanced")
+    return len(ids)
@@ -0,0 +1,180 @@
+"""Vectorized video-to-video similarity.
+
+Videos are rows of sparse feature matrices: tags weighted by IDF, and
+voters weighted by inverse user frequency (a user who votes on everything
+says little about any pair of videos). Rows are L2-normalized so a sparse
+product gives cosine similarity. Similarity is computed for blocks of rows
+at a time, which keeps memory proportional to the block's candidates
+rather than to N x N.
+
+Categories are too broad to generate candidates (one category can cover
+most of the catalog), so they only boost candidates found through tags or
+co-votes and fill lists that would otherwise be short. A small popularity
+prior breaks ties between equally similar videos.
+"""
+from array import array
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import sparse
+
+TAG_WEIGHT = 0.6
+COVOTE_WEIGHT = 0.4
+CATEGORY_BOOST = 0.15
+POPULARITY_WEIGHT = 0.05
+BLOCK_SIZE = 512
+# Voters above this many votes are left out of co-vote similarity: each
+# contributes degree^2 pairs while saying almost nothing about any one pair.
+MAX_VOTER_DEGREE = 5000
+
+
+class IdMap(dict):
+    """Assigns dense integer indices to string ids in insertion order."""
+
+    def index(self, key: str) -> int:
+        idx = self.get(key)
+        if idx is None:
+            idx = self[key] = len(self)
+        return idx
+
+
+class PairBuffer:
+    """Compact (row, col) pairs; millions of votes fit in a few tens of MB."""
+
+    def __init__(self):
+        self.rows = array("i")
+        self.cols = array("i")
+
+    def append(self, pair: tuple[int, int]) -> None:
+        self.rows.append(pair[0])
+        self.cols.append(pair[1])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+@dataclass
+class SimilarityInputs:
+    """Raw (video index, feature index) pairs, filled while streaming rows."""
+
+    video_ids: list[str] = field(default_factory=list)
+    vote_counts: list[int] = field(default_factory=list)
+    tag_pairs: PairBuffer = field(default_factory=PairBuffer)
+    category_pairs: PairBuffer = field(default_factory=PairBuffer)
+    vote_pairs: PairBuffer = field(default_factory=PairBuffer)
+    tags: IdMap = field(default_factory=IdMap)
+    categories: IdMap = field(default_factory=IdMap)
+    users: IdMap = field(default_factory=IdMap)
+
+
+def _incidence(pairs: PairBuffer, n_rows: int, n_cols: int) -> sparse.csr_matrix:
+    rows = np.frombuffer(pairs.rows, dtype=np.int32) if len(pairs) else np.empty(0, dtype=np.int32)
+    cols = np.frombuffer(pairs.cols, dtype=np.int32) if len(pairs) else np.empty(0, dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(n_rows, max(n_cols, 1))
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+
+class SimilarityModel:
+    def __init__(self, inputs: SimilarityInputs):
+        n = len(inputs.video_ids)
+        self.video_ids = inputs.video_ids
+        self.n = n
+
+        tags = _incidence(inputs.tag_pairs, n, len(inputs.tags))
+        df = np.asarray(tags.sum(axis=0)).ravel()
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+        self.tags = _normalize_rows(tags.dot(sparse.diags(idf.astype(np.float32))))
+        self.tags_t = self.tags.T.tocsr()
+
+        votes = _incidence(inputs.vote_pairs, n, len(inputs.users))
+        user_degree = np.asarray(votes.sum(axis=0)).ravel()
+        iuf = 1.0 / np.log2(2.0 + user_degree)
+        iuf[user_degree > MAX_VOTER_DEGREE] = 0.0
+        votes = votes.dot(sparse.diags(iuf.astype(np.float32))).tocsr()
+        votes.eliminate_zeros()
+        self.votes = _normalize_rows(votes)
+        self.votes_t = self.votes.T.tocsr()
+
+        # Few categories: a dense boolean matrix makes overlap checks cheap
+        self.categories = _incidence(inputs.category_pairs, n, len(inputs.categories)).toarray().astype(bool)
+
+        counts = np.maximum(np.asarray(inputs.vote_counts, dtype=np.float64), 0)
+        top = np.log1p(counts.max()) if n else 0.0
+        self.popularity = (np.log1p(counts) / top if top > 0 else np.zeros(n)).astype(np.float32)
+
+        # Per-category indices ordered by popularity, for filling short lists
+        self._category_popular = [
+            np.flatnonzero(self.categories[:, c])[np.argsort(-self.popularity[self.categories[:, c]], kind="stable")]
+            for c in range(self.categories.shape[1])
+        ]
+
+    def _block_scores(self, rows: np.ndarray, tag_weight: float, covote_weight: float) -> sparse.csr_matrix:
+        scores = sparse.csr_matrix((len(rows), self.n), dtype=np.float32)
+        if tag_weight:
+            scores = scores + tag_weight * self.tags[rows].dot(self.tags_t)
+        if covote_weight:
+            scores = scores + covote_weight * self.votes[rows].dot(self.votes_t)
+        return scores.tocsr()
+
+    def neighbors(
+        self,
+        rows,
+        k: int,
+        *,
+        tag_weight: float = TAG_WEIGHT,
+        covote_weight: float = COVOTE_WEIGHT,
+        category_boost: float = CATEGORY_BOOST,
+        fill_from_categories: bool = True,
+    ):
+        """Yield (row, neighbor indices, scores) with up to k neighbors per row, best first."""
+        rows = np.asarray(rows, dtype=np.int64)
+        for start in range(0, len(rows), BLOCK_SIZE):
+            block = rows[start:start + BLOCK_SIZE]
+            scores = self._block_scores(block, tag_weight, covote_weight)
+            for i, row in enumerate(block):
+                lo, hi = scores.indptr[i], scores.indptr[i + 1]
+                cols = scores.indices[lo:hi]
+                vals = scores.data[lo:hi].copy()
+                keep = cols != row
+                cols, vals = cols[keep], vals[keep]
+                if category_boost and len(cols):
+                    shared = (self.categories[cols] & self.categories[row]).any(axis=1)
+                    vals += category_boost * shared
+                vals += POPULARITY_WEIGHT * self.popularity[cols]
+
+                if fill_from_categories and len(cols) < k:
+                    cols, vals = self._fill(row, cols, vals, k, category_boost)
+
+                if len(cols) > k:
+                    top = np.argpartition(-vals, k - 1)[:k]
+                    cols, vals = cols[top], vals[top]
+                order = np.lexsort((-self.popularity[cols], -vals))
+                yield int(row), cols[order], vals[order]
+
+    def _fill(self, row: int, cols: np.ndarray, vals: np.ndarray, k: int, category_boost: float):
+        """Top up a short list with the most popular videos of the row's categories."""
+        seen = set(cols.tolist())
+        seen.add(row)
+        extra = []
+        for c in np.flatnonzero(self.categories[row]):
+            for j in self._category_popular[c]:
+                if len(cols) + len(extra) >= k:
+                    break
+                if j not in seen:
+                    seen.add(j)
+                    extra.append(j)
+        if not extra:
+            return cols, vals
+        extra = np.asarray(extra, dtype=cols.dtype if len(cols) else np.int64)
+        extra_vals = category_boost + POPULARITY_WEIGHT * self.popularity[extra]
+        return np.concatenate([cols, extra]), np.concatenate([vals, extra_vals.astype(vals.dtype)])
@@ -0,0 +1,212 @@
+"""Sharded sitemap of active videos.
+
+Active videos, ordered by (created_at, id), are split into shards on
+stable key ranges: each shard covers the keys from its start up to the
+next shard's start, and boundaries never move once cut. The first build
+streams every row through a server-side cursor, keeping at most one
+shard in memory, and cuts a new shard every sitemap_shard_size rows.
+
+Later rebuilds only look at videos whose updated_at moved since the last
+build (activation changes and inserts bump it), map them to their shard
+by key and reload just those ranges. Deactivating an old video therefore
+shrinks one shard instead of shifting every later one; new videos land
+in the last shard, which is split once it outgrows the shard size. Each
+shard is digested and only re-serialized when its digest changed, so
+untouched shards keep their ETag and crawlers and the edge can cache
+them individually.
+"""
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import and_, or_, select
+
+from app.config import settings
+from app.database import async_session, utcnow
+from app.models.video import Video
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH = 1000
+# Longer than any write transaction: a change committed after a rebuild
+# started but stamped before it is still picked up by the next one
+CHANGE_OVERLAP = timedelta(minutes=10)
+
+Key = tuple[datetime, str]
+
+
+@dataclass
+class SitemapShard:
+    start: Key | None  # first (created_at, id) in range; None for the first shard
+    digest: str
+    count: int
+    lastmod: datetime | None
+    items: bytes  # serialized URL objects, comma-separated, without brackets
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.digest}"'
+
+    def body(self) -> bytes:
+        return b'{"urls":[' + self.items + b"]}"
+
+
+def _key_at_least(key: Key):
+    created_at, video_id = key
+    return or_(Video.created_at > created_at, and_(Video.created_at == created_at, Video.id >= video_id))
+
+
+def _key_below(key: Key):
+    created_at, video_id = key
+    return or_(Video.created_at < created_at, and_(Video.created_at == created_at, Video.id < video_id))
+
+
+class Sitemap:
+    def __init__(self):
+        self.shards: list[SitemapShard] = []
+        self.built_at: float | None = None
+        self._synced_at: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> str:
+        """Digest over all shard digests (ETag of the index and full sitemap)."""
+        combined = hashlib.blake2b(digest_size=12)
+        for shard in self.shards:
+            combined.update(shard.digest.encode())
+        return combined.hexdigest()
+
+    async def ensure_built(self, session) -> None:
+        if self.built_at is None:
+            async with self._lock:
+                # Another request may have built it while we waited
+                if self.built_at is None:
+                    await self._rebuild(session)
+
+    async def rebuild(self, session) -> int:
+        """Regenerate shards whose range changed. Returns shards rebuilt."""
+        async with self._lock:
+            return await self._rebuild(session)
+
+    def _make_shard(self, start: Key | None, rows: list[tuple], old: SitemapShard | None) -> SitemapShard:
+        digest = hashlib.blake2b(digest_size=12)
+        for video_id, created_at, _ in rows:
+            digest.update(f"{video_id}|{created_at.isoformat()}\n".encode())
+        hexdigest = digest.hexdigest()
+        if old is not None and old.digest == hexdigest and old.start == start:
+            return old
+        items = orjson.dumps([
+            {"id": video_id, "created_at": created_at.isoformat()}
+            for video_id, created_at, _ in rows
+        ])[1:-1]
+        lastmod = max((updated_at for _, _, updated_at in rows), default=None)
+        return SitemapShard(start, hexdigest, len(rows), lastmod, items)
+
+    def _cut(self, start: Key | None, rows: list[tuple], old: SitemapShard | None) -> list[SitemapShard]:
+        """Shards for rows from start on, a new one every sitemap_shard_size rows."""
+        size = settings.sitemap_shard_size
+        shards = [self._make_shard(start, rows[:size], old)]
+        for i in range(size, len(rows), size):
+            chunk = rows[i:i + size]
+            shards.append(self._make_shard((chunk[0][1], chunk[0][0]), chunk, None))
+        return shards
+
+    async def _load_range(self, session, start: Key | None, end: Key | None) -> list[tuple]:
+        query = select(Video.id, Video.created_at, Video.updated_at).where(Video.is_active == True)  # noqa: E712
+        if start is not None:
+            query = query.where(_key_at_least(start))
+        if end is not None:
+            query = query.where(_key_below(end))
+        return (await session.execute(query.order_by(Video.created_at, Video.id))).all()
+
+    async def _build_all(self, session) -> list[SitemapShard]:
+        size = settings.sitemap_shard_size
+        shards: list[SitemapShard] = []
+        rows: list[tuple] = []
+        result = await session.stream(
+            select(Video.id, Video.created_at, Video.updated_at)
+            .where(Video.is_active == True)  # noqa: E712
+            .order_by(Video.created_at, Video.id)
+            .execution_options(yield_per=STREAM_BATCH)
+        )
+        async for row in result:
+            rows.append(tuple(row))
+            if len(rows) >= size:
+                start = None if not shards else (rows[0][1], rows[0][0])
+                shards.append(self._make_shard(start, rows, None))
+                rows = []
+        if rows or not shards:
+            start = None if not shards else (rows[0][1], rows[0][0])
+            shards.append(self._make_shard(start, rows, None))
+        return shards
+
+    async def _dirty_shards(self, session, since: datetime) -> set[int]:
+        """Indexes of shards holding a video updated (or inserted) since since."""
+        starts = [shard.start for shard in self.shards[1:]]
+        changed = (await session.execute(
+            select(Video.created_at, Video.id).where(Video.updated_at >= since)
+        )).all()
+        return {bisect.bisect_right(starts, (created_at, video_id)) for created_at, video_id in changed}
+
+    async def _rebuild(self, session) -> int:
+        start_time = time.perf_counter()
+        synced_at = utcnow()
+        if not self.shards or self._synced_at is None:
+            shards = await self._build_all(session)
+            rebuilt = scanned = len(shards)
+        else:
+            dirty = await self._dirty_shards(session, self._synced_at - CHANGE_OVERLAP)
+            shards = []
+            rebuilt = 0
+            for index, old in enumerate(self.shards):
+                if index not in dirty:
+                    shards.append(old)
+                    continue
+                last = index == len(self.shards) - 1
+                end = None if last else self.shards[index + 1].start
+                rows = await self._load_range(session, old.start, end)
+                # Only the last shard grows (new videos append to it)
+                fresh = self._cut(old.start, rows, old) if last else [self._make_shard(old.start, rows, old)]
+                rebuilt += sum(1 for shard in fresh if shard is not old)
+                shards.extend(fresh)
+            scanned = len(dirty)
+
+        self.shards = shards
+        self.built_at = time.time()
+        self._synced_at = synced_at
+        metrics.incr("sitemap.shards_scanned", scanned)
+        metrics.incr("sitemap.shards_rebuilt", rebuilt)
+        metrics.set_gauge("sitemap.shards", len(shards))
+        metrics.set_gauge("sitemap.urls", sum(s.count for s in shards))
+        metrics.observe("sitemap.build_seconds", time.perf_counter() - start_time)
+        return rebuilt
+
+    def iter_full(self):
+        """Yield the legacy single-document sitemap shard by shard."""
+        yield b'{"urls":['
+        first = True
+        for shard in self.shards:
+            if not shard.items:
+                continue
+            yield shard.items if first else b"," + shard.items
+            first = False
+        yield b"]}"
+
+
+sitemap = Sitemap()
+
+
+async def refresh_sitemap(session_factory=async_session) -> None:
+    """Scheduled job: regenerate changed shards."""
+    try:
+        async with session_factory() as session:
+            rebuilt = await sitemap.rebuild(session)
+        logger.info("Sitemap refreshed: %d of %d shards rebuilt", rebuilt, len(sitemap.shards))
+    except Exception:
+        logger.exception("Failed to refresh sitemap")
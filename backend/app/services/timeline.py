@@ -0,0 +1,201 @@
+"""Materialized following timelines (fan-out on write).
+
+When a user submits a video, a background worker copies it into the
+timeline_entries of each follower, one keyset page of followers per
+transaction. Authors with more than TIMELINE_FANOUT_MAX_FOLLOWERS
+followers are skipped: their videos are merged into timelines at read
+time instead (fan-out on read), so one submission never writes millions
+of rows. Which side serves a video is recorded on the video itself
+(Video.fanned_out), not derived from the author's current follower
+count, so a video is never lost when its author crosses the threshold
+after posting. Videos whose fan-out has not run yet are also read
+directly, so followers see them immediately.
+
+The queue is in-memory. Fan-out is idempotent (ON CONFLICT DO NOTHING),
+so on startup the worker re-queues recently submitted videos to cover
+work lost with a previous process.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, literal, select, update
+
+from app.config import settings
+from app.database import async_session, dialect_insert, utcnow
+from app.models.timeline_entry import TimelineEntry
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.models.video import Video
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RECOVERY_WINDOW = timedelta(minutes=30)
+
+
+async def follower_count(session, user_id: str) -> int:
+    return (await session.execute(
+        select(User.followers_count).where(User.id == user_id)
+    )).scalar() or 0
+
+
+def is_fanout_author(count: int) -> bool:
+    """Whether an author with count followers gets fan-out on write."""
+    return count <= settings.timeline_fanout_max_followers
+
+
+async def fan_out(session, video_id: str, author_id: str, created_at: datetime) -> int:
+    """Insert the video into every follower's timeline. Returns rows inserted."""
+    if not is_fanout_author(await follower_count(session, author_id)):
+        metrics.incr("timeline.fanout_skipped")
+        return 0
+    inserted = 0
+    last_id = ""
+    batch_size = settings.timeline_fanout_batch
+    while True:
+        followers = (await session.execute(
+            select(UserFollow.follower_id)
+            .where(UserFollow.following_id == author_id, UserFollow.follower_id > last_id)
+            .order_by(UserFollow.follower_id)
+            .limit(batch_size)
+        )).scalars().all()
+        if not followers:
+            break
+        await session.execute(
+            dialect_insert(session, TimelineEntry).on_conflict_do_nothing(),
+            [
+                {"user_id": f, "video_id": video_id, "author_id": author_id, "created_at": created_at}
+                for f in followers
+            ],
+        )
+        await session.commit()
+        inserted += len(followers)
+        last_id = followers[-1]
+        if len(followers) < batch_size:
+            break
+    await session.execute(
+        update(Video)
+        .where(Video.id == video_id)
+        .values(fanned_out=True, updated_at=Video.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    metrics.incr("timeline.fanout_rows", inserted)
+    return inserted
+
+
+async def backfill_follow(session, follower_id: str, author_id: str) -> None:
+    """Copy the author's latest videos into a new follower's timeline.
+
+    Runs in the caller's transaction.
+    """
+    if not is_fanout_author(await follower_count(session, author_id)):
+        return
+    latest = (
+        select(
+            literal(follower_id),
+            Video.id,
+            Video.submitted_by,
+            Video.created_at,
+        )
+        .where(Video.submitted_by == author_id, Video.is_active == True)  # noqa: E712
+        .order_by(Video.created_at.desc())
+        .limit(settings.timeline_backfill)
+    )
+    await session.execute(
+        dialect_insert(session, TimelineEntry)
+        .from_select(["user_id", "video_id", "author_id", "created_at"], latest)
+        .on_conflict_do_nothing()
+    )
+
+
+async def remove_author(session, follower_id: str, author_id: str) -> None:
+    """Drop an unfollowed author's videos from the timeline (caller's transaction)."""
+    await session.execute(
+        delete(TimelineEntry).where(
+            TimelineEntry.user_id == follower_id, TimelineEntry.author_id == author_id
+        )
+    )
+
+
+class TimelineFanout:
+    """Background worker applying fan-out for submitted videos in order."""
+
+    def __init__(self):
+        self._pending: deque[tuple[str, str, datetime]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._session_factory = async_session
+
+    def enqueue(self, video_id: str, author_id: str, created_at: datetime) -> None:
+        self._pending.append((video_id, author_id, created_at))
+        self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def drain(self, session) -> int:
+        """Fan out every queued video. Returns videos processed."""
+        processed = 0
+        while self._pending:
+            video_id, author_id, created_at = self._pending.popleft()
+            start = time.perf_counter()
+            try:
+                await fan_out(session, video_id, author_id, created_at)
+            except Exception:
+                await session.rollback()
+                metrics.incr("timeline.fanout_failed")
+                logger.exception("Failed to fan out video %s", video_id)
+            metrics.observe("timeline.fanout_seconds", time.perf_counter() - start)
+            processed += 1
+        return processed
+
+    async def recover(self, session) -> None:
+        """Re-queue recent videos whose fan-out may have been lost."""
+        rows = (await session.execute(
+            select(Video.id, Video.submitted_by, Video.created_at)
+            .where(
+                Video.created_at >= utcnow() - RECOVERY_WINDOW,
+                Video.submitted_by.is_not(None),
+                Video.is_active == True,  # noqa: E712
+                Video.fanned_out == False,  # noqa: E712
+            )
+            .order_by(Video.created_at)
+        )).all()
+        for row in rows:
+            self.enqueue(*row)
+
+    async def _run(self) -> None:
+        try:
+            async with self._session_factory() as session:
+                await self.recover(session)
+        except Exception:
+            logger.exception("Failed to recover timeline fan-out")
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                async with self._session_factory() as session:
+                    await self.drain(session)
+            except Exception:
+                logger.exception("Timeline fan-out worker error")
+
+    def start(self, session_factory=async_session) -> None:
+        self._session_factory = session_factory
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+timeline_fanout = TimelineFanout()
@@ -0,0 +1,32 @@
+"""Denormalized per-user counters (followers, following, active videos).
+
+Writers apply deltas in their own transaction with a single UPDATE, so a
+counter can never diverge from the rows it counts unless that transaction
+is lost; tasks.reconcile_counters repairs any drift.
+"""
+from sqlalchemy import case, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+COUNTERS = ("followers_count", "following_count", "video_count")
+
+
+async def adjust_user_counters(session: AsyncSession, user_id: str | None, **deltas: int) -> None:
+    """Apply deltas, e.g. adjust_user_counters(session, uid, video_count=1); never below 0."""
+    values = {}
+    for name, delta in deltas.items():
+        if name not in COUNTERS:
+            raise ValueError(f"unknown user counter: {name}")
+        if delta:
+            column = getattr(User, name)
+            values[name] = case((column + delta > 0, column + delta), else_=0)
+    if user_id is None or not values:
+        return
+    await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        # Counter bumps are not profile edits; keep updated_at untouched
+        .values(**values, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
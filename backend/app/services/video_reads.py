@@ -0,0 +1,197 @@
+"""Read-model queries for video cards.
+
+List endpoints select only ids and cache-key columns (see card_query), then
+turn them into serialized cards with load_cards(). Full columns, including
+the large oembed_html, and the category/tag labels are fetched only for
+videos whose fragment is not already cached. Write paths keep using the ORM.
+"""
+from typing import NamedTuple
+
+from sqlalchemy import literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.tag import Tag, video_tags
+from app.models.user import User
+from app.models.video import Video, video_categories
+from app.models.vote import Vote
+from app.services.category_registry import category_registry
+from app.utils.cache import TTLCache
+from app.utils.response import build_fragment, cached_fragment, fragment_key
+
+_embed_cache = TTLCache(ttl_seconds=3600, max_size=5000)
+
+# Aliased so callers can still join User for filters (e.g. search by name)
+Submitter = aliased(User, name="submitter")
+
+
+class VideoCard(NamedTuple):
+    id: str
+    fragment: bytes
+
+
+def card_query(*extra_columns):
+    """Select the columns needed to look up a video's cached fragment.
+
+    Callers add filters, ordering and pagination. Grouping callers must
+    group by Video.id and Submitter.id.
+    """
+    return select(
+        Video.id,
+        Video.updated_at,
+        Video.vote_count,
+        Submitter.updated_at.label("submitter_updated_at"),
+        *extra_columns,
+    ).outerjoin(Submitter, Submitter.id == Video.submitted_by)
+
+
+async def _load_labels(session: AsyncSession, video_ids: list[str]) -> dict[str, dict[str, list]]:
+    """Fetch category ids and tags for many videos in one UNION ALL query.
+
+    Categories are hydrated from the in-memory registry.
+    """
+    categories = select(
+        video_categories.c.video_id,
+        literal("c").label("kind"),
+        video_categories.c.category_id,
+        null(),
+    ).where(video_categories.c.video_id.in_(video_ids))
+    tags = (
+        select(video_tags.c.video_id, literal("t").label("kind"), Tag.id, Tag.name)
+        .join(Tag, Tag.id == video_tags.c.tag_id)
+        .where(video_tags.c.video_id.in_(video_ids))
+    )
+    rows = (await session.execute(union_all(categories, tags))).all()
+
+    await category_registry.ensure_fresh(session)
+    if any(kind == "c" and category_registry.get(label_id) is None for _, kind, label_id, _ in rows):
+        await category_registry.refresh(session)
+
+    labels: dict[str, dict[str, list]] = {vid: {"categories": [], "tags": []} for vid in video_ids}
+    for video_id, kind, label_id, name in rows:
+        if kind == "c":
+            entry = category_registry.get(label_id)
+            if entry is not None:
+                labels[video_id]["categories"].append(entry.label())
+        else:
+            labels[video_id]["tags"].append({"id": label_id, "name": name})
+    return labels
+
+
+async def _build_missing(session: AsyncSession, video_ids: list[str], lite: bool) -> dict[str, bytes]:
+    columns = [
+        Video.id,
+        Video.url,
+        Video.external_id,
+        Video.platform,
+        Video.author_name,
+        Video.author_url,
+    ]
+    if not lite:
+        columns.append(Video.oembed_html)
+    rows = await session.execute(
+        select(
+            *columns,
+            Video.title,
+            Video.comment,
+            Video.vote_count,
+            Video.created_at,
+            Video.updated_at,
+            Submitter.id.label("submitter_id"),
+            Submitter.display_name,
+            Submitter.avatar_url,
+            Submitter.updated_at.label("submitter_updated_at"),
+        )
+        .outerjoin(Submitter, Submitter.id == Video.submitted_by)
+        .where(Video.id.in_(video_ids))
+    )
+    labels = await _load_labels(session, video_ids)
+    fragments = {}
+    for row in rows:
+        key = fragment_key(row.id, row.updated_at, row.vote_count, row.submitter_updated_at, lite)
+        data = {
+            "id": row.id,
+            "url": row.url,
+            "external_id": row.external_id,
+            "platform": row.platform,
+            "author_name": row.author_name,
+            "author_url": row.author_url,
+        }
+        if not lite:
+            data["oembed_html"] = row.oembed_html
+        fragments[row.id] = build_fragment(key, {
+            **data,
+            "title": row.title,
+            "comment": row.comment,
+            "categories": labels[row.id]["categories"],
+            "tags": labels[row.id]["tags"],
+            "vote_count": row.vote_count,
+            "submitted_by": {
+                "id": row.submitter_id,
+                "display_name": row.display_name,
+                "avatar_url": row.avatar_url,
+            } if row.submitter_id else None,
+            "created_at": row.created_at,
+        })
+    return fragments
+
+
+async def load_cards(session: AsyncSession, key_rows, lite: bool = False) -> list[VideoCard]:
+    """Turn card_query() rows into serialized cards, preserving their order.
+
+    Lite cards omit oembed_html; clients fetch it via load_embeds() for the
+    cards actually in view.
+    """
+    fragments: dict[str, bytes] = {}
+    missing = []
+    for row in key_rows:
+        fragment = cached_fragment(
+            fragment_key(row.id, row.updated_at, row.vote_count, row.submitter_updated_at, lite)
+        )
+        if fragment is None:
+            missing.append(row.id)
+        else:
+            fragments[row.id] = fragment
+    if missing:
+        fragments.update(await _build_missing(session, missing, lite))
+    # A video deleted between the two queries is simply dropped
+    return [VideoCard(row.id, fragments[row.id]) for row in key_rows if row.id in fragments]
+
+
+async def load_embeds(session: AsyncSession, video_ids: list[str]) -> list[dict]:
+    """Return embed HTML for active videos, cached per (video id, updated_at)."""
+    rows = (await session.execute(
+        select(Video.id, Video.updated_at)
+        .where(Video.id.in_(video_ids), Video.is_active == True)  # noqa: E712
+    )).all()
+    embeds: dict[str, str | None] = {}
+    missing = []
+    for row in rows:
+        cached = _embed_cache.get((row.id, row.updated_at))
+        if cached is None:
+            missing.append(row.id)
+        else:
+            embeds[row.id] = cached[0]
+    if missing:
+        result = await session.execute(
+            select(Video.id, Video.updated_at, Video.oembed_html).where(Video.id.in_(missing))
+        )
+        for video_id, updated_at, html in result:
+            # Wrapped in a tuple so videos without embed HTML are cached too
+            _embed_cache.set((video_id, updated_at), (html,))
+            embeds[video_id] = html
+    return [
+        {"id": video_id, "oembed_html": embeds[video_id]}
+        for video_id in video_ids
+        if video_id in embeds
+    ]
+
+
+async def load_voted_ids(session: AsyncSession, user: User | None, video_ids: list[str]) -> set[str]:
+    """Return which of video_ids the user has voted for."""
+    if user is None or not video_ids:
+        return set()
+    result = await session.execute(
+        select(Vote.video_id).where(Vote.user_id == user.id, Vote.video_id.in_(video_ids))
+    )
+    return {row[0] for row in result}
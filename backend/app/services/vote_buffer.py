@@ -0,0 +1,97 @@
+import asyncio
+import logging
+
+from sqlalchemy import bindparam, case, update
+
+from app.database import async_session
+from app.models.video import Video
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class VoteCounterBuffer:
+    """Write-behind buffer for videos.vote_count (VOTE_BUFFER_ENABLED).
+
+    Vote rows are still written synchronously; only the counter update is
+    deferred. Deltas accumulate per video and are applied in one batched
+    UPDATE per flush, so concurrent voters on a viral video no longer
+    serialize on its row lock. Deltas are additive, so several workers
+    can buffer independently. A crash loses at most one interval of
+    deltas, which the counter reconciliation job repairs.
+    """
+
+    def __init__(self):
+        self._deltas: dict[str, int] = {}
+        self._task: asyncio.Task | None = None
+        self._session_factory = async_session
+
+    def add(self, video_id: str, delta: int) -> int:
+        """Buffer a delta; return the total pending delta for the video."""
+        pending = self._deltas.get(video_id, 0) + delta
+        self._deltas[video_id] = pending
+        return pending
+
+    def pending(self, video_id: str) -> int:
+        return self._deltas.get(video_id, 0)
+
+    async def flush(self, session_factory=None) -> int:
+        """Apply buffered deltas in one batched UPDATE. Returns rows touched."""
+        session_factory = session_factory or self._session_factory
+        deltas, self._deltas = self._deltas, {}
+        deltas = {vid: d for vid, d in deltas.items() if d}
+        if not deltas:
+            return 0
+
+        new_count = Video.vote_count + bindparam("b_delta")
+        stmt = (
+            update(Video.__table__)
+            .where(Video.__table__.c.id == bindparam("b_id"))
+            .values(
+                vote_count=case((new_count > 0, new_count), else_=0),
+                updated_at=Video.__table__.c.updated_at,
+            )
+        )
+        try:
+            with metrics.timer("vote_buffer.flush_seconds"):
+                async with session_factory() as session:
+                    await session.execute(
+                        stmt, [{"b_id": vid, "b_delta": d} for vid, d in deltas.items()]
+                    )
+                    await session.commit()
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            for vid, d in deltas.items():
+                self.add(vid, d)
+            raise
+        metrics.incr("vote_buffer.flushed_videos", len(deltas))
+        return len(deltas)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush vote counter buffer")
+
+    def start(self, interval: float, session_factory=async_session) -> None:
+        self._session_factory = session_factory
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush vote counter buffer on shutdown")
+
+
+vote_buffer = VoteCounterBuffer()
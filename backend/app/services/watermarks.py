@@ -0,0 +1,22 @@
+"""Progress markers for incremental background jobs (job_watermarks)."""
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models.job_watermark import JobWatermark
+
+
+async def get_watermark(session, name: str) -> datetime | None:
+    return (await session.execute(
+        select(JobWatermark.watermark).where(JobWatermark.name == name)
+    )).scalar_one_or_none()
+
+
+async def set_watermark(session, name: str, value: datetime) -> None:
+    """Store the watermark and commit."""
+    row = await session.get(JobWatermark, name)
+    if row is None:
+        session.add(JobWatermark(name=name, watermark=value))
+    else:
+        row.watermark = value
+    await session.commit()
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import resource
+import time
+
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.database import async_session
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.models.user_mute import UserMute
+from app.models.user_suggestion import UserSuggestion
+from app.models.video import Video
+from app.models.vote import Vote
+from app.services.follow_graph import FollowGraph, GraphInputs
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STREAM_BATCH = 5000
+WRITE_BATCH = 500
+
+
+async def load_graph_inputs(session) -> GraphInputs:
+    """Stream active users, follows, mutes and vote->uploader edges into index pairs."""
+    inputs = GraphInputs()
+    result = await session.stream(
+        select(User.id)
+        .where(User.is_active == True)  # noqa: E712
+        .execution_options(yield_per=STREAM_BATCH)
+    )
+    async for (user_id,) in result:
+        inputs.users.index(user_id)
+
+    sources = [
+        (select(UserFollow.follower_id, UserFollow.following_id), inputs.follows),
+        (select(UserMute.user_id, UserMute.muted_user_id), inputs.mutes),
+        (
+            select(Vote.user_id, Video.submitted_by)
+            .join(Video, Video.id == Vote.video_id)
+            .where(Video.is_active == True, Video.submitted_by.is_not(None)),  # noqa: E712
+            inputs.votes,
+        ),
+    ]
+    users = inputs.users
+    for query, pairs in sources:
+        result = await session.stream(query.execution_options(yield_per=STREAM_BATCH))
+        async for a, b in result:
+            # Edges touching inactive users are dropped
+            ia, ib = users.get(a), users.get(b)
+            if ia is not None and ib is not None:
+                pairs.append((ia, ib))
+    return inputs
+
+
+def _compute_block(graph: FollowGraph, rows: range, k: int) -> dict[str, list]:
+    ids = graph.user_ids
+    return {
+        ids[row]: [(ids[c], float(s)) for c, s in zip(cols.tolist(), scores.tolist())]
+        for row, cols, scores in graph.suggestions(rows, k)
+    }
+
+
+async def refresh_follow_suggestions(session_factory=async_session) -> dict:
+    """Recompute the top-K follow suggestions of every active user."""
+    start = time.perf_counter()
+    stats: dict = {}
+    try:
+        async with session_factory() as session:
+            inputs = await load_graph_inputs(session)
+            graph = await asyncio.to_thread(FollowGraph, inputs)
+            stats.update(
+                users=graph.n,
+                follows=len(inputs.follows),
+                vote_edges=len(inputs.votes),
+                matrix_bytes=graph.nbytes,
+                rows=0,
+            )
+            del inputs
+
+            k = settings.follow_suggestions_top_k
+            for offset in range(0, graph.n, WRITE_BATCH):
+                batch = range(offset, min(offset + WRITE_BATCH, graph.n))
+                results = await asyncio.to_thread(_compute_block, graph, batch, k)
+                user_ids = [graph.user_ids[i] for i in batch]
+                await session.execute(delete(UserSuggestion).where(UserSuggestion.user_id.in_(user_ids)))
+                rows = [
+                    {"user_id": user_id, "rank": rank, "suggested_id": suggested_id, "score": score}
+                    for user_id in user_ids
+                    for rank, (suggested_id, score) in enumerate(results.get(user_id, ()))
+                ]
+                if rows:
+                    await session.execute(insert(UserSuggestion), rows)
+                await session.commit()
+                stats["rows"] += len(rows)
+
+            # Deactivated users keep no suggestions
+            await session.execute(
+                delete(UserSuggestion).where(
+                    UserSuggestion.user_id.in_(select(User.id).where(User.is_active == False))  # noqa: E712
+                )
+            )
+            await session.commit()
+
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        # ru_maxrss is in KiB on Linux
+        stats["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        metrics.set_gauge("follow_suggestions.users", stats["users"])
+        metrics.set_gauge("follow_suggestions.matrix_bytes", stats["matrix_bytes"])
+        metrics.set_gauge("follow_suggestions.peak_rss_mb", stats["peak_rss_mb"])
+        logger.info("Follow suggestions refreshed: %s", stats)
+    except Exception:
+        logger.exception("Failed to refresh follow suggestions")
+    finally:
+        metrics.observe("follow_suggestions.seconds", time.perf_counter() - start)
+    return stats
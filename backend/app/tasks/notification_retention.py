@@ -0,0 +1,110 @@
+import logging
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select, update
+
+from app.config import settings
+from app.database import async_session, utcnow
+from app.models.notification import Notification
+from app.models.user import User
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+async def _delete_batch(session, id_query) -> tuple[int, set[str]]:
+    """Delete one batch selected by id_query (id, user_id, is_read).
+
+    Returns (deleted, user_ids that lost unread rows). Commits per batch
+    so locks are held only briefly.
+    """
+    rows = (await session.execute(id_query.limit(BATCH_SIZE))).all()
+    if not rows:
+        return 0, set()
+    await session.execute(
+        delete(Notification).where(Notification.id.in_([r[0] for r in rows]))
+    )
+    await session.commit()
+    return len(rows), {r[1] for r in rows if not r[2]}
+
+
+async def prune_notifications(session_factory=async_session):
+    """Delete notifications past the retention age or over the per-user cap."""
+    start = time.perf_counter()
+    deleted_by_age = 0
+    deleted_by_cap = 0
+    unread_touched: set[str] = set()
+    try:
+        async with session_factory() as session:
+            # 1. Age-based retention
+            cutoff = utcnow() - timedelta(days=settings.notification_retention_days)
+            age_query = select(Notification.id, Notification.user_id, Notification.is_read).where(
+                Notification.created_at < cutoff
+            )
+            while True:
+                deleted, users = await _delete_batch(session, age_query)
+                deleted_by_age += deleted
+                unread_touched |= users
+                if deleted < BATCH_SIZE:
+                    break
+
+            # 2. Per-user cap: keep the newest N per user
+            cap = settings.notification_max_per_user
+            over_cap = (await session.execute(
+                select(Notification.user_id)
+                .group_by(Notification.user_id)
+                .having(func.count() > cap)
+            )).scalars().all()
+            for user_id in over_cap:
+                cap_query = (
+                    select(Notification.id, Notification.user_id, Notification.is_read)
+                    .where(Notification.user_id == user_id)
+                    .order_by(Notification.created_at.desc())
+                    .offset(cap)
+                )
+                while True:
+                    deleted, users = await _delete_batch(session, cap_query)
+                    deleted_by_cap += deleted
+                    unread_touched |= users
+                    if deleted < BATCH_SIZE:
+                        break
+
+            # 3. Re-sync unread counters for users who lost unread rows
+            touched = list(unread_touched)
+            for i in range(0, len(touched), BATCH_SIZE):
+                chunk = touched[i:i + BATCH_SIZE]
+                await session.execute(
+                    update(User)
+                    .where(User.id.in_(chunk))
+                    .values(
+                        unread_notification_count=(
+                            select(func.count()).select_from(Notification)
+                            .where(
+                                Notification.user_id == User.id,
+                                Notification.is_read == False,  # noqa: E712
+                            )
+                            .scalar_subquery()
+                        ),
+                        updated_at=User.updated_at,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+
+            table_rows = (await session.execute(
+                select(func.count()).select_from(Notification)
+            )).scalar() or 0
+            metrics.set_gauge("notifications.table_rows", table_rows)
+
+        metrics.incr("notifications.pruned", deleted_by_age + deleted_by_cap)
+        logger.info(
+            "Pruned notifications: %d by age, %d over cap (%d rows remain)",
+            deleted_by_age, deleted_by_cap, table_rows,
+        )
+    except Exception:
+        logger.exception("Failed to prune notifications")
+    finally:
+        metrics.observe("notifications.retention_seconds", time.perf_counter() - start)
@@ -0,0 +1,31 @@
+import logging
+import time
+
+from app.database import async_session
+from app.services.playlist_positions import pending_rebalances, rebalance, request_rebalance
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def rebalance_playlists(session_factory=async_session) -> int:
+    """Renumber playlists whose positions have been squeezed by repeated moves."""
+    start = time.perf_counter()
+    playlist_ids = pending_rebalances()
+    done = 0
+    try:
+        async with session_factory() as session:
+            for playlist_id in playlist_ids:
+                await rebalance(session, playlist_id)
+                await session.commit()
+                done += 1
+        if done:
+            logger.info("Rebalanced %d playlists", done)
+    except Exception:
+        # Retry the rest on the next run
+        for playlist_id in playlist_ids[done:]:
+            request_rebalance(playlist_id)
+        logger.exception("Failed to rebalance playlists")
+    finally:
+        metrics.observe("playlist.rebalance_seconds", time.perf_counter() - start)
+    return done
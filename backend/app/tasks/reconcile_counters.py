@@ -0,0 +1,254 @@
+import logging
+import time
+from datetime import timedelta
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from app.database import async_session, utcnow
+from app.models.category import Category
+from app.models.tag import Tag, video_tags
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.models.video import Video, video_categories
+from app.models.vote import Vote
+from app.models.vote_removal import VoteRemoval
+from app.services.category_registry import category_registry
+from app.services.vote_buffer import vote_buffer
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+# Skip videos voted on or unvoted this recently: their counter may
+# legitimately lag (open transactions, write-behind buffer in other
+# workers). Unvotes leave no vote row, so they are read from vote_removals.
+RECENT_VOTE_GRACE = timedelta(seconds=60)
+
+
+async def _reconcile_video_chunk(session, last_id: str) -> tuple[str | None, int, int, int]:
+    """Check one keyset page of videos. Returns (last_id, checked, fixed, drift)."""
+    rows = (await session.execute(
+        select(Video.id, Video.vote_count)
+        .where(Video.id > last_id)
+        .order_by(Video.id)
+        .limit(CHUNK_SIZE)
+    )).all()
+    if not rows:
+        return None, 0, 0, 0
+
+    ids = [r[0] for r in rows]
+    actual = dict((await session.execute(
+        select(Vote.video_id, func.count())
+        .where(Vote.video_id.in_(ids))
+        .group_by(Vote.video_id)
+    )).all())
+    since = utcnow() - RECENT_VOTE_GRACE
+    recently_voted = set((await session.execute(
+        select(Vote.video_id)
+        .where(Vote.video_id.in_(ids), Vote.created_at >= since)
+        .union(
+            select(VoteRemoval.video_id)
+            .where(VoteRemoval.video_id.in_(ids), VoteRemoval.created_at >= since)
+        )
+    )).scalars().all())
+
+    fixes = [
+        {"b_id": vid, "b_count": actual.get(vid, 0), "b_old": count}
+        for vid, count in rows
+        if count != actual.get(vid, 0)
+        and vid not in recently_voted
+        and not vote_buffer.pending(vid)
+    ]
+    if fixes:
+        table = Video.__table__
+        # Guard on the old value so a concurrent increment is never overwritten
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.vote_count == bindparam("b_old"))
+            .values(vote_count=bindparam("b_count"), updated_at=table.c.updated_at),
+            fixes,
+        )
+    await session.commit()
+    drift = sum(abs(f["b_count"] - f["b_old"]) for f in fixes)
+    return ids[-1], len(rows), len(fixes), drift
+
+
+async def _reconcile_tag_chunk(session, last_id: str) -> tuple[str | None, int, int, int]:
+    """Tag.video_count counts active videos carrying the tag."""
+    rows = (await session.execute(
+        select(Tag.id, Tag.video_count)
+        .where(Tag.id > last_id)
+        .order_by(Tag.id)
+        .limit(CHUNK_SIZE)
+    )).all()
+    if not rows:
+        return None, 0, 0, 0
+
+    ids = [r[0] for r in rows]
+    actual = dict((await session.execute(
+        select(video_tags.c.tag_id, func.count())
+        .join(Video, Video.id == video_tags.c.video_id)
+        .where(video_tags.c.tag_id.in_(ids), Video.is_active == True)  # noqa: E712
+        .group_by(video_tags.c.tag_id)
+    )).all())
+
+    fixes = [
+        {"b_id": tid, "b_count": actual.get(tid, 0), "b_old": count}
+        for tid, count in rows
+        if count != actual.get(tid, 0)
+    ]
+    if fixes:
+        table = Tag.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.video_count == bindparam("b_old"))
+            .values(video_count=bindparam("b_count")),
+            fixes,
+        )
+    await session.commit()
+    drift = sum(abs(f["b_count"] - f["b_old"]) for f in fixes)
+    return ids[-1], len(rows), len(fixes), drift
+
+
+async def _reconcile_category_chunk(session, last_id: str) -> tuple[str | None, int, int, int]:
+    """Category.video_count counts active videos in the category."""
+    rows = (await session.execute(
+        select(Category.id, Category.video_count)
+        .where(Category.id > last_id)
+        .order_by(Category.id)
+        .limit(CHUNK_SIZE)
+    )).all()
+    if not rows:
+        return None, 0, 0, 0
+
+    ids = [r[0] for r in rows]
+    actual = dict((await session.execute(
+        select(video_categories.c.category_id, func.count())
+        .join(Video, Video.id == video_categories.c.video_id)
+        .where(video_categories.c.category_id.in_(ids), Video.is_active == True)  # noqa: E712
+        .group_by(video_categories.c.category_id)
+    )).all())
+
+    fixes = [
+        {"b_id": cid, "b_count": actual.get(cid, 0), "b_old": count}
+        for cid, count in rows
+        if count != actual.get(cid, 0)
+    ]
+    if fixes:
+        table = Category.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.video_count == bindparam("b_old"))
+            .values(video_count=bindparam("b_count")),
+            fixes,
+        )
+        category_registry.invalidate()
+    await session.commit()
+    drift = sum(abs(f["b_count"] - f["b_old"]) for f in fixes)
+    return ids[-1], len(rows), len(fixes), drift
+
+
+async def _reconcile_user_chunk(session, last_id: str) -> tuple[str | None, int, int, int]:
+    """User followers_count, following_count and video_count (active videos)."""
+    rows = (await session.execute(
+        select(User.id, User.followers_count, User.following_count, User.video_count)
+        .where(User.id > last_id)
+        .order_by(User.id)
+        .limit(CHUNK_SIZE)
+    )).all()
+    if not rows:
+        return None, 0, 0, 0
+
+    ids = [r[0] for r in rows]
+    followers = dict((await session.execute(
+        select(UserFollow.following_id, func.count())
+        .where(UserFollow.following_id.in_(ids))
+        .group_by(UserFollow.following_id)
+    )).all())
+    following = dict((await session.execute(
+        select(UserFollow.follower_id, func.count())
+        .where(UserFollow.follower_id.in_(ids))
+        .group_by(UserFollow.follower_id)
+    )).all())
+    videos = dict((await session.execute(
+        select(Video.submitted_by, func.count())
+        .where(Video.submitted_by.in_(ids), Video.is_active == True)  # noqa: E712
+        .group_by(Video.submitted_by)
+    )).all())
+
+    fixes = []
+    drift = 0
+    for uid, old_followers, old_following, old_videos in rows:
+        actual = (followers.get(uid, 0), following.get(uid, 0), videos.get(uid, 0))
+        old = (old_followers, old_following, old_videos)
+        if actual != old:
+            drift += sum(abs(a - o) for a, o in zip(actual, old))
+            fixes.append({
+                "b_id": uid,
+                "b_followers": actual[0], "b_following": actual[1], "b_videos": actual[2],
+                "b_old_followers": old[0], "b_old_following": old[1], "b_old_videos": old[2],
+            })
+    if fixes:
+        table = User.__table__
+        await session.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                table.c.followers_count == bindparam("b_old_followers"),
+                table.c.following_count == bindparam("b_old_following"),
+                table.c.video_count == bindparam("b_old_videos"),
+            )
+            .values(
+                followers_count=bindparam("b_followers"),
+                following_count=bindparam("b_following"),
+                video_count=bindparam("b_videos"),
+                updated_at=table.c.updated_at,
+            ),
+            fixes,
+        )
+    await session.commit()
+    return ids[-1], len(rows), len(fixes), drift
+
+
+async def _prune_vote_removals(session) -> None:
+    """Removals older than the grace period have been flushed everywhere."""
+    await session.execute(delete(VoteRemoval).where(VoteRemoval.created_at < utcnow() - RECENT_VOTE_GRACE))
+    await session.commit()
+
+
+async def _reconcile(session, chunk_fn, name: str) -> dict:
+    checked = fixed = drift = 0
+    last_id = ""
+    while last_id is not None:
+        last_id, c, f, d = await chunk_fn(session, last_id)
+        checked += c
+        fixed += f
+        drift += d
+    metrics.incr(f"reconcile.{name}_fixed", fixed)
+    metrics.set_gauge(f"reconcile.{name}_drift", drift)
+    return {"checked": checked, "fixed": fixed, "drift": drift}
+
+
+async def reconcile_counters(session_factory=async_session) -> dict:
+    """Recompute denormalized counters from source tables, chunk by chunk.
+
+    Each keyset page is read, compared and committed on its own, and only
+    rows whose counter differs are written, so no long table locks are held.
+    """
+    start = time.perf_counter()
+    stats: dict = {}
+    try:
+        async with session_factory() as session:
+            await _prune_vote_removals(session)
+            stats["video_vote_count"] = await _reconcile(session, _reconcile_video_chunk, "video_vote_count")
+            stats["tag_video_count"] = await _reconcile(session, _reconcile_tag_chunk, "tag_video_count")
+            stats["category_video_count"] = await _reconcile(
+                session, _reconcile_category_chunk, "category_video_count"
+            )
+            stats["user_counts"] = await _reconcile(session, _reconcile_user_chunk, "user_counts")
+        logger.info("Counter reconciliation: %s", stats)
+    except Exception:
+        logger.exception("Failed to reconcile counters")
+    finally:
+        metrics.observe("reconcile.seconds", time.perf_counter() - start)
+    return stats
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+from array import array
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.database import async_session, utcnow
+from app.models.tag import video_tags
+from app.models.video import Video, video_categories
+from app.models.video_neighbor import KIND_COVOTE, KIND_RELATED, VideoNeighbor
+from app.models.vote import Vote
+from app.services.recommendations import PairBuffer, SimilarityInputs, SimilarityModel
+from app.services.watermarks import get_watermark, set_watermark
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# kind -> (settings attribute holding K, SimilarityModel.neighbors weights)
+KINDS = {
+    KIND_RELATED: ("related_top_k", {}),
+    KIND_COVOTE: ("covote_top_k", {
+        "tag_weight": 0.0, "covote_weight": 1.0, "category_boost": 0.0, "fill_from_categories": False,
+    }),
+}
+WATERMARK = "related_index"
+FULL_WATERMARK = "related_index_full"
+# A periodic full rebuild picks up what the incremental pass cannot see
+# (removed votes and tags, drift in IDF weights).
+FULL_REBUILD_INTERVAL = timedelta(hours=24)
+STREAM_BATCH = 5000
+WRITE_BATCH = 500
+
+# Inputs of the last successful run and the watermark they match. An
+# incremental run patches them with apply_changes() instead of streaming
+# every video, tag, category and vote row again; they are reloaded when
+# missing (new process) or out of step with the stored watermark.
+_cached_inputs: SimilarityInputs | None = None
+_cached_at: datetime | None = None
+
+
+def _feature_sources(inputs: SimilarityInputs) -> list:
+    """(query, video id column, pairs, feature ids) for each feature table."""
+    return [
+        (select(video_tags.c.video_id, video_tags.c.tag_id), video_tags.c.video_id,
+         inputs.tag_pairs, inputs.tags),
+        (select(video_categories.c.video_id, video_categories.c.category_id), video_categories.c.video_id,
+         inputs.category_pairs, inputs.categories),
+        (select(Vote.video_id, Vote.user_id), Vote.video_id, inputs.vote_pairs, inputs.users),
+    ]
+
+
+async def load_inputs(session) -> SimilarityInputs:
+    """Stream active videos and their tags, categories and votes into index pairs."""
+    inputs = SimilarityInputs()
+    index: dict[str, int] = {}
+    result = await session.stream(
+        select(Video.id, Video.vote_count)
+        .where(Video.is_active == True)  # noqa: E712
+        .execution_options(yield_per=STREAM_BATCH)
+    )
+    async for video_id, vote_count in result:
+        index[video_id] = len(inputs.video_ids)
+        inputs.video_ids.append(video_id)
+        inputs.vote_counts.append(vote_count)
+
+    for query, _, pairs, features in _feature_sources(inputs):
+        result = await session.stream(query.execution_options(yield_per=STREAM_BATCH))
+        async for video_id, feature_id in result:
+            row = index.get(video_id)
+            if row is not None:
+                pairs.append((row, features.index(feature_id)))
+    return inputs
+
+
+def _drop_rows(pairs: PairBuffer, rows: set[int]) -> None:
+    if not rows or not len(pairs):
+        return
+    keep = ~np.isin(np.frombuffer(pairs.rows, dtype=np.int32), np.fromiter(rows, dtype=np.int32))
+    pairs.rows = array("i", np.frombuffer(pairs.rows, dtype=np.int32)[keep].tobytes())
+    pairs.cols = array("i", np.frombuffer(pairs.cols, dtype=np.int32)[keep].tobytes())
+
+
+async def apply_changes(session, inputs: SimilarityInputs, changed: set[str]) -> None:
+    """Reload the rows of changed videos in place, reading only their feature rows.
+
+    A deactivated video keeps its index but loses every feature, so it
+    scores against nothing until the next full rebuild drops it.
+    """
+    index = {video_id: i for i, video_id in enumerate(inputs.video_ids)}
+    ids = list(changed)
+    active: list[str] = []
+    for i in range(0, len(ids), WRITE_BATCH):
+        rows = (await session.execute(
+            select(Video.id, Video.vote_count, Video.is_active).where(Video.id.in_(ids[i:i + WRITE_BATCH]))
+        )).all()
+        for video_id, vote_count, is_active in rows:
+            row = index.get(video_id)
+            if row is None:
+                if not is_active:
+                    continue
+                row = index[video_id] = len(inputs.video_ids)
+                inputs.video_ids.append(video_id)
+                inputs.vote_counts.append(0)
+            inputs.vote_counts[row] = vote_count if is_active else 0
+            if is_active:
+                active.append(video_id)
+
+    changed_rows = {index[video_id] for video_id in ids if video_id in index}
+    for query, video_col, pairs, features in _feature_sources(inputs):
+        _drop_rows(pairs, changed_rows)
+        for i in range(0, len(active), WRITE_BATCH):
+            for video_id, feature_id in (await session.execute(
+                query.where(video_col.in_(active[i:i + WRITE_BATCH]))
+            )).all():
+                pairs.append((index[video_id], features.index(feature_id)))
+
+
+async def _changed_since(session, since: datetime) -> set[str]:
+    """Videos edited, added, deactivated or voted on since the watermark."""
+    edited = (await session.execute(
+        select(Video.id).where(Video.updated_at > since)
+    )).scalars().all()
+    voted = (await session.execute(
+        select(Vote.video_id).where(Vote.created_at > since).distinct()
+    )).scalars().all()
+    return set(edited) | set(voted)
+
+
+async def _listing(session, kind: str, video_ids: set[str]) -> set[str]:
+    """Videos whose stored list contains any of video_ids."""
+    listing: set[str] = set()
+    ids = list(video_ids)
+    for i in range(0, len(ids), WRITE_BATCH):
+        listing.update((await session.execute(
+            select(VideoNeighbor.video_id)
+            .where(VideoNeighbor.kind == kind, VideoNeighbor.neighbor_id.in_(ids[i:i + WRITE_BATCH]))
+            .distinct()
+        )).scalars().all())
+    return listing
+
+
+async def write_neighbors(session, kind: str, video_ids: list[str], results: dict[str, list]) -> int:
+    """Replace the stored lists of video_ids; ids without results end up empty.
+
+    Commits per batch so readers see at most one batch in flight.
+    """
+    written = 0
+    for i in range(0, len(video_ids), WRITE_BATCH):
+        batch = video_ids[i:i + WRITE_BATCH]
+        await session.execute(
+            delete(VideoNeighbor).where(VideoNeighbor.kind == kind, VideoNeighbor.video_id.in_(batch))
+        )
+        rows = [
+            {"kind": kind, "video_id": video_id, "rank": rank, "neighbor_id": neighbor_id, "score": score}
+            for video_id in batch
+            for rank, (neighbor_id, score) in enumerate(results.get(video_id, ()))
+        ]
+        if rows:
+            await session.execute(insert(VideoNeighbor), rows)
+        await session.commit()
+        written += len(rows)
+    return written
+
+
+def compute_neighbors(model: SimilarityModel, rows, k: int, **weights) -> dict[str, list]:
+    """Run the model for rows (CPU-bound; call via asyncio.to_thread)."""
+    ids = model.video_ids
+    return {
+        ids[row]: [(ids[c], float(s)) for c, s in zip(cols.tolist(), scores.tolist())]
+        for row, cols, scores in model.neighbors(rows, k, **weights)
+    }
+
+
+async def _refresh_kind(session, model: SimilarityModel, kind: str, changed: set[str] | None) -> tuple[int, int]:
+    """Recompute one kind of list; changed=None rebuilds every list. Returns (videos, rows)."""
+    k_setting, weights = KINDS[kind]
+    k = getattr(settings, k_setting)
+    row_of = {video_id: i for i, video_id in enumerate(model.video_ids)}
+
+    if changed is None:
+        targets = list(model.video_ids)
+        results = await asyncio.to_thread(compute_neighbors, model, range(model.n), k, **weights)
+        stale = set((await session.execute(
+            select(VideoNeighbor.video_id).where(VideoNeighbor.kind == kind).distinct()
+        )).scalars().all())
+        targets += list(stale - set(row_of))
+    else:
+        changed_rows = [row_of[v] for v in changed if v in row_of]
+        results = await asyncio.to_thread(compute_neighbors, model, changed_rows, k, **weights)
+        affected = await _listing(session, kind, changed)
+        for neighbors in results.values():
+            affected.update(neighbor_id for neighbor_id, _ in neighbors)
+        affected -= changed
+        extra_rows = [row_of[v] for v in affected if v in row_of]
+        results.update(await asyncio.to_thread(compute_neighbors, model, extra_rows, k, **weights))
+        targets = list(changed | affected)
+
+    rows = await write_neighbors(session, kind, targets, results)
+    return len(targets), rows
+
+
+async def refresh_related_index(session_factory=async_session, full: bool = False) -> dict:
+    """Rebuild the neighbor lists of changed videos (or of all videos).
+
+    Both kinds (related, covote) share one pass over the source tables. An
+    incremental pass recomputes videos changed since the last run plus
+    every video whose old or new list contains one of them, reading source
+    rows for the changed videos only (see apply_changes).
+    """
+    global _cached_inputs, _cached_at
+    start = time.perf_counter()
+    stats: dict = {"mode": "full" if full else "incremental"}
+    try:
+        async with session_factory() as session:
+            started_at = utcnow()
+            since = await get_watermark(session, WATERMARK)
+            last_full = await get_watermark(session, FULL_WATERMARK)
+            if since is None or last_full is None or started_at - last_full > FULL_REBUILD_INTERVAL:
+                full = True
+                stats["mode"] = "full"
+
+            changed: set[str] | None = None
+            if not full:
+                changed = await _changed_since(session, since)
+                if not changed:
+                    await set_watermark(session, WATERMARK, started_at)
+                    if _cached_at == since:
+                        _cached_at = started_at
+                    return stats
+
+            inputs, _cached_inputs = _cached_inputs, None
+            if full or inputs is None or _cached_at != since:
+                inputs = await load_inputs(session)
+            else:
+                await apply_changes(session, inputs, changed)
+            model = await asyncio.to_thread(SimilarityModel, inputs)
+            for kind in KINDS:
+                videos, rows = await _refresh_kind(session, model, kind, changed)
+                stats[kind] = {"videos": videos, "rows": rows}
+                metrics.incr(f"related_index.{kind}_videos", videos)
+
+            await set_watermark(session, WATERMARK, started_at)
+            if full:
+                await set_watermark(session, FULL_WATERMARK, started_at)
+            _cached_inputs, _cached_at = inputs, started_at
+        logger.info("Neighbor index refreshed: %s", stats)
+    except Exception:
+        logger.exception("Failed to refresh neighbor index")
+    finally:
+        metrics.observe("related_index.seconds", time.perf_counter() - start)
+    return stats
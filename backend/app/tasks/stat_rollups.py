@@ -0,0 +1,134 @@
+"""Daily and hourly counts of created rows for the admin dashboard.
+
+Each run recomputes only the buckets at or after the watermark (a bucket
+is rebuilt whole from its source rows, so re-running is idempotent) and
+moves the watermark to the run's start. A row can commit after a run
+started yet carry an earlier created_at, so both the next run and readers
+go back LATE_COMMIT_OVERLAP before the watermark: runs rebuild from there,
+and readers add rows from tail_start() onwards to the daily rollups before
+it. Once a day the whole
+history is rebuilt so deleted rows drop out of old buckets. Hourly
+buckets are only kept for the last settings.stats_hourly_hours.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from app.config import settings
+from app.database import async_session, utcnow
+from app.models.feedback import Feedback
+from app.models.report import Report
+from app.models.stat_rollup import GRANULARITY_DAY, GRANULARITY_HOUR, StatRollup
+from app.models.user import User
+from app.models.video import Video
+from app.models.vote import Vote
+from app.services.watermarks import get_watermark, set_watermark
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# metric -> (created_at column, dimension column or None)
+METRICS = {
+    "signups": (User.created_at, None),
+    "videos": (Video.created_at, Video.platform),
+    "votes": (Vote.created_at, None),
+    "reports": (Report.created_at, None),
+    "feedbacks": (Feedback.created_at, None),
+}
+
+WATERMARK = "stat_rollups"
+FULL_WATERMARK = "stat_rollups_full"
+FULL_REBUILD_INTERVAL = timedelta(hours=24)
+# Longer than any write transaction: rows older than this before the
+# watermark were committed before the run that rolled them up
+LATE_COMMIT_OVERLAP = timedelta(minutes=10)
+
+
+def floor_bucket(value: datetime, granularity: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if granularity == GRANULARITY_DAY else value
+
+
+def tail_start(watermark: datetime) -> datetime:
+    """Start of the first daily bucket readers count from source rows."""
+    return floor_bucket(watermark - LATE_COMMIT_OVERLAP, GRANULARITY_DAY)
+
+
+def _bucket(session, column, granularity: str):
+    if session.bind.dialect.name == "postgresql":
+        return func.date_trunc(granularity, column)
+    fmt = "%Y-%m-%d 00:00:00" if granularity == GRANULARITY_DAY else "%Y-%m-%d %H:00:00"
+    return func.strftime(fmt, column)
+
+
+async def _rebuild(session, granularity: str, since: datetime | None, until: datetime) -> int:
+    """Replace every bucket from since (None = all history) with fresh counts."""
+    written = 0
+    for metric, (column, dimension) in METRICS.items():
+        keys = [_bucket(session, column, granularity)]
+        if dimension is not None:
+            keys.append(dimension)
+        query = select(func.count(), *keys).where(column < until).group_by(*keys)
+        if since is not None:
+            query = query.where(column >= since)
+        rows = []
+        for n, b, *dim in (await session.execute(query)).all():
+            rows.append({
+                "granularity": granularity,
+                "metric": metric,
+                # SQLite returns the strftime() text
+                "bucket": b if isinstance(b, datetime) else datetime.fromisoformat(b),
+                "dimension": (dim[0] if dim else None) or "",
+                "count": n,
+            })
+
+        stale = delete(StatRollup).where(
+            StatRollup.granularity == granularity, StatRollup.metric == metric
+        )
+        if since is not None:
+            stale = stale.where(StatRollup.bucket >= since)
+        await session.execute(stale)
+        if rows:
+            await session.execute(insert(StatRollup), rows)
+        written += len(rows)
+    return written
+
+
+async def refresh_stat_rollups(session_factory=async_session, full: bool = False) -> dict:
+    start = time.perf_counter()
+    stats: dict = {"mode": "full" if full else "incremental"}
+    try:
+        async with session_factory() as session:
+            started_at = utcnow()
+            since = await get_watermark(session, WATERMARK)
+            last_full = await get_watermark(session, FULL_WATERMARK)
+            if since is None or last_full is None or started_at - last_full > FULL_REBUILD_INTERVAL:
+                full = True
+                stats["mode"] = "full"
+
+            hourly_from = floor_bucket(started_at - timedelta(hours=settings.stats_hourly_hours), GRANULARITY_HOUR)
+            day_since = None if full else tail_start(since)
+            hour_since = hourly_from if full else max(
+                hourly_from, floor_bucket(since - LATE_COMMIT_OVERLAP, GRANULARITY_HOUR)
+            )
+            stats["day_rows"] = await _rebuild(session, GRANULARITY_DAY, day_since, started_at)
+            stats["hour_rows"] = await _rebuild(session, GRANULARITY_HOUR, hour_since, started_at)
+            await session.execute(
+                delete(StatRollup).where(
+                    StatRollup.granularity == GRANULARITY_HOUR, StatRollup.bucket < hourly_from
+                )
+            )
+
+            # Commits the rollups and the watermark together
+            await set_watermark(session, WATERMARK, started_at)
+            if full:
+                await set_watermark(session, FULL_WATERMARK, started_at)
+        metrics.incr("stat_rollups.rows", stats["day_rows"] + stats["hour_rows"])
+        logger.info("Stat rollups refreshed: %s", stats)
+    except Exception:
+        logger.exception("Failed to refresh stat rollups")
+    finally:
+        metrics.observe("stat_rollups.seconds", time.perf_counter() - start)
+    return stats
@@ -19,18 +19,14 @@ class TTLCache:
         return None
 
     def set(self, key: str, value: Any) -> None:
+        # Re-insert so dict order stays sorted by expiry (the TTL is fixed)
+        self._cache.pop(key, None)
         if len(self._cache) >= self._max_size:
-            self._evict_expired()
-            if len(self._cache) >= self._max_size:
-                oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
-                del self._cache[oldest_key]
+            del self._cache[next(iter(self._cache))]
         self._cache[key] = (value, time.time() + self._ttl)
 
+    def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
+
     def clear(self) -> None:
         self._cache.clear()
-
-    def _evict_expired(self) -> None:
-        now = time.time()
-        expired = [k for k, (_, exp) in self._cache.items() if now >= exp]
-        for k in expired:
-            del self._cache[k]
@@ -0,0 +1,146 @@
+"""Response compression middleware with a cache for cacheable bodies.
+
+Negotiates zstd, brotli (when their optional packages are installed) or
+gzip from Accept-Encoding and compresses complete, non-streaming
+responses above a size threshold. Responses that carry an ETag and a
+public Cache-Control (rankings, trending, categories, sitemap, video
+detail) have their compressed bytes cached by (path, ETag, encoding), so
+repeat hits skip the compression CPU entirely.
+"""
+import gzip
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.cache import TTLCache
+from app.utils.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/xml", "application/javascript")
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def available_encodings() -> list[str]:
+    """Supported encodings in order of preference."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str, encodings: list[str]) -> str | None:
+    """Pick the preferred encoding the client accepts (q > 0)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    for encoding in encodings:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache_size: int = 512, cache_ttl: int = 300):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings()
+        self.cache = TTLCache(ttl_seconds=cache_ttl, max_size=cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            # Streaming responses (SSE, chunked downloads) are sent as-is
+            if message.get("more_body", False) or not self._should_compress(start_message, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            compressed = self._compressed_body(scope, headers, body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, start_message: Message, body: bytes) -> bool:
+        if start_message["status"] != 200 or len(body) < self.minimum_size:
+            return False
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if content_type.startswith("text/event-stream"):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def _compressed_body(self, scope: Scope, headers: MutableHeaders, body: bytes, encoding: str) -> bytes:
+        etag = headers.get("etag")
+        cacheable = etag is not None and headers.get("cache-control", "").startswith("public")
+        key = (scope["path"], scope.get("query_string", b""), etag, encoding)
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                metrics.incr("compression.cache_hits")
+                metrics.incr("compression.bytes_saved", len(body) - len(cached))
+                return cached
+
+        started = time.perf_counter()
+        compressed = _compress(body, encoding)
+        metrics.observe(f"compression.{encoding}_seconds", time.perf_counter() - started)
+        metrics.incr("compression.bytes_in", len(body))
+        metrics.incr("compression.bytes_out", len(compressed))
+        metrics.incr("compression.bytes_saved", len(body) - len(compressed))
+        if cacheable:
+            self.cache.set(key, compressed)
+        return compressed
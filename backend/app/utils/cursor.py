@@ -0,0 +1,65 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor is the sort key of the last row of a page, urlsafe-base64 encoded
+so clients treat it as an opaque token.
+"""
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_
+
+
+def encode_cursor(*parts) -> str:
+    raw = "|".join(p.isoformat() if isinstance(p, datetime) else str(p) for p in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, count: int) -> list[str]:
+    """Split a cursor into its count parts; 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (ValueError, UnicodeDecodeError):
+        raw = ""
+    parts = raw.split("|")
+    if len(parts) != count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="不正なカーソルです",
+        )
+    return parts
+
+
+def decode_time_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a (created_at, id) cursor."""
+    created_at, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="不正なカーソルです",
+        )
+
+
+def before_cursor(sort_col, id_col, cursor: str | None) -> list:
+    """Conditions selecting rows after a (sort value, id) cursor in DESC order."""
+    if cursor is None:
+        return []
+    sort_value, row_id = decode_time_cursor(cursor)
+    return [or_(sort_col < sort_value, (sort_col == sort_value) & (id_col < row_id))]
+
+
+def after_position_cursor(position_col, id_col, cursor: str | None) -> list:
+    """Conditions selecting rows after a (position, id) cursor in ASC order."""
+    if cursor is None:
+        return []
+    position, row_id = decode_cursor(cursor, 2)
+    try:
+        position = float(position)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="不正なカーソルです",
+        )
+    return [or_(position_col > position, (position_col == position) & (id_col > row_id))]
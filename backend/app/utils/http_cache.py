@@ -0,0 +1,56 @@
+"""HTTP validators and Cache-Control policies for public GET endpoints.
+
+Routes compute an ETag from cheap inputs (ids, updated_at, vote counts,
+row counts) before building the body, answer If-None-Match with a 304,
+and otherwise attach the ETag plus a per-route Cache-Control policy.
+Anonymous responses may be stored by the edge (s-maxage with
+stale-while-revalidate); responses for signed-in users carry per-user
+fields and are private.
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+# Per-route policies for anonymous responses
+CATEGORIES = "public, max-age=60, s-maxage=300, stale-while-revalidate=3600"
+VIDEO = "public, max-age=0, s-maxage=30, stale-while-revalidate=300"
+RANKINGS = "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+SITEMAP = "public, max-age=300, s-maxage=3600, stale-while-revalidate=86400"
+PLAYLIST = "public, max-age=0, s-maxage=60, stale-while-revalidate=300"
+EMBEDS = "public, max-age=300, s-maxage=86400, stale-while-revalidate=86400"
+PRIVATE = "private, no-cache"
+
+# Responses differ between signed-in and anonymous requests
+VARY = "Authorization, Cookie"
+
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values a response depends on."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: ignore the W/ prefix on both sides
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def set_cache_headers(response: Response, etag: str, policy: str, private: bool = False) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE if private else policy
+    response.headers["Vary"] = VARY
+
+
+def not_modified(request: Request, etag: str, policy: str, private: bool = False) -> Response | None:
+    """Return a 304 response if the client already holds this ETag."""
+    if not _matches(request, etag):
+        return None
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, policy, private)
+    return response
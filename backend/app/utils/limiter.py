@@ -1,6 +1,11 @@
+from urllib.parse import urlparse
+
 from fastapi import Request
 from slowapi import Limiter
 
+from app.config import settings
+from app.utils.rate_limit_storage import BatchedSQLiteStorage
+
 
 def _get_real_ip(request: Request) -> str:
     """Extract the real client IP from X-Forwarded-For.
@@ -18,4 +23,26 @@ def _get_real_ip(request: Request) -> str:
     return "127.0.0.1"
 
 
-limiter = Limiter(key_func=_get_real_ip, default_limits=["60/minute"])
+def _storage_options(uri: str) -> dict:
+    """Extra options for the configured storage backend.
+
+    memory:// keeps per-worker counters (dev / single worker).
+    sqlite:///path shares counters between workers on one host with
+    batched flushes. redis:// (or any Redis-protocol server, e.g. a local
+    valkey/dragonfly stand-in) shares counters across hosts; it requires
+    the `redis` package.
+    """
+    if urlparse(uri).scheme in BatchedSQLiteStorage.STORAGE_SCHEME:
+        return {
+            "flush_interval": settings.rate_limit_flush_interval,
+            "max_keys": settings.rate_limit_max_keys,
+        }
+    return {}
+
+
+limiter = Limiter(
+    key_func=_get_real_ip,
+    default_limits=["60/minute"],
+    storage_uri=settings.rate_limit_storage_uri,
+    storage_options=_storage_options(settings.rate_limit_storage_uri),
+)
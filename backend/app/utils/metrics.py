@@ -0,0 +1,61 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Metrics:
+    """Minimal in-process metrics registry (counters, gauges, timings).
+
+    Values are per worker process. Exposed to admins via /api/admin/metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            t = self._timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            t["count"] += 1
+            t["total"] += seconds
+            if seconds > t["max"]:
+                t["max"] = seconds
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": {
+                    name: {**t, "avg": t["total"] / t["count"] if t["count"] else 0.0}
+                    for name, t in self._timings.items()
+                },
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
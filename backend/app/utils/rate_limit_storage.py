@@ -0,0 +1,199 @@
+import logging
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedSQLiteStorage(Storage):
+    """Rate-limit counters shared across workers through a local SQLite file.
+
+    Each worker keeps counters in memory. A daemon thread flushes the
+    accumulated deltas to SQLite every ``flush_interval`` seconds (sooner
+    when more than ``max_keys`` keys are held), reading back the merged
+    totals in the same transaction. ``incr`` only touches memory, so
+    requests never wait on the database, even while another process holds
+    the write lock; counts seen by a worker lag other workers by about one
+    flush interval.
+
+    URI format mirrors SQLAlchemy: ``sqlite:///./ratelimit.db``.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        flush_interval: float = 1.0,
+        max_keys: int = 100_000,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._path = uri[len("sqlite:///"):] or ":memory:"
+        self._flush_interval = float(flush_interval)
+        self._max_keys = int(max_keys)
+        # Guards _local; never held across a DB call
+        self._lock = threading.Lock()
+        # Serializes use of the connection
+        self._db_lock = threading.Lock()
+        # key -> [shared_count, pending_delta, expire_at]
+        self._local: dict[str, list[float]] = {}
+        self._wakeup = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._conn = sqlite3.connect(
+            self._path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expire_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limits_expire_at ON rate_limits (expire_at)"
+        )
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def _ensure_flusher(self) -> None:
+        # Started lazily so each forked worker runs its own thread
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="rate-limit-flush", daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Deltas were restored; retried on the next tick
+                metrics.incr("rate_limit.flush_errors")
+                logger.exception("Failed to flush rate-limit counters")
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[2] <= now:
+                entry = [0, 0, now + expiry]
+                self._local[key] = entry
+            entry[1] += amount
+            value = int(entry[0] + entry[1])
+            over_budget = len(self._local) > self._max_keys
+        self._ensure_flusher()
+        if over_budget:
+            self._wakeup.set()
+        metrics.incr("rate_limit.hits")
+        metrics.observe("rate_limit.incr_seconds", time.perf_counter() - start)
+        return value
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None or entry[2] <= time.time():
+                return 0
+            return int(entry[0] + entry[1])
+
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            entry = self._local.get(key)
+            return entry[2] if entry is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._db_lock:
+                self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        with self._lock:
+            self._local.clear()
+        with self._db_lock:
+            cursor = self._conn.execute("DELETE FROM rate_limits")
+            return cursor.rowcount
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+        with self._db_lock:
+            self._conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def flush(self) -> None:
+        """Merge pending deltas into SQLite and refresh shared totals.
+
+        Runs on the flusher thread; callable directly (tests, shutdown).
+        """
+        with self._db_lock:
+            self._flush(time.time())
+
+    def _flush(self, now: float) -> None:
+        """Caller must hold ``self._db_lock``."""
+        start = time.perf_counter()
+        with self._lock:
+            # Drop expired windows so memory stays bounded by active keys
+            for key in [k for k, e in self._local.items() if e[2] <= now]:
+                del self._local[key]
+            # Move pending deltas into the local shared count while in flight,
+            # so readers keep seeing them
+            pending = []
+            for key, entry in self._local.items():
+                if entry[1]:
+                    pending.append((key, entry, int(entry[1])))
+                    entry[0] += entry[1]
+                    entry[1] = 0
+
+        merged = []
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, entry, delta in pending:
+                    merged.append(self._conn.execute(
+                        "INSERT INTO rate_limits (key, count, expire_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET "
+                        "count = CASE WHEN rate_limits.expire_at <= ? "
+                        "THEN excluded.count ELSE rate_limits.count + excluded.count END, "
+                        "expire_at = CASE WHEN rate_limits.expire_at <= ? "
+                        "THEN excluded.expire_at ELSE rate_limits.expire_at END "
+                        "RETURNING count, expire_at",
+                        (key, delta, entry[2], now, now),
+                    ).fetchone())
+                self._conn.execute("DELETE FROM rate_limits WHERE expire_at <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            with self._lock:
+                for key, entry, delta in pending:
+                    entry[0] -= delta
+                    entry[1] += delta
+            raise
+
+        with self._lock:
+            for (key, entry, _), (count, expire_at) in zip(pending, merged):
+                # Hits that arrived during the write stay in entry[1]
+                entry[0], entry[2] = count, expire_at
+            # Still over budget after expiry pruning: forget the oldest windows
+            if len(self._local) > self._max_keys:
+                overflow = len(self._local) - self._max_keys
+                for key in sorted(self._local, key=lambda k: self._local[k][2])[:overflow]:
+                    del self._local[key]
+            local_keys = len(self._local)
+
+        metrics.incr("rate_limit.flushes")
+        metrics.observe("rate_limit.flush_seconds", time.perf_counter() - start)
+        metrics.set_gauge("rate_limit.local_keys", local_keys)
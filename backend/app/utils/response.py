@@ -1,6 +1,10 @@
+import orjson
+from fastapi import Response
+
 from app.models.video import Video
 from app.schemas.user import UserBriefResponse
 from app.schemas.video import CategoryResponse, TagResponse, VideoResponse
+from app.utils.cache import TTLCache
 
 
 def video_to_response(video: Video, user_voted: bool = False, is_trending: bool = False) -> VideoResponse:
@@ -34,3 +38,113 @@ def video_to_response(video: Video, user_voted: bool = False, is_trending: bool
         ) if video.submitter else None,
         created_at=video.created_at,
     )
+
+
+# --- Fast path for video lists ---------------------------------------------
+#
+# Each video is serialized once into a JSON object fragment without its
+# per-request fields (user_voted, is_trending). Fragments are cached by
+# everything they depend on, and list pages are assembled by concatenating
+# bytes, skipping Pydantic model construction and response validation.
+# Rows are loaded by app.services.video_reads.
+
+_fragment_cache = TTLCache(ttl_seconds=600, max_size=5000)
+
+_SUFFIXES = {
+    (voted, trending): b',"user_voted":%s,"is_trending":%s}' % (
+        b"true" if voted else b"false",
+        b"true" if trending else b"false",
+    )
+    for voted in (False, True)
+    for trending in (False, True)
+}
+
+
+def fragment_key(
+    video_id: str, updated_at, vote_count: int, submitter_updated_at, lite: bool = False
+) -> tuple:
+    """Lite fragments omit oembed_html and are cached separately."""
+    return (video_id, updated_at, vote_count, submitter_updated_at, lite)
+
+
+def cached_fragment(key: tuple) -> bytes | None:
+    return _fragment_cache.get(key)
+
+
+def build_fragment(key: tuple, data: dict) -> bytes:
+    """Serialize a VideoResponse-shaped dict (minus per-request fields) and cache it.
+
+    The fragment is missing its closing brace; see videos_json().
+    """
+    fragment = orjson.dumps(data)[:-1]
+    _fragment_cache.set(key, fragment)
+    return fragment
+
+
+def videos_json(
+    cards: list[tuple[str, bytes]], voted_ids: set[str] = frozenset(), is_trending: bool = False
+) -> bytes:
+    """Serialize (video_id, fragment) cards as a JSON array of VideoResponse objects."""
+    return b"[" + b",".join(
+        fragment + _SUFFIXES[(video_id in voted_ids, is_trending)] for video_id, fragment in cards
+    ) + b"]"
+
+
+def sections_response(payload: dict, sections: dict[str, tuple[list[tuple[str, bytes]], set[str]]]) -> Response:
+    """Like cards_response, for several card lists: sections maps field -> (cards, voted_ids)."""
+    parts = [b'"%s":' % field.encode() + videos_json(cards, voted_ids) for field, (cards, voted_ids) in sections.items()]
+    rest = orjson.dumps(payload)
+    body = b"{" + b",".join(parts) + ((b"," + rest[1:]) if payload else b"}")
+    return Response(content=body, media_type="application/json")
+
+
+def card_ndjson(card: tuple[str, bytes], user_voted: bool, extra: dict) -> bytes:
+    """One NDJSON line: the card's VideoResponse object merged with extra fields."""
+    video_id, fragment = card
+    return fragment + _SUFFIXES[(user_voted, False)][:-1] + b"," + orjson.dumps(extra)[1:] + b"\n"
+
+
+def video_card_response(card: tuple[str, bytes], user_voted: bool = False) -> Response:
+    video_id, fragment = card
+    return Response(content=fragment + _SUFFIXES[(user_voted, False)], media_type="application/json")
+
+
+def cards_response(
+    payload: dict,
+    field: str,
+    cards: list[tuple[str, bytes]],
+    voted_ids: set[str],
+    is_trending: bool = False,
+) -> Response:
+    """JSON response of payload with the serialized cards spliced in as payload[field]."""
+    rest = orjson.dumps(payload)
+    body = b'{"%s":' % field.encode() + videos_json(cards, voted_ids, is_trending)
+    body += (b"," + rest[1:]) if payload else b"}"
+    return Response(content=body, media_type="application/json")
+
+
+def video_list_response(
+    cards: list[tuple[str, bytes]],
+    voted_ids: set[str],
+    *,
+    total: int,
+    page: int,
+    per_page: int,
+    has_next: bool,
+    is_trending: bool = False,
+    trending_count: int = 0,
+) -> Response:
+    """Build a VideoListResponse-shaped JSON response from cached fragments."""
+    return cards_response(
+        {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "has_next": has_next,
+            "trending_count": trending_count,
+        },
+        "items",
+        cards,
+        voted_ids,
+        is_trending,
+    )
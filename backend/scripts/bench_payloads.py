@@ -0,0 +1,146 @@
+"""Payload size and time-to-first-byte of list pages, full vs lite cards.
+
+    python -m scripts.bench_payloads --videos 500 --requests 50 [--database-url ...]
+
+Seeds videos with realistic oEmbed markup (X blockquotes, YouTube and
+TikTok embeds) and times the first byte and full body of each list page,
+with the fragment cache warm.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("TESTING", "1")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.database import Base, get_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.category import Category  # noqa: E402
+from app.models.tag import Tag  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.video import Video  # noqa: E402
+from app.utils.limiter import limiter  # noqa: E402
+
+EMBEDS = {
+    "x": (
+        '<blockquote class="twitter-tweet" data-media-max-width="560"><p lang="ja" dir="ltr">'
+        + "猫が段ボールに入ろうとして失敗するまでの一部始終 " * 4
+        + '<a href="https://t.co/AbCdEfGhIj">pic.twitter.com/AbCdEfGhIj</a></p>&mdash; '
+        'ねこ動画まとめ (@neko_matome) <a href="https://twitter.com/neko_matome/status/{id}'
+        '?ref_src=twsrc%5Etfw">January 1, 2025</a></blockquote>'
+    ),
+    "youtube": (
+        '<iframe width="200" height="113" src="https://www.youtube.com/embed/{id}?feature=oembed" '
+        'frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; '
+        'gyroscope; picture-in-picture; web-share" referrerpolicy="strict-origin-when-cross-origin" '
+        'allowfullscreen title="おもしろ動画 {id}"></iframe>'
+    ),
+    "tiktok": (
+        '<blockquote class="tiktok-embed" cite="https://www.tiktok.com/@user/video/{id}" '
+        'data-video-id="{id}" style="max-width: 605px;min-width: 325px;"><section>'
+        '<a target="_blank" title="@user" href="https://www.tiktok.com/@user?refer=embed">@user</a> '
+        + "今日のハプニング集 #おもしろ #fyp " * 3
+        + '<a target="_blank" title="♬ original sound" href="https://www.tiktok.com/music/'
+        'original-sound-{id}?refer=embed">♬ original sound - user</a></section></blockquote>'
+    ),
+}
+
+ENDPOINTS = ["/api/videos?per_page=20", "/api/rankings?period=all&per_page=20", "/api/users/{user_id}"]
+
+
+async def seed(factory, videos: int) -> str:
+    user = User(id=str(uuid.uuid4()), email="bench@example.com", display_name="ベンチユーザー")
+    categories = [
+        Category(id=str(uuid.uuid4()), slug=f"cat{i}", name_ja=f"カテゴリ{i}", icon="🐱", sort_order=i)
+        for i in range(5)
+    ]
+    tags = [Tag(id=str(uuid.uuid4()), name=f"タグ{i}") for i in range(10)]
+    rows = []
+    for i in range(videos):
+        platform = ("x", "youtube", "tiktok")[i % 3]
+        rows.append(Video(
+            id=str(uuid.uuid4()),
+            url=f"https://example.com/{platform}/{i}",
+            external_id=str(10**15 + i),
+            platform=platform,
+            author_name="ねこ動画まとめ",
+            author_url="https://twitter.com/neko_matome",
+            oembed_html=EMBEDS[platform].replace("{id}", str(10**15 + i)),
+            title=f"動画タイトル {i}",
+            comment="#タグ1 #タグ2 かわいい",
+            submitted_by=user.id,
+            vote_count=i % 97,
+            categories=categories[i % 5:i % 5 + 2],
+            tags=tags[i % 10:i % 10 + 2],
+        ))
+    async with factory() as session:
+        session.add_all([user, *categories, *tags, *rows])
+        await session.commit()
+    return user.id
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> tuple[int, float, float]:
+    """Return (bytes, median TTFB ms, median total ms)."""
+    await client.get(path)  # warm the fragment cache
+    ttfbs, totals, size = [], [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        async with client.stream("GET", path) as res:
+            first = None
+            body = b""
+            async for chunk in res.aiter_raw():
+                if first is None:
+                    first = time.perf_counter()
+                body += chunk
+        end = time.perf_counter()
+        ttfbs.append(((first or end) - start) * 1000)
+        totals.append((end - start) * 1000)
+        size = len(body)
+    return size, statistics.median(ttfbs), statistics.median(totals)
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    user_id = await seed(factory, args.videos)
+
+    async def override_get_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    limiter.enabled = False
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for endpoint in ENDPOINTS:
+            path = endpoint.replace("{user_id}", user_id)
+            sep = "&" if "?" in path else "?"
+            full = await measure(client, path, args.requests)
+            lite = await measure(client, f"{path}{sep}lite=true", args.requests)
+            print(f"{endpoint}")
+            for label, (size, ttfb, total) in (("full", full), ("lite", lite)):
+                print(f"  {label}: {size:8d} bytes  ttfb {ttfb:6.2f} ms  total {total:6.2f} ms")
+            print(f"  lite saves {100 * (1 - lite[0] / full[0]):.0f}% of the payload")
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
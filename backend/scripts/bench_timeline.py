@@ -0,0 +1,183 @@
+"""Following-timeline fan-out cost and read latency.
+
+    python -m scripts.bench_timeline --followers 100000 --authors 200 --requests 50 [--database-url ...]
+
+Seeds one author with --followers followers and times fanning out a single
+video to all of them. Then seeds a reader following --authors authors
+(20 videos each) and compares the median latency of the first and a deep
+page of /api/feed/following served from the materialized timeline, served
+by fan-out on read, and of the naive follows-join query.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import timedelta
+
+os.environ.setdefault("TESTING", "1")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import delete, insert, select, update  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, get_session, utcnow  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.timeline_entry import TimelineEntry  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.user_follow import UserFollow  # noqa: E402
+from app.models.video import Video  # noqa: E402
+from app.services.auth import create_access_token  # noqa: E402
+from app.services.timeline import fan_out  # noqa: E402
+from app.utils.limiter import limiter  # noqa: E402
+
+INSERT_BATCH = 5000
+VIDEOS_PER_AUTHOR = 20
+
+
+def _uuid() -> str:
+    return str(uuid.uuid4())
+
+
+async def _bulk(session, model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), INSERT_BATCH):
+        await session.execute(insert(model), rows[i:i + INSERT_BATCH])
+    await session.commit()
+
+
+async def seed_followers(factory, followers: int) -> str:
+    author = _uuid()
+    now = utcnow()
+    users = [{"id": author, "email": "author@example.com", "display_name": "author",
+              "created_at": now, "updated_at": now}]
+    follows = []
+    for i in range(followers):
+        uid = _uuid()
+        users.append({"id": uid, "email": f"f{i}@example.com", "display_name": f"f{i}",
+                      "created_at": now, "updated_at": now})
+        follows.append({"id": _uuid(), "follower_id": uid, "following_id": author, "created_at": now})
+    async with factory() as session:
+        await _bulk(session, User, users)
+        await _bulk(session, UserFollow, follows)
+    return author
+
+
+async def seed_reader(factory, authors: int) -> str:
+    reader = _uuid()
+    now = utcnow()
+    users = [{"id": reader, "email": "reader@example.com", "display_name": "reader",
+              "created_at": now, "updated_at": now}]
+    follows, videos = [], []
+    for a in range(authors):
+        aid = _uuid()
+        users.append({"id": aid, "email": f"a{a}@example.com", "display_name": f"a{a}",
+                      "created_at": now, "updated_at": now})
+        follows.append({"id": _uuid(), "follower_id": reader, "following_id": aid, "created_at": now})
+        for v in range(VIDEOS_PER_AUTHOR):
+            created = now - timedelta(minutes=a + v * authors)
+            videos.append({"id": _uuid(), "url": f"https://x.com/a{a}/status/{v}", "external_id": f"{a}{v}",
+                           "submitted_by": aid, "created_at": created, "updated_at": created})
+    async with factory() as session:
+        await _bulk(session, User, users)
+        await _bulk(session, UserFollow, follows)
+        await _bulk(session, Video, videos)
+        for row in videos:
+            await fan_out(session, row["id"], row["submitted_by"], row["created_at"])
+    return reader
+
+
+async def unfan_reader(factory, reader: str) -> None:
+    """Serve the reader's feed by fan-out on read: drop the timeline, unmark videos."""
+    async with factory() as session:
+        await session.execute(delete(TimelineEntry).where(TimelineEntry.user_id == reader))
+        await session.execute(
+            update(Video)
+            .where(Video.submitted_by.in_(select(UserFollow.following_id).where(UserFollow.follower_id == reader)))
+            .values(fanned_out=False)
+        )
+        await session.commit()
+
+
+async def median_ms(fn, requests: int) -> float:
+    await fn()
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--followers", type=int, default=100_000)
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    settings.timeline_fanout_max_followers = args.followers
+    author = await seed_followers(factory, args.followers)
+    async with factory() as session:
+        video_id = _uuid()
+        await _bulk(session, Video, [{"id": video_id, "url": "https://x.com/author/status/1",
+                                      "external_id": "1", "submitted_by": author,
+                                      "created_at": utcnow(), "updated_at": utcnow()}])
+        start = time.perf_counter()
+        rows = await fan_out(session, video_id, author, utcnow())
+        elapsed = time.perf_counter() - start
+    print(f"fan-out of one video to {rows} followers: {elapsed * 1000:.0f} ms ({rows / elapsed:,.0f} rows/s)")
+
+    reader = await seed_reader(factory, args.authors)
+    headers = {"Authorization": f"Bearer {create_access_token(reader)}"}
+
+    async def override_get_session():
+        async with factory() as session:
+            yield session
+
+    async def naive_page():
+        async with factory() as session:
+            await session.execute(
+                select(Video.id)
+                .join(UserFollow, UserFollow.following_id == Video.submitted_by)
+                .where(UserFollow.follower_id == reader, Video.is_active == True)  # noqa: E712
+                .order_by(Video.created_at.desc(), Video.id.desc())
+                .limit(20)
+            )
+
+    app.dependency_overrides[get_session] = override_get_session
+    limiter.enabled = False
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        page = (await client.get("/api/feed/following?limit=20&lite=true", headers=headers)).json()
+        for _ in range(VIDEOS_PER_AUTHOR // 2):
+            page = (await client.get(
+                f"/api/feed/following?limit=20&lite=true&cursor={page['next_cursor']}", headers=headers
+            )).json()
+        deep_cursor = page["next_cursor"]
+        print(f"reader following {args.authors} authors ({args.authors * VIDEOS_PER_AUTHOR} videos):")
+        for label in ("fan-out on write", "fan-out on read"):
+            if label == "fan-out on read":
+                await unfan_reader(factory, reader)
+            for where, suffix in (("first page", ""), ("deep page", f"&cursor={deep_cursor}")):
+                path = f"/api/feed/following?limit=20&lite=true{suffix}"
+                ms = await median_ms(lambda: client.get(path, headers=headers), args.requests)
+                print(f"  {label:17s} {where}: {ms:7.2f} ms")
+        print(f"  naive join query  first page: {await median_ms(naive_page, args.requests):7.2f} ms")
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
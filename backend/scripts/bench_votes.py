@@ -0,0 +1,95 @@
+"""Load test: many concurrent voters on a single video.
+
+Compares the synchronous counter update with the write-behind buffer.
+
+    python -m scripts.bench_votes --voters 500 [--database-url postgresql+asyncpg://...]
+
+Defaults to a throwaway SQLite file. SQLite serializes all writers, so
+the buffer's row-lock win shows most clearly on PostgreSQL.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("TESTING", "1")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import Base, get_session  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.video import Video  # noqa: E402
+from app.services.auth import create_access_token  # noqa: E402
+from app.services.vote_buffer import vote_buffer  # noqa: E402
+from app.utils.limiter import limiter  # noqa: E402
+
+
+async def run(database_url: str, voters: int, concurrency: int, buffered: bool) -> float:
+    engine = create_async_engine(database_url, connect_args={"timeout": 60} if "sqlite" in database_url else {})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    users = [User(id=str(uuid.uuid4()), email=f"b{i}@example.com", display_name=f"B{i}") for i in range(voters)]
+    video = Video(id=str(uuid.uuid4()), url="https://x.com/u/status/1", external_id="1", submitted_by=users[0].id)
+    async with factory() as session:
+        session.add_all([*users, video])
+        await session.commit()
+
+    async def override_get_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    limiter.enabled = False
+    settings.vote_buffer_enabled = buffered
+    if buffered:
+        vote_buffer.start(settings.vote_buffer_flush_ms / 1000, factory)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def vote(user):
+            async with semaphore:
+                res = await client.post(
+                    f"/api/votes/{video.id}",
+                    headers={"Authorization": f"Bearer {create_access_token(user.id)}"},
+                )
+                res.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(vote(u) for u in users))
+        elapsed = time.perf_counter() - start
+
+    if buffered:
+        await vote_buffer.stop()
+        async with factory() as session:
+            persisted = (await session.get(Video, video.id)).vote_count
+        assert persisted == voters, f"buffer lost votes: {persisted} != {voters}"
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    return voters / elapsed
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--voters", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    for buffered in (False, True):
+        rate = await run(url, args.voters, args.concurrency, buffered)
+        print(f"{'buffered' if buffered else 'direct  '}: {rate:8.1f} votes/s ({args.voters} voters, 1 video)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
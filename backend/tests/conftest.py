@@ -49,8 +49,10 @@ async def client():
             yield session
 
     from app.main import app
+    from app.services.category_registry import category_registry
     from app.utils.limiter import limiter
     app.dependency_overrides[get_session] = override_get_session
+    category_registry.invalidate()
     limiter.enabled = False
 
     transport = ASGITransport(app=app)
@@ -23,3 +23,73 @@ async def test_admin_endpoint_requires_admin_role(client):
         "Authorization": f"Bearer {token}",
     })
     assert res.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_bulk_moderation_dry_run_and_apply(client):
+    import uuid
+    from datetime import timedelta
+
+    from sqlalchemy import select, update
+
+    from app.database import get_session, utcnow
+    from app.main import app
+    from app.models.category import Category
+    from app.models.report import Report
+    from app.models.tag import Tag, video_tags
+    from app.models.user import User
+    from app.models.video import Video, video_categories
+
+    signup = await client.post("/api/auth/signup", json={
+        "email": "moderator@example.com",
+        "password": "password123",
+        "display_name": "Moderator",
+    })
+    headers = {"Authorization": f"Bearer {extract_token(signup)}"}
+    spammer = str(uuid.uuid4())
+    ids = [str(uuid.uuid4()) for _ in range(4)]
+    tag_id, category_id = str(uuid.uuid4()), str(uuid.uuid4())
+    async for session in app.dependency_overrides[get_session]():
+        await session.execute(update(User).where(User.email == "moderator@example.com").values(is_admin=True))
+        session.add(User(id=spammer, email="spam@example.com", display_name="Spam", video_count=3))
+        # Three recent spam videos and one old one
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/s/status/{i}", external_id=f"s{i}", submitted_by=spammer,
+                  created_at=utcnow() - timedelta(days=3 if i == 3 else 0), is_active=i != 3)
+            for i, vid in enumerate(ids)
+        ])
+        session.add(Tag(id=tag_id, name="spam", video_count=3))
+        session.add(Category(id=category_id, slug="spam", name_ja="スパム", video_count=1))
+        await session.flush()
+        await session.execute(video_tags.insert(), [{"video_id": vid, "tag_id": tag_id} for vid in ids])
+        await session.execute(video_categories.insert(), [{"video_id": ids[0], "category_id": category_id}])
+        session.add(Report(video_id=ids[0], user_id=spammer, reason="spam"))
+        await session.commit()
+
+    body = {"submitted_by": [spammer], "since_hours": 24, "is_active": False, "resolve_reports": True}
+    res = await client.post("/api/admin/videos/bulk", json={**body, "dry_run": True}, headers=headers)
+    expected = {"videos": 3, "tags": 1, "categories": 1, "reports": 1}
+    assert res.json() == {"dry_run": True, **expected}
+
+    res = await client.post("/api/admin/videos/bulk", json=body, headers=headers)
+    assert res.json() == {"dry_run": False, **expected}
+    async for session in app.dependency_overrides[get_session]():
+        assert (await session.execute(select(Tag.video_count).where(Tag.id == tag_id))).scalar() == 0
+        assert (await session.execute(
+            select(Category.video_count).where(Category.id == category_id)
+        )).scalar() == 0
+        assert (await session.execute(select(User.video_count).where(User.id == spammer))).scalar() == 0
+        assert (await session.execute(select(Report.status))).scalar() == "resolved"
+        active = (await session.execute(select(Video.is_active).where(Video.id.in_(ids)))).scalars().all()
+        assert not any(active)
+
+    # Re-activating one video through the single endpoint restores its counters
+    res = await client.patch(f"/api/admin/videos/{ids[1]}", json={"is_active": True}, headers=headers)
+    assert res.json() == {"id": ids[1], "is_active": True}
+    res = await client.post("/api/admin/users/bulk", json={
+        "user_ids": [spammer], "is_active": False, "include_videos": True, "dry_run": True,
+    }, headers=headers)
+    assert res.json() == {"dry_run": True, "users": 1, "videos": 1, "tags": 1, "categories": 0, "reports": 0}
+
+    res = await client.post("/api/admin/videos/bulk", json={"is_active": False}, headers=headers)
+    assert res.status_code == 400
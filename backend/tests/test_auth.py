@@ -90,3 +90,46 @@ async def test_me_endpoint(client):
 async def test_me_no_auth(client):
     res = await client.get("/api/auth/me")
     assert res.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_profile_sections_page_and_export(client):
+    import json
+
+    res = await client.post("/api/auth/signup", json={
+        "email": "profile@example.com",
+        "password": "password123",
+        "display_name": "ProfileUser",
+    })
+    headers = {"Authorization": f"Bearer {extract_token(res)}"}
+    ids = []
+    for i in range(3):
+        res = await client.post(
+            "/api/videos",
+            json={"url": f"https://x.com/user/status/8880{i}", "category_slugs": []},
+            headers=headers,
+        )
+        ids.append(res.json()["id"])
+    # Vote oldest video first, so vote order differs from submission order
+    for video_id in ids:
+        await client.post(f"/api/votes/{video_id}", headers=headers)
+
+    profile = (await client.get("/api/auth/profile?limit=2", headers=headers)).json()
+    assert profile["user"]["email"] == "profile@example.com"
+    assert [v["id"] for v in profile["submitted_videos"]] == [ids[2], ids[1]]
+    assert all(v["user_voted"] for v in profile["voted_videos"])
+
+    rest = (await client.get(
+        f"/api/auth/profile/voted?limit=2&cursor={profile['voted_next_cursor']}", headers=headers
+    )).json()
+    assert [v["id"] for v in rest["items"]] == [ids[0]]
+    assert rest["next_cursor"] is None
+
+    res = await client.get("/api/auth/profile/export", headers=headers)
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert lines[0]["section"] == "user"
+    assert [(x["section"], x["id"]) for x in lines[1:]] == (
+        [("submitted", i) for i in reversed(ids)] + [("voted", i) for i in reversed(ids)]
+    )
+    assert all(x["user_voted"] and "voted_at" in x for x in lines[4:])
@@ -36,3 +36,13 @@ def test_max_size():
     cache.set("k2", "v2")
     cache.set("k3", "v3")  # should evict oldest
     assert cache.get("k3") == "v3"
+
+
+def test_reset_key_is_evicted_last():
+    cache = TTLCache(ttl_seconds=10, max_size=2)
+    cache.set("k1", "v1")
+    cache.set("k2", "v2")
+    cache.set("k1", "v1b")
+    cache.set("k3", "v3")  # k2 is now the oldest
+    assert cache.get("k1") == "v1b"
+    assert cache.get("k2") is None
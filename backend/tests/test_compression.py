@@ -0,0 +1,64 @@
+"""Tests for the compression middleware."""
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.utils.compression import CompressionMiddleware, negotiate
+from app.utils.metrics import metrics
+
+BODY = b'{"items":[' + b",".join(b'{"id":%d,"title":"video"}' % i for i in range(200)) + b"]}"
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/public")
+    async def public():
+        return Response(BODY, media_type="application/json", headers={
+            "ETag": 'W/"v1"', "Cache-Control": "public, s-maxage=60",
+        })
+
+    @app.get("/small")
+    async def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield b"data: 1\n\n"
+            yield b"data: 2\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert negotiate("br;q=0, gzip", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+
+
+@pytest.mark.asyncio
+async def test_compresses_and_caches_public_bodies():
+    metrics.clear()
+    transport = ASGITransport(app=_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(2):
+            res = await client.get("/public", headers={"Accept-Encoding": "gzip"})
+            assert res.headers["content-encoding"] == "gzip"
+            assert "Accept-Encoding" in res.headers["vary"]
+            assert res.content == BODY  # httpx decodes transparently
+        raw = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in raw.headers
+        stream = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in stream.headers
+        assert stream.text == "data: 1\n\ndata: 2\n\n"
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["compression.cache_hits"] == 1
+    assert counters["compression.bytes_in"] == len(BODY)
+    assert counters["compression.bytes_out"] == len(gzip.compress(BODY, compresslevel=6, mtime=0))
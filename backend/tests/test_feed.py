@@ -0,0 +1,143 @@
+import uuid
+
+import pytest
+
+from tests.conftest import extract_token
+
+
+@pytest.mark.asyncio
+async def test_for_you_blends_covote_candidates_and_applies_filters(client):
+    from app.database import get_session
+    from app.main import app
+    from app.models.user import User
+    from app.models.user_mute import UserMute
+    from app.models.video import Video
+    from app.models.video_neighbor import KIND_COVOTE, VideoNeighbor
+    from app.models.vote import Vote
+
+    res = await client.post("/api/auth/signup", json={
+        "email": "feed@example.com",
+        "password": "password123",
+        "display_name": "FeedUser",
+    })
+    headers = {"Authorization": f"Bearer {extract_token(res)}"}
+    me = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+
+    # Cold start: no votes yet, popular videos are offered
+    assert (await client.get("/api/feed/for-you", headers=headers)).json()["items"] == []
+
+    ids = {name: str(uuid.uuid4()) for name in ["seed", "b", "c", "muted", "voted"]}
+    async for session in app.dependency_overrides[get_session]():
+        muted_user = User(id=str(uuid.uuid4()), email="m@example.com", display_name="M")
+        session.add(muted_user)
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/u/status/{i}", external_id=str(i),
+                  submitted_by=muted_user.id if name == "muted" else None, vote_count=i)
+            for i, (name, vid) in enumerate(ids.items())
+        ])
+        await session.flush()
+        session.add(UserMute(id=str(uuid.uuid4()), user_id=me, muted_user_id=muted_user.id))
+        session.add_all([
+            Vote(id=str(uuid.uuid4()), user_id=me, video_id=ids["seed"]),
+            Vote(id=str(uuid.uuid4()), user_id=me, video_id=ids["voted"]),
+        ])
+        session.add_all([
+            VideoNeighbor(kind=KIND_COVOTE, video_id=ids["seed"], rank=rank,
+                          neighbor_id=ids[name], score=score)
+            for rank, (name, score) in enumerate([("muted", 0.9), ("voted", 0.8), ("c", 0.6), ("b", 0.5)])
+        ])
+        session.add(VideoNeighbor(kind=KIND_COVOTE, video_id=ids["voted"], rank=0,
+                                  neighbor_id=ids["b"], score=0.3))
+        await session.commit()
+
+    data = (await client.get("/api/feed/for-you", headers=headers)).json()
+    # b: 0.5 + 0.95 * 0.3 beats c: 0.6; muted and voted videos are excluded
+    assert [item["id"] for item in data["items"]] == [ids["b"], ids["c"]]
+    assert data["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_for_you_requires_login(client):
+    res = await client.get("/api/feed/for-you")
+    assert res.status_code == 401
+
+
+async def _signup(client, name: str) -> tuple[dict, str]:
+    res = await client.post("/api/auth/signup", json={
+        "email": f"{name}@example.com",
+        "password": "password123",
+        "display_name": name,
+    })
+    headers = {"Authorization": f"Bearer {extract_token(res)}"}
+    me = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+    return headers, me
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_followers", [10_000, 0])
+async def test_following_feed_pages_with_cursor(client, monkeypatch, max_followers):
+    """Fan-out on write, and fan-out on read for authors over the limit."""
+    from app.config import settings
+    from app.database import get_session
+    from app.main import app
+    from app.services.timeline import timeline_fanout
+
+    monkeypatch.setattr(settings, "timeline_fanout_max_followers", max_followers)
+    reader, _ = await _signup(client, "reader")
+    author, author_id = await _signup(client, "author")
+    await client.post(f"/api/follows/{author_id}", headers=reader)
+
+    posted = []
+    for i in range(3):
+        res = await client.post(
+            "/api/videos",
+            json={"url": f"https://x.com/user/status/{777000 + i}", "category_slugs": []},
+            headers=author,
+        )
+        posted.append(res.json()["id"])
+    async for session in app.dependency_overrides[get_session]():
+        await timeline_fanout.drain(session)
+
+    first = (await client.get("/api/feed/following?limit=2", headers=reader)).json()
+    assert [v["id"] for v in first["items"]] == posted[:0:-1]
+    second = (await client.get(
+        f"/api/feed/following?limit=2&cursor={first['next_cursor']}", headers=reader
+    )).json()
+    assert [v["id"] for v in second["items"]] == posted[:1]
+    assert second["next_cursor"] is None
+
+    await client.delete(f"/api/follows/{author_id}", headers=reader)
+    assert (await client.get("/api/feed/following", headers=reader)).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_following_feed_rejects_bad_cursor(client):
+    reader, _ = await _signup(client, "reader")
+    res = await client.get("/api/feed/following?cursor=garbage", headers=reader)
+    assert res.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_following_feed_keeps_videos_after_author_drops_below_threshold(client, monkeypatch):
+    """A video skipped by fan-out stays in feeds once its author is eligible again."""
+    from app.config import settings
+    from app.database import get_session
+    from app.main import app
+    from app.services.timeline import timeline_fanout
+
+    monkeypatch.setattr(settings, "timeline_fanout_max_followers", 0)
+    reader, _ = await _signup(client, "reader")
+    author, author_id = await _signup(client, "author")
+    await client.post(f"/api/follows/{author_id}", headers=reader)
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/778000", "category_slugs": []},
+        headers=author,
+    )
+    video_id = res.json()["id"]
+    async for session in app.dependency_overrides[get_session]():
+        await timeline_fanout.drain(session)
+
+    monkeypatch.setattr(settings, "timeline_fanout_max_followers", 10_000)
+    items = (await client.get("/api/feed/following", headers=reader)).json()["items"]
+    assert [v["id"] for v in items] == [video_id]
@@ -0,0 +1,52 @@
+"""Tests for precomputed follow suggestions."""
+from contextlib import asynccontextmanager
+
+import pytest
+
+from tests.conftest import extract_token
+
+
+async def _signup(client, name: str) -> tuple[dict, str]:
+    res = await client.post("/api/auth/signup", json={
+        "email": f"{name}@example.com",
+        "password": "password123",
+        "display_name": name,
+    })
+    return {"Authorization": f"Bearer {extract_token(res)}"}, res.json()["user"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_suggestions_from_two_hop_follows_and_votes(client):
+    from app.database import get_session
+    from app.main import app
+    from app.tasks.follow_suggestions import refresh_follow_suggestions
+
+    users = {name: await _signup(client, name) for name in ["me", "friend", "fof", "muted", "uploader"]}
+    me = users["me"][0]
+
+    async def follow(who: str, whom: str):
+        await client.post(f"/api/follows/{users[whom][1]}", headers=users[who][0])
+
+    await follow("me", "friend")
+    await follow("friend", "fof")
+    await follow("friend", "muted")
+    await client.post(f"/api/auth/me/mutes/{users['muted'][1]}", headers=me)
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/5550001", "category_slugs": []},
+        headers=users["uploader"][0],
+    )
+    await client.post(f"/api/votes/{res.json()['id']}", headers=me)
+
+    stats = await refresh_follow_suggestions(asynccontextmanager(app.dependency_overrides[get_session]))
+    assert stats["users"] == 5
+    assert stats["matrix_bytes"] > 0
+
+    suggested = (await client.get("/api/follows/suggestions", headers=me)).json()["users"]
+    # Followed and muted users are never suggested
+    assert [u["id"] for u in suggested] == [users["fof"][1], users["uploader"][1]]
+
+    # Following a suggestion hides it before the next job run
+    await follow("me", "fof")
+    suggested = (await client.get("/api/follows/suggestions", headers=me)).json()["users"]
+    assert [u["id"] for u in suggested] == [users["uploader"][1]]
@@ -0,0 +1,56 @@
+"""Tests for ETag / Cache-Control handling on public GET endpoints."""
+import pytest
+
+from tests.conftest import extract_token
+
+
+async def _signup(client, email):
+    res = await client.post("/api/auth/signup", json={
+        "email": email,
+        "password": "password123",
+        "display_name": "CacheUser",
+    })
+    return extract_token(res)
+
+
+@pytest.mark.asyncio
+async def test_video_detail_revalidates_with_etag(client):
+    token = await _signup(client, "cache1@example.com")
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/100200300", "category_slugs": []},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    video_id = res.json()["id"]
+
+    res = await client.get(f"/api/videos/{video_id}")
+    etag = res.headers["etag"]
+    assert "s-maxage" in res.headers["cache-control"]
+
+    res = await client.get(f"/api/videos/{video_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.content == b""
+
+    # A vote changes vote_count and therefore the ETag
+    await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {token}"})
+    res = await client.get(f"/api/videos/{video_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_signed_in_responses_are_private(client):
+    token = await _signup(client, "cache2@example.com")
+    res = await client.get("/api/rankings?period=all", headers={"Authorization": f"Bearer {token}"})
+    assert res.headers["cache-control"] == "private, no-cache"
+    res = await client.get("/api/rankings?period=all")
+    assert res.headers["cache-control"].startswith("public")
+
+
+@pytest.mark.asyncio
+async def test_categories_and_sitemap_return_304(client):
+    for path in ("/api/categories", "/api/videos/sitemap"):
+        res = await client.get(path)
+        assert res.status_code == 200
+        res = await client.get(path, headers={"If-None-Match": res.headers["etag"]})
+        assert res.status_code == 304
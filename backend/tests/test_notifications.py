@@ -0,0 +1,172 @@
+"""Tests for notification endpoints."""
+import pytest
+
+from tests.conftest import extract_token
+
+
+async def _signup(client, email, name="User"):
+    res = await client.post("/api/auth/signup", json={
+        "email": email,
+        "password": "password123",
+        "display_name": name,
+    })
+    return extract_token(res)
+
+
+async def _submit(client, token, status_id="555000111"):
+    res = await client.post(
+        "/api/videos",
+        json={"url": f"https://x.com/user/status/{status_id}", "category_slugs": []},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return res.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_votes_on_same_video_are_coalesced(client):
+    owner = await _signup(client, "owner@example.com", "Owner")
+    video_id = await _submit(client, owner)
+
+    for i in range(3):
+        voter = await _signup(client, f"fan{i}@example.com", f"Fan{i}")
+        res = await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {voter}"})
+        assert res.status_code == 200
+
+    res = await client.get("/api/notifications", headers={"Authorization": f"Bearer {owner}"})
+    data = res.json()
+    assert data["total"] == 1
+    item = data["items"][0]
+    assert item["actor_count"] == 3
+    assert item["actor"]["display_name"] == "Fan2"
+    assert [a["display_name"] for a in item["recent_actors"]] == ["Fan2", "Fan1", "Fan0"]
+
+    unread = await client.get("/api/notifications/unread-count", headers={"Authorization": f"Bearer {owner}"})
+    assert unread.json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_group_is_not_reopened(client):
+    owner = await _signup(client, "owner2@example.com", "Owner")
+    video_id = await _submit(client, owner, "555000222")
+    first = await _signup(client, "first@example.com", "First")
+    second = await _signup(client, "second@example.com", "Second")
+
+    await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {first}"})
+    await client.post("/api/notifications/mark-read", json={}, headers={"Authorization": f"Bearer {owner}"})
+    await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {second}"})
+
+    res = await client.get("/api/notifications", headers={"Authorization": f"Bearer {owner}"})
+    items = res.json()["items"]
+    assert len(items) == 2
+    assert items[0]["is_read"] is False
+    assert items[0]["actor_count"] == 1
+    assert items[1]["is_read"] is True
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_tracks_inserts_and_reads(client):
+    owner = await _signup(client, "owner3@example.com", "Owner")
+    video_id = await _submit(client, owner, "555000333")
+    fan = await _signup(client, "fan3@example.com", "Fan")
+    headers = {"Authorization": f"Bearer {owner}"}
+    owner_id = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+
+    await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {fan}"})
+    await client.post(f"/api/follows/{owner_id}", headers={"Authorization": f"Bearer {fan}"})
+    assert (await client.get("/api/notifications/unread-count", headers=headers)).json()["count"] == 2
+
+    items = (await client.get("/api/notifications", headers=headers)).json()["items"]
+    await client.post("/api/notifications/mark-read", json={"notification_ids": [items[0]["id"]]}, headers=headers)
+    # Marking an already-read notification again must not decrement twice
+    await client.post("/api/notifications/mark-read", json={"notification_ids": [items[0]["id"]]}, headers=headers)
+    assert (await client.get("/api/notifications/unread-count", headers=headers)).json()["count"] == 1
+
+    await client.post("/api/notifications/mark-read", json={}, headers=headers)
+    assert (await client.get("/api/notifications/unread-count", headers=headers)).json()["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hub_publishes_after_commit(client):
+    from app.services.notification_hub import hub
+
+    owner = await _signup(client, "owner4@example.com", "Owner")
+    video_id = await _submit(client, owner, "555000444")
+    fan = await _signup(client, "fan4@example.com", "Fan")
+    owner_id = (await client.get("/api/auth/me", headers={"Authorization": f"Bearer {owner}"})).json()["id"]
+
+    queue = hub.subscribe(owner_id)
+    try:
+        await client.post(f"/api/votes/{video_id}", headers={"Authorization": f"Bearer {fan}"})
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+    finally:
+        hub.unsubscribe(owner_id, queue)
+
+    assert {"type": "unread_count", "count": 1} in events
+    assert any(e["type"] == "notification" and e["video_id"] == video_id for e in events)
+
+
+@pytest.mark.asyncio
+async def test_prune_notifications_by_age_and_cap(monkeypatch):
+    import uuid
+    from datetime import timedelta
+
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.config import settings
+    from app.database import Base, utcnow
+    from app.models.notification import Notification
+    from app.models.user import User
+    from app.tasks.notification_retention import prune_notifications
+
+    monkeypatch.setattr(settings, "notification_retention_days", 30)
+    monkeypatch.setattr(settings, "notification_max_per_user", 5)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    now = utcnow()
+    async with factory() as session:
+        owner = User(id=str(uuid.uuid4()), email="o@example.com", display_name="O", unread_notification_count=10)
+        actor = User(id=str(uuid.uuid4()), email="a@example.com", display_name="A")
+        session.add_all([owner, actor])
+        for i in range(10):
+            # 2 expired (unread), 8 recent (unread)
+            age = timedelta(days=60) if i < 2 else timedelta(minutes=i)
+            session.add(Notification(
+                id=str(uuid.uuid4()), user_id=owner.id, type="follow",
+                actor_id=actor.id, created_at=now - age,
+            ))
+        await session.commit()
+
+    await prune_notifications(factory)
+
+    async with factory() as session:
+        remaining = (await session.execute(select(func.count()).select_from(Notification))).scalar()
+        counter = (await session.execute(select(User.unread_notification_count).where(User.id == owner.id))).scalar()
+    assert remaining == 5
+    assert counter == 5
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_revote_by_same_user_counts_once(client):
+    owner = await _signup(client, "owner4@example.com", "Owner")
+    video_id = await _submit(client, owner, "555000444")
+    fan = {"Authorization": f"Bearer {await _signup(client, 'fan4@example.com', 'Fan')}"}
+    headers = {"Authorization": f"Bearer {owner}"}
+
+    for _ in range(3):
+        assert (await client.post(f"/api/votes/{video_id}", headers=fan)).status_code == 200
+        assert (await client.delete(f"/api/votes/{video_id}", headers=fan)).status_code == 200
+    await client.post(f"/api/votes/{video_id}", headers=fan)
+
+    items = (await client.get("/api/notifications", headers=headers)).json()["items"]
+    assert len(items) == 1
+    assert items[0]["actor_count"] == 1
+    assert [a["display_name"] for a in items[0]["recent_actors"]] == ["Fan"]
+    assert (await client.get("/api/notifications/unread-count", headers=headers)).json()["count"] == 1
@@ -55,3 +55,212 @@ async def test_create_duplicate_playlist_name(client):
 async def test_playlists_require_auth(client):
     res = await client.get("/api/playlists")
     assert res.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_move_and_remove(client):
+    import uuid
+
+    from app.database import get_session
+    from app.main import app
+    from app.models.video import Video
+    from app.services import playlist_positions
+
+    token = await _signup(client, "plbulk@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    pl = (await client.post("/api/playlists", json={"name": "並び替え"}, headers=headers)).json()["id"]
+
+    ids = [str(uuid.uuid4()) for _ in range(4)]
+    async for session in app.dependency_overrides[get_session]():
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/u/status/{i}", external_id=str(i), is_active=i < 3)
+            for i, vid in enumerate(ids)
+        ])
+        await session.commit()
+
+    async def order():
+        data = (await client.get(f"/api/playlists/{pl}", headers=headers)).json()
+        return [ids.index(v["id"]) for v in data["videos"]]
+
+    res = await client.post(f"/api/playlists/{pl}/videos/bulk", json={"video_ids": ids}, headers=headers)
+    # The inactive video is skipped
+    assert res.json() == {"added": 3, "skipped": 1}
+    res = await client.post(f"/api/playlists/{pl}/videos", json={"video_id": ids[0]}, headers=headers)
+    assert res.json() == {"status": "already_added"}
+    assert await order() == [0, 1, 2]
+
+    res = await client.post(f"/api/playlists/{pl}/videos/{ids[2]}/move", json={}, headers=headers)
+    assert res.status_code == 200
+    assert await order() == [2, 0, 1]
+    await client.post(f"/api/playlists/{pl}/videos/{ids[1]}/move", json={"after_video_id": ids[2]}, headers=headers)
+    assert await order() == [2, 1, 0]
+
+    # Squeeze one slot until precision runs out; the move rebalances inline
+    for _ in range(60):
+        for vid in (ids[0], ids[1]):
+            res = await client.post(
+                f"/api/playlists/{pl}/videos/{vid}/move", json={"after_video_id": ids[2]}, headers=headers
+            )
+            assert res.status_code == 200
+    assert await order() == [2, 1, 0]
+    assert pl in playlist_positions.pending_rebalances()
+
+    other = extract_token(await client.post("/api/auth/signup", json={
+        "email": "plother@example.com", "password": "password123", "display_name": "Other",
+    }))
+    res = await client.post(f"/api/playlists/{pl}/videos/bulk-remove", json={"video_ids": ids},
+                            headers={"Authorization": f"Bearer {other}"})
+    assert res.status_code == 404
+
+    res = await client.post(f"/api/playlists/{pl}/videos/bulk-remove", json={"video_ids": ids[:2]}, headers=headers)
+    assert res.json() == {"removed": 2}
+    assert await order() == [2]
+
+
+@pytest.mark.asyncio
+async def test_playlist_detail_pages_and_header(client):
+    import uuid
+
+    from app.database import get_session
+    from app.main import app
+    from app.models.video import Video
+
+    token = await _signup(client, "plpage@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    pl = (await client.post("/api/playlists", json={"name": "ページ"}, headers=headers)).json()["id"]
+
+    ids = [str(uuid.uuid4()) for _ in range(5)]
+    async for session in app.dependency_overrides[get_session]():
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/p/status/{i}", external_id=f"p{i}", is_active=i != 1)
+            for i, vid in enumerate(ids)
+        ])
+        await session.commit()
+    await client.post(f"/api/playlists/{pl}/videos/bulk", json={"video_ids": ids}, headers=headers)
+
+    data = (await client.get(f"/api/playlists/{pl}?limit=2&lite=true")).json()
+    assert data["video_count"] == 4
+    assert [v["id"] for v in data["videos"]] == [ids[0], ids[2]]
+    assert "oembed_html" not in data["videos"][0]
+    rest = (await client.get(f"/api/playlists/{pl}/videos?limit=2&cursor={data['next_cursor']}")).json()
+    assert [v["id"] for v in rest["items"]] == [ids[3], ids[4]]
+    assert rest["next_cursor"] is None
+
+    res = await client.get(f"/api/playlists/{pl}/header")
+    assert res.json()["owner"]["display_name"] == "PlaylistUser"
+    assert res.headers["Cache-Control"].startswith("public")
+    res = await client.get(f"/api/playlists/{pl}/header", headers={"If-None-Match": res.headers["ETag"]})
+    assert res.status_code == 304
+
+    await client.patch(f"/api/playlists/{pl}", json={"is_public": False}, headers=headers)
+    assert (await client.get(f"/api/playlists/{pl}/videos")).status_code == 404
+    res = await client.get(f"/api/playlists/{pl}/header", headers=headers)
+    assert res.headers["Cache-Control"] == "private, no-cache"
+
+
+@pytest.mark.asyncio
+async def test_batch_membership_is_cached_and_invalidated(client):
+    import uuid
+
+    from app.database import get_session
+    from app.main import app
+    from app.models.video import Video
+    from app.utils.metrics import metrics
+
+    token = await _signup(client, "plmember@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    pl = (await client.post("/api/playlists", json={"name": "保存"}, headers=headers)).json()["id"]
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    async for session in app.dependency_overrides[get_session]():
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/m/status/{i}", external_id=f"m{i}")
+            for i, vid in enumerate(ids)
+        ])
+        await session.commit()
+
+    def membership():
+        query = "&".join(f"video_ids={vid}" for vid in ids)
+        return client.get(f"/api/playlists/membership?{query}", headers=headers)
+
+    data = (await membership()).json()
+    assert [p["playlist_id"] for p in data["playlists"]] == [pl]
+    assert data["videos"] == {vid: [] for vid in ids}
+
+    hits = metrics.snapshot()["counters"].get("playlist_membership.hit", 0)
+    await membership()
+    assert metrics.snapshot()["counters"]["playlist_membership.hit"] == hits + 1
+
+    await client.post(f"/api/playlists/{pl}/videos/bulk", json={"video_ids": ids[:2]}, headers=headers)
+    await client.delete(f"/api/playlists/{pl}/videos/{ids[0]}", headers=headers)
+    data = (await membership()).json()
+    assert data["videos"] == {ids[0]: [], ids[1]: [pl], ids[2]: []}
+    single = (await client.get(f"/api/playlists/video/{ids[1]}", headers=headers)).json()
+    assert single["playlists"] == [{"playlist_id": pl, "playlist_name": "保存", "contains": True}]
+
+    too_many = "&".join(f"video_ids={i}" for i in range(101))
+    assert (await client.get(f"/api/playlists/membership?{too_many}", headers=headers)).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_membership_load_racing_invalidate_is_not_cached(client):
+    from app.database import get_session
+    from app.main import app
+    from app.services import playlist_membership
+
+    token = await _signup(client, "plrace@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = (await client.get("/api/auth/me", headers=headers)).json()["id"]
+
+    class RacingSession:
+        """Runs a playlist write's invalidate() while the load's query is in flight."""
+
+        def __init__(self, session):
+            self._session = session
+
+        async def execute(self, stmt):
+            result = await self._session.execute(stmt)
+            playlist_membership.invalidate(user_id)
+            return result
+
+    async for session in app.dependency_overrides[get_session]():
+        await playlist_membership.load_membership(RacingSession(session), user_id)
+        assert playlist_membership._cache.get(user_id) is None
+
+        await playlist_membership.load_membership(session, user_id)
+        assert playlist_membership._cache.get(user_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_cap_counts_only_active_videos(client, monkeypatch):
+    import uuid
+
+    from app.database import get_session
+    from app.main import app
+    from app.models.video import Video
+    from app.routers import playlists
+
+    monkeypatch.setattr(playlists, "MAX_VIDEOS_PER_PLAYLIST", 3)
+    token = await _signup(client, "plcap@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    pl = (await client.post("/api/playlists", json={"name": "上限"}, headers=headers)).json()["id"]
+
+    ids = [str(uuid.uuid4()) for _ in range(5)]
+    async for session in app.dependency_overrides[get_session]():
+        session.add_all([
+            Video(id=vid, url=f"https://x.com/cap/status/{i}", external_id=f"cap{i}", is_active=i != 3)
+            for i, vid in enumerate(ids)
+        ])
+        await session.commit()
+
+    # Two active, one inactive and one unknown id fit a cap of three
+    res = await client.post(
+        f"/api/playlists/{pl}/videos/bulk",
+        json={"video_ids": [ids[0], ids[1], ids[3], str(uuid.uuid4())]},
+        headers=headers,
+    )
+    assert res.json() == {"added": 2, "skipped": 2}
+
+    res = await client.post(f"/api/playlists/{pl}/videos/bulk", json={"video_ids": [ids[2], ids[3]]}, headers=headers)
+    assert res.json() == {"added": 1, "skipped": 1}
+    res = await client.post(f"/api/playlists/{pl}/videos/bulk", json={"video_ids": [ids[4], ids[3]]}, headers=headers)
+    assert res.status_code == 400
@@ -0,0 +1,110 @@
+"""Tests for the counter reconciliation job."""
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, utcnow
+from app.models.category import Category
+from app.models.tag import Tag, video_tags
+from app.models.user import User
+from app.models.user_follow import UserFollow
+from app.models.video import Video, video_categories
+from app.models.vote import Vote
+from app.tasks import reconcile_counters as reconcile_module
+from app.tasks.reconcile_counters import reconcile_counters
+
+
+@pytest.mark.asyncio
+async def test_reconcile_fixes_only_drifted_rows(monkeypatch):
+    monkeypatch.setattr(reconcile_module, "CHUNK_SIZE", 2)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    old = utcnow() - timedelta(hours=1)
+    async with factory() as session:
+        voters = [User(id=str(uuid.uuid4()), email=f"v{i}@example.com", display_name=f"V{i}") for i in range(3)]
+        voters[0].followers_count = 5
+        session.add_all(voters)
+        videos = [
+            Video(id=str(uuid.uuid4()), url=f"https://x.com/u/status/{i}", external_id=str(i),
+                  vote_count=count, is_active=active)
+            for i, (count, active) in enumerate([(3, True), (7, True), (0, True), (5, False), (-2, True)])
+        ]
+        session.add_all(videos)
+        await session.flush()
+        # Actual votes: 3, 1, 0, 0, 2
+        for video, n in zip(videos, [3, 1, 0, 0, 2]):
+            for voter in voters[:n]:
+                session.add(Vote(id=str(uuid.uuid4()), user_id=voter.id, video_id=video.id, created_at=old))
+        tag = Tag(id=str(uuid.uuid4()), name="猫", video_count=4)
+        category = Category(id=str(uuid.uuid4()), slug="other", name_ja="その他", video_count=0)
+        session.add_all([tag, category])
+        await session.flush()
+        await session.execute(video_categories.insert(), [
+            {"video_id": videos[0].id, "category_id": category.id},
+            {"video_id": videos[3].id, "category_id": category.id},
+        ])
+        # Two active videos and one inactive video carry the tag
+        await session.execute(video_tags.insert(), [
+            {"video_id": videos[0].id, "tag_id": tag.id},
+            {"video_id": videos[1].id, "tag_id": tag.id},
+            {"video_id": videos[3].id, "tag_id": tag.id},
+        ])
+        # Follow row without counter bumps: drift of one on each side
+        session.add(UserFollow(id=str(uuid.uuid4()), follower_id=voters[1].id, following_id=voters[2].id))
+        await session.commit()
+
+    stats = await reconcile_counters(factory)
+
+    assert stats["video_vote_count"] == {"checked": 5, "fixed": 3, "drift": 6 + 5 + 4}
+    assert stats["tag_video_count"] == {"checked": 1, "fixed": 1, "drift": 2}
+    assert stats["category_video_count"] == {"checked": 1, "fixed": 1, "drift": 1}
+    assert stats["user_counts"] == {"checked": 3, "fixed": 3, "drift": 5 + 1 + 1}
+    async with factory() as session:
+        counts = {
+            vid: count for vid, count in (await session.execute(select(Video.id, Video.vote_count))).all()
+        }
+        tag_count = (await session.execute(select(Tag.video_count))).scalar()
+    assert [counts[v.id] for v in videos] == [3, 1, 0, 0, 2]
+    assert tag_count == 2
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_videos_with_buffered_unvotes():
+    from app.models.vote_removal import VoteRemoval
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        # Both votes were removed; each -1 is still buffered in some worker
+        recent, stale = (
+            Video(id=str(uuid.uuid4()), url=f"https://x.com/u/status/{i}", external_id=str(i), vote_count=1)
+            for i in range(2)
+        )
+        session.add_all([recent, stale])
+        await session.flush()
+        session.add_all([
+            VoteRemoval(id=str(uuid.uuid4()), video_id=recent.id),
+            VoteRemoval(id=str(uuid.uuid4()), video_id=stale.id, created_at=utcnow() - timedelta(hours=1)),
+        ])
+        await session.commit()
+
+    stats = await reconcile_counters(factory)
+
+    assert stats["video_vote_count"] == {"checked": 2, "fixed": 1, "drift": 1}
+    async with factory() as session:
+        counts = dict((await session.execute(select(Video.id, Video.vote_count))).all())
+        removals = (await session.execute(select(VoteRemoval.video_id))).scalars().all()
+    assert counts == {recent.id: 1, stale.id: 0}
+    assert removals == [recent.id]
+    await engine.dispose()
@@ -0,0 +1,109 @@
+"""Tests for the precomputed related-video index."""
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.category import Category
+from app.models.tag import Tag, video_tags
+from app.models.user import User
+from app.models.video import Video, video_categories
+from app.models.video_neighbor import KIND_RELATED, VideoNeighbor
+from app.models.vote import Vote
+from app.services.recommendations import SimilarityInputs, SimilarityModel
+from app.tasks.related_index import refresh_related_index
+
+
+def test_model_ranks_shared_tags_and_covotes_above_category_only():
+    inputs = SimilarityInputs(video_ids=["a", "b", "c", "d"], vote_counts=[0, 0, 0, 50])
+    for video, tag in [(0, "cat"), (1, "cat"), (0, "kitten"), (1, "kitten"), (2, "dog")]:
+        inputs.tag_pairs.append((video, inputs.tags.index(tag)))
+    for video in range(4):
+        inputs.category_pairs.append((video, inputs.categories.index("animals")))
+    for video, user in [(0, "u1"), (2, "u1")]:
+        inputs.vote_pairs.append((video, inputs.users.index(user)))
+
+    model = SimilarityModel(inputs)
+    (row, cols, scores), = model.neighbors([0], k=3)
+
+    assert row == 0
+    # b shares both tags, c a co-voter; d is only a same-category filler
+    assert [inputs.video_ids[c] for c in cols] == ["b", "c", "d"]
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_refresh_builds_and_incrementally_updates_index(monkeypatch):
+    from app.tasks import related_index
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    def make_video(i: int) -> Video:
+        return Video(id=str(uuid.uuid4()), url=f"https://x.com/u/status/{i}", external_id=str(i))
+
+    async with factory() as session:
+        videos = [make_video(i) for i in range(3)]
+        tag = Tag(id=str(uuid.uuid4()), name="猫")
+        category = Category(id=str(uuid.uuid4()), slug="animals", name_ja="動物")
+        session.add_all([*videos, tag, category])
+        await session.flush()
+        await session.execute(video_tags.insert(), [
+            {"video_id": videos[0].id, "tag_id": tag.id},
+            {"video_id": videos[1].id, "tag_id": tag.id},
+        ])
+        await session.execute(video_categories.insert(), [
+            {"video_id": v.id, "category_id": category.id} for v in videos
+        ])
+        await session.commit()
+
+    stats = await refresh_related_index(factory)
+    assert stats["mode"] == "full"
+
+    async def neighbors_of(video_id: str) -> list[str]:
+        async with factory() as session:
+            return list((await session.execute(
+                select(VideoNeighbor.neighbor_id)
+                .where(VideoNeighbor.kind == KIND_RELATED, VideoNeighbor.video_id == video_id)
+                .order_by(VideoNeighbor.rank)
+            )).scalars().all())
+
+    assert await neighbors_of(videos[0].id) == [videos[1].id, videos[2].id]
+
+    # A new video co-voted with videos[2] is picked up incrementally,
+    # and videos[2]'s own list is recomputed to include it
+    async with factory() as session:
+        voter = User(id=str(uuid.uuid4()), email="v@example.com", display_name="V")
+        new_video = make_video(3)
+        session.add_all([voter, new_video])
+        await session.flush()
+        session.add_all([
+            Vote(id=str(uuid.uuid4()), user_id=voter.id, video_id=videos[2].id),
+            Vote(id=str(uuid.uuid4()), user_id=voter.id, video_id=new_video.id),
+        ])
+        await session.commit()
+
+    # Incremental runs patch the previous run's inputs instead of reloading them all
+    async def no_full_load(session):
+        raise AssertionError("incremental run streamed every source row")
+
+    monkeypatch.setattr(related_index, "load_inputs", no_full_load)
+    stats = await refresh_related_index(factory)
+    assert stats["mode"] == "incremental"
+    assert await neighbors_of(new_video.id) == [videos[2].id]
+    assert (await neighbors_of(videos[2].id))[0] == new_video.id
+
+    # A deactivated video drops out of the lists that held it
+    async with factory() as session:
+        video = await session.get(Video, videos[1].id)
+        video.is_active = False
+        await session.commit()
+    stats = await refresh_related_index(factory)
+    assert stats["mode"] == "incremental"
+    assert videos[1].id not in await neighbors_of(videos[0].id)
+    assert await neighbors_of(videos[1].id) == []
+    await engine.dispose()
@@ -0,0 +1,126 @@
+"""Tests for the sharded sitemap."""
+import uuid
+from datetime import timedelta
+
+import orjson
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base, utcnow
+from app.models.video import Video
+from app.services.sitemap import Sitemap
+from app.utils.metrics import metrics
+from tests.conftest import extract_token
+
+
+@pytest.mark.asyncio
+async def test_rebuild_only_regenerates_changed_shards(monkeypatch):
+    monkeypatch.setattr(settings, "sitemap_shard_size", 2)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    base = utcnow() - timedelta(days=1)
+
+    def make(i, updated_at=None):
+        # Seed rows look long unchanged; later inserts are stamped now
+        return Video(id=str(uuid.uuid4()), url=f"https://x.com/u/status/{i}", external_id=str(i),
+                     created_at=base + timedelta(minutes=i), updated_at=updated_at or utcnow())
+
+    def scanned():
+        return metrics.snapshot()["counters"].get("sitemap.shards_scanned", 0)
+
+    videos = [make(i, base) for i in range(5)]
+    async with factory() as session:
+        session.add_all(videos)
+        await session.commit()
+
+    sitemap = Sitemap()
+    async with factory() as session:
+        assert await sitemap.rebuild(session) == 3
+    assert [s.count for s in sitemap.shards] == [2, 2, 1]
+    first_etag = sitemap.shards[0].etag
+    full = orjson.loads(b"".join(sitemap.iter_full()))
+    assert [u["id"] for u in full["urls"]] == [v.id for v in videos]
+
+    # A new video only touches the last shard, which splits once full
+    async with factory() as session:
+        session.add(make(5))
+        await session.commit()
+        before = scanned()
+        assert await sitemap.rebuild(session) == 1
+        assert scanned() == before + 1
+        session.add(make(6))
+        await session.commit()
+        assert await sitemap.rebuild(session) == 1
+    assert sitemap.shards[0].etag == first_etag
+    assert [s.count for s in sitemap.shards] == [2, 2, 2, 1]
+    etags = [s.etag for s in sitemap.shards]
+
+    # Deactivating a video only shrinks its own shard; boundaries stay put
+    async with factory() as session:
+        await session.execute(update(Video).where(Video.id == videos[2].id).values(is_active=False))
+        await session.commit()
+        assert await sitemap.rebuild(session) == 1
+    assert [s.count for s in sitemap.shards] == [2, 1, 2, 1]
+    assert [s.etag for s in sitemap.shards] == [etags[0], sitemap.shards[1].etag, *etags[2:]]
+    assert sitemap.shards[1].etag != etags[1]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sitemap_endpoints(client, monkeypatch):
+    from app.services import sitemap as sitemap_module
+
+    monkeypatch.setattr(sitemap_module, "sitemap", Sitemap())
+    monkeypatch.setattr("app.routers.videos.sitemap", sitemap_module.sitemap)
+
+    res = await client.post("/api/auth/signup", json={
+        "email": "sitemap@example.com", "password": "password123", "display_name": "Sitemap",
+    })
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/424242", "category_slugs": []},
+        headers={"Authorization": f"Bearer {extract_token(res)}"},
+    )
+    video_id = res.json()["id"]
+
+    index = (await client.get("/api/videos/sitemap/index")).json()
+    assert [s["count"] for s in index["shards"]] == [1]
+    assert [u["id"] for u in (await client.get("/api/videos/sitemap")).json()["urls"]] == [video_id]
+
+    res = await client.get("/api/videos/sitemap/0")
+    assert res.json()["urls"][0]["id"] == video_id
+    assert res.headers["etag"] == index["shards"][0]["etag"]
+    res = await client.get("/api/videos/sitemap/0", headers={"If-None-Match": res.headers["etag"]})
+    assert res.status_code == 304
+    assert (await client.get("/api/videos/sitemap/1")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ensure_built_builds_once():
+    import asyncio
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    sitemap = Sitemap()
+    builds = 0
+    rebuild = sitemap._rebuild
+
+    async def counting_rebuild(session):
+        nonlocal builds
+        builds += 1
+        await asyncio.sleep(0.01)
+        return await rebuild(session)
+
+    sitemap._rebuild = counting_rebuild
+    async with factory() as a, factory() as b:
+        await asyncio.gather(sitemap.ensure_built(a), sitemap.ensure_built(b))
+    assert builds == 1
+    await engine.dispose()
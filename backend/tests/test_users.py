@@ -40,3 +40,31 @@ async def test_get_public_profile(client):
 async def test_get_public_profile_not_found(client):
     res = await client.get("/api/users/nonexistent-id-12345")
     assert res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_counters_follow_writes(client):
+    data, token = await _signup(client)
+    user_id = data["user"]["id"]
+    fan, fan_token = await _signup(client, "fan@example.com", "Fan")
+    fan_headers = {"Authorization": f"Bearer {fan_token}"}
+
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/444555666", "category_slugs": []},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    video_id = res.json()["id"]
+    await client.post(f"/api/follows/{user_id}", headers=fan_headers)
+    await client.post(f"/api/follows/{user_id}", headers=fan_headers)  # already following
+
+    body = (await client.get(f"/api/users/{user_id}")).json()
+    assert (body["total"], body["followers_count"], body["following_count"]) == (1, 1, 0)
+    counts = (await client.get(f"/api/follows/{fan['user']['id']}/counts")).json()
+    assert counts == {"followers_count": 0, "following_count": 1}
+
+    await client.delete(f"/api/follows/{user_id}", headers=fan_headers)
+    await client.delete(f"/api/follows/{user_id}", headers=fan_headers)  # not following
+    await client.delete(f"/api/videos/{video_id}", headers={"Authorization": f"Bearer {token}"})
+    body = (await client.get(f"/api/users/{user_id}")).json()
+    assert (body["total"], body["followers_count"], body["following_count"]) == (0, 0, 0)
@@ -67,3 +67,84 @@ async def test_health_check(client):
     res = await client.get("/api/health")
     assert res.status_code == 200
     assert res.json()["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_list_items_match_detail_response(client):
+    token = await _signup_and_get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/987654321", "category_slugs": [], "comment": "#猫"},
+        headers=headers,
+    )
+    video_id = res.json()["id"]
+
+    first = (await client.get("/api/videos", headers=headers)).json()["items"][0]
+    assert first["vote_count"] == 0 and first["user_voted"] is False
+
+    await client.post(f"/api/votes/{video_id}", headers=headers)
+    listed = (await client.get("/api/videos", headers=headers)).json()["items"][0]
+    detail = (await client.get(f"/api/videos/{video_id}", headers=headers)).json()
+    assert listed == detail
+    assert listed["vote_count"] == 1 and listed["user_voted"] is True
+    assert listed["tags"][0]["name"] == "猫"
+
+
+@pytest.mark.asyncio
+async def test_lite_list_and_embeds(client):
+    token = await _signup_and_get_token(client)
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/555666777", "category_slugs": []},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    video_id = res.json()["id"]
+
+    full = (await client.get("/api/videos")).json()["items"][0]
+    lite = (await client.get("/api/videos?lite=true")).json()["items"][0]
+    assert "oembed_html" in full
+    assert "oembed_html" not in lite
+    assert lite["id"] == full["id"] and lite["vote_count"] == full["vote_count"]
+
+    res = await client.get(f"/api/videos/embeds?ids={video_id},missing,{video_id}")
+    assert res.status_code == 200
+    assert res.json()["items"] == [{"id": video_id, "oembed_html": full["oembed_html"]}]
+
+
+@pytest.mark.asyncio
+async def test_category_counts_follow_submit_update_delete(client):
+    import uuid
+
+    from app.database import get_session
+    from app.main import app
+    from app.models.category import Category
+
+    async for session in app.dependency_overrides[get_session]():
+        session.add_all([
+            Category(id=str(uuid.uuid4()), slug="cat-a", name_ja="A", sort_order=1),
+            Category(id=str(uuid.uuid4()), slug="cat-b", name_ja="B", sort_order=2),
+        ])
+        await session.commit()
+
+    async def counts():
+        return {c["slug"]: c["video_count"] for c in (await client.get("/api/categories")).json()}
+
+    token = await _signup_and_get_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    res = await client.post(
+        "/api/videos",
+        json={"url": "https://x.com/user/status/31415926", "category_slugs": ["cat-a"]},
+        headers=headers,
+    )
+    video_id = res.json()["id"]
+    assert await counts() == {"cat-a": 1, "cat-b": 0}
+    listed = (await client.get("/api/videos?category=cat-a")).json()["items"]
+    assert [c["slug"] for c in listed[0]["categories"]] == ["cat-a"]
+
+    await client.patch(f"/api/videos/{video_id}", json={"category_slugs": ["cat-b"]}, headers=headers)
+    assert await counts() == {"cat-a": 0, "cat-b": 1}
+    assert (await client.get("/api/videos?category=cat-a")).json()["total"] == 0
+
+    await client.delete(f"/api/videos/{video_id}", headers=headers)
+    assert await counts() == {"cat-a": 0, "cat-b": 0}
@@ -1,5 +1,19 @@
+import asyncio
+import uuid
+
 import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.config import settings
+from app.database import Base, get_session
+from app.models.user import User
+from app.models.video import Video
+from app.models.vote import Vote
+from app.services.auth import create_access_token
+from app.utils.limiter import limiter
 from tests.conftest import extract_token
 
 
@@ -74,3 +88,89 @@ async def test_vote_nonexistent_video(client):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert res.status_code == 404
+
+
+@pytest_asyncio.fixture
+async def voting_crowd(tmp_path):
+    """File-backed DB (one connection per request) with 20 voters and a video."""
+    from app.main import app
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/votes.db", connect_args={"timeout": 30}
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    voters = [User(id=str(uuid.uuid4()), email=f"p{i}@example.com", display_name=f"P{i}") for i in range(20)]
+    owner = User(id=str(uuid.uuid4()), email="owner@example.com", display_name="Owner")
+    video = Video(
+        id=str(uuid.uuid4()), url="https://x.com/u/status/1", external_id="1",
+        submitted_by=owner.id,
+    )
+    async with factory() as session:
+        session.add_all([*voters, owner, video])
+        await session.commit()
+
+    async def override_get_session():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    limiter.enabled = False
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        def vote(user, method="post"):
+            headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+            return getattr(ac, method)(f"/api/votes/{video.id}", headers=headers)
+
+        yield factory, voters, video, vote
+
+    app.dependency_overrides.clear()
+    limiter.enabled = True
+    await engine.dispose()
+
+
+async def _counts(factory, video_id) -> tuple[int, int]:
+    async with factory() as session:
+        vote_count = (await session.execute(select(Video.vote_count).where(Video.id == video_id))).scalar()
+        vote_rows = (await session.execute(select(func.count()).select_from(Vote))).scalar()
+    return vote_count, vote_rows
+
+
+@pytest.mark.asyncio
+async def test_parallel_votes_are_race_free(voting_crowd):
+    """Many concurrent voters (and duplicate clicks) keep vote_count exact."""
+    factory, voters, video, vote = voting_crowd
+
+    # Every voter clicks twice at once: exactly one vote each
+    results = await asyncio.gather(*(vote(u) for u in voters for _ in range(2)))
+    codes = sorted(r.status_code for r in results)
+    assert codes.count(200) == len(voters)
+    assert codes.count(409) == len(voters)
+
+    # Half of them remove their vote concurrently
+    results = await asyncio.gather(*(vote(u, "delete") for u in voters[:10]))
+    assert all(r.status_code == 200 for r in results)
+
+    assert await _counts(factory, video.id) == (10, 10)
+
+
+@pytest.mark.asyncio
+async def test_buffered_vote_counts_flush_in_batch(voting_crowd, monkeypatch):
+    from app.services.vote_buffer import VoteCounterBuffer
+
+    factory, voters, video, vote = voting_crowd
+    buffer = VoteCounterBuffer()
+    monkeypatch.setattr(settings, "vote_buffer_enabled", True)
+    monkeypatch.setattr("app.routers.votes.vote_buffer", buffer)
+
+    results = await asyncio.gather(*(vote(u) for u in voters))
+    assert all(r.status_code == 200 for r in results)
+    # Responses include this worker's pending deltas
+    assert max(r.json()["new_vote_count"] for r in results) == len(voters)
+    await vote(voters[0], "delete")
+
+    # Vote rows are written immediately; the counter only on flush
+    assert await _counts(factory, video.id) == (0, 19)
+    assert await buffer.flush(factory) == 1
+    assert await _counts(factory, video.id) == (19, 19)
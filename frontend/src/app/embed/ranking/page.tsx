@@ -34,6 +34,7 @@ function EmbedRankingContent() {
       page: "1",
       per_page: String(count),
       period,
+      lite: "true",
     });
     if (category) params.set("category", category);
 
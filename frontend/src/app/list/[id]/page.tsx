@@ -6,6 +6,7 @@ import Link from "next/link";
 import { useAuth } from "@/contexts/AuthContext";
 import { apiGet, apiPatch, apiDelete, apiPost } from "@/lib/api";
 import type { PlaylistDetail } from "@/types/playlist";
+import type { Video } from "@/types/video";
 import { VideoCard } from "@/components/video/VideoCard";
 
 export default function PlaylistDetailPage() {
@@ -36,6 +37,20 @@ export default function PlaylistDetailPage() {
     fetchPlaylist();
   }, [fetchPlaylist]);
 
+  const loadMore = async () => {
+    if (!playlist?.next_cursor) return;
+    try {
+      const page = await apiGet<{ items: Video[]; next_cursor: string | null }>(
+        `/api/playlists/${id}/videos?cursor=${encodeURIComponent(playlist.next_cursor)}`,
+      );
+      setPlaylist((prev) =>
+        prev ? { ...prev, videos: [...prev.videos, ...page.items], next_cursor: page.next_cursor } : prev,
+      );
+    } catch (e) {
+      console.error("Failed to load more playlist videos:", e);
+    }
+  };
+
   const isOwner = user && playlist && playlist.owner.id === user.id;
 
   const handleRename = async () => {
@@ -185,6 +200,14 @@ export default function PlaylistDetailPage() {
               )}
             </div>
           ))}
+          {playlist.next_cursor && (
+            <button
+              onClick={loadMore}
+              className="w-full rounded-lg border border-border-main py-2.5 text-sm font-medium text-text-primary transition hover:bg-hover-bg"
+            >
+              もっと見る
+            </button>
+          )}
         </div>
       ) : (
         <p className="py-12 text-center text-text-muted">
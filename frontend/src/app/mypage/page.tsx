@@ -17,6 +17,13 @@ import type { TranslationKey } from "@/lib/i18n";
 interface Profile {
   submitted_videos: Video[];
   voted_videos: Video[];
+  submitted_next_cursor: string | null;
+  voted_next_cursor: string | null;
+}
+
+interface VideoPage {
+  items: Video[];
+  next_cursor: string | null;
 }
 
 function AvatarEditor({
@@ -337,6 +344,29 @@ export default function MyPage() {
       .finally(() => setLoading(false));
   }, [user, authLoading]);
 
+  const loadMore = async (section: "submitted" | "voted") => {
+    const videosKey = section === "submitted" ? "submitted_videos" : "voted_videos";
+    const cursorKey = section === "submitted" ? "submitted_next_cursor" : "voted_next_cursor";
+    const cursor = profile?.[cursorKey];
+    if (!cursor) return;
+    try {
+      const page = await apiGet<VideoPage>(
+        `/api/auth/profile/${section}?cursor=${encodeURIComponent(cursor)}`,
+      );
+      setProfile((prev) =>
+        prev
+          ? {
+              ...prev,
+              [videosKey]: [...prev[videosKey], ...page.items],
+              [cursorKey]: page.next_cursor,
+            }
+          : prev,
+      );
+    } catch {
+      setError(t("profileError"));
+    }
+  };
+
   const handleDeleteVideo = async (videoId: string) => {
     if (!confirm(t("confirmDelete"))) return;
     try {
@@ -445,6 +475,14 @@ export default function MyPage() {
                 )}
               </div>
             ))}
+            {profile.submitted_next_cursor && (
+              <button
+                onClick={() => loadMore("submitted")}
+                className="w-full rounded-lg border border-border-main py-2.5 text-sm font-medium text-text-primary transition hover:bg-hover-bg"
+              >
+                {t("loadMore")}
+              </button>
+            )}
           </div>
         ) : (
           <p className="py-8 text-center text-text-muted">
@@ -461,6 +499,14 @@ export default function MyPage() {
             {profile.voted_videos.map((video) => (
               <VideoCard key={video.id} video={video} />
             ))}
+            {profile.voted_next_cursor && (
+              <button
+                onClick={() => loadMore("voted")}
+                className="w-full rounded-lg border border-border-main py-2.5 text-sm font-medium text-text-primary transition hover:bg-hover-bg"
+              >
+                {t("loadMore")}
+              </button>
+            )}
           </div>
         ) : (
           <p className="py-8 text-center text-text-muted">
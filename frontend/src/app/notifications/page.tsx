@@ -115,7 +115,8 @@ export default function NotificationsPage() {
                     </Link>
                     {n.type === "vote" && (
                       <>
-                        さんがあなたの動画にいいねしました
+                        {n.actor_count > 1 ? `さん他${n.actor_count - 1}人が` : "さんが"}
+                        あなたの動画にいいねしました
                         {n.video_id && (
                           <Link href={`/video/${n.video_id}`} className="ml-1 text-brand-text hover:underline">
                             {n.video_title || "動画を見る"}
@@ -39,6 +39,7 @@ function RankingContent() {
         const params = new URLSearchParams({
           page: String(p),
           per_page: "20",
+          lite: "true",
         });
         if (category) params.set("category", category);
         if (activeTag) params.set("tag", activeTag);
@@ -35,6 +35,7 @@ function SearchContent() {
           q: query,
           page: String(p),
           per_page: "20",
+          lite: "true",
         });
         const data = await apiGet<PaginatedResponse<Video>>(
           `/api/videos?${params}`,
@@ -10,7 +10,7 @@ export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
   ];
 
   try {
-    const res = await fetch(`${API_URL}/api/sitemap`, { cache: "no-store" });
+    const res = await fetch(`${API_URL}/api/videos/sitemap`, { cache: "no-store" });
     if (res.ok) {
       const data = await res.json();
       const videoPages: MetadataRoute.Sitemap = data.urls.map((v: { id: string; created_at: string }) => ({
@@ -41,7 +41,7 @@ export default function UserProfilePage() {
   useEffect(() => {
     if (!id) return;
     setLoading(true);
-    apiGet<UserProfile>(`/api/users/${id}?page=1&per_page=20`)
+    apiGet<UserProfile>(`/api/users/${id}?page=1&per_page=20&lite=true`)
       .then((data) => {
         setUser(data.user);
         setVideos(data.submitted_videos);
@@ -59,7 +59,7 @@ export default function UserProfilePage() {
     if (loadingMore || !hasNext) return;
     setLoadingMore(true);
     const nextPage = page + 1;
-    apiGet<UserProfile>(`/api/users/${id}?page=${nextPage}&per_page=20`)
+    apiGet<UserProfile>(`/api/users/${id}?page=${nextPage}&per_page=20&lite=true`)
       .then((data) => {
         setVideos((prev) => [...prev, ...data.submitted_videos]);
         setHasNext(data.has_next);
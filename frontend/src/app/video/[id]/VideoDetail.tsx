@@ -31,7 +31,7 @@ export default function VideoDetail({ id }: VideoDetailProps) {
       .then((data) => {
         setVideo(data);
         // Fetch related videos by shared categories & tags
-        apiGet<PaginatedResponse<Video>>(`/api/videos/${id}/related?limit=6`)
+        apiGet<PaginatedResponse<Video>>(`/api/videos/${id}/related?limit=6&lite=true`)
           .then((rel) => setRelated(rel.items))
           .catch((e) => { console.error("Failed to fetch related videos:", e); });
       })
@@ -77,7 +77,7 @@ export default function VideoDetail({ id }: VideoDetailProps) {
       <div className="overflow-hidden rounded-xl border border-border-main bg-surface shadow-sm">
         <div className="p-4">
           <VideoEmbed
-            oembedHtml={video.oembed_html}
+            oembedHtml={video.oembed_html ?? null}
             platform={video.platform}
             url={video.url}
             externalId={video.external_id}
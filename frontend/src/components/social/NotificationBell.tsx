@@ -4,6 +4,7 @@ import { useEffect, useState, useRef, useCallback } from "react";
 import Link from "next/link";
 import { useAuth } from "@/contexts/AuthContext";
 import { apiGet, apiPost } from "@/lib/api";
+import { API_URL } from "@/lib/constants";
 import type { Notification, NotificationListResponse } from "@/types/notification";
 
 export function NotificationBell() {
@@ -17,17 +18,38 @@ export function NotificationBell() {
 
   const userId = user?.id;
 
-  // Poll unread count
+  // Live unread count via Server-Sent Events; fall back to polling
   useEffect(() => {
     if (!userId) return;
+    let interval: ReturnType<typeof setInterval> | undefined;
     const fetchCount = () => {
       apiGet<{ count: number }>("/api/notifications/unread-count")
         .then((data) => setCount(data.count))
         .catch((e) => { console.error("Failed to fetch unread notification count:", e); });
     };
-    fetchCount();
-    const interval = setInterval(fetchCount, 60000);
-    return () => clearInterval(interval);
+    const startPolling = () => {
+      if (interval) return;
+      fetchCount();
+      interval = setInterval(fetchCount, 60000);
+    };
+
+    let source: EventSource | undefined;
+    if (typeof EventSource !== "undefined") {
+      source = new EventSource(`${API_URL}/api/notifications/stream`, { withCredentials: true });
+      source.addEventListener("unread_count", (e) => {
+        setCount(JSON.parse((e as MessageEvent).data).count);
+      });
+      source.onerror = () => {
+        // Browser retries automatically; keep the badge fresh meanwhile
+        if (source?.readyState === EventSource.CLOSED) startPolling();
+      };
+    } else {
+      startPolling();
+    }
+    return () => {
+      source?.close();
+      if (interval) clearInterval(interval);
+    };
   }, [userId]);
 
   // Close on outside click
@@ -46,6 +46,7 @@ const translations = {
     likedVideos: "いいねした動画",
     noSubmitted: "まだ動画を投稿していません。",
     noLiked: "まだ動画にいいねしていません。",
+    loadMore: "もっと見る",
     myList: "マイリスト",
     newListName: "新しいリスト名",
     create: "作成",
@@ -223,6 +224,7 @@ const translations = {
     likedVideos: "Liked Videos",
     noSubmitted: "You haven't submitted any videos yet.",
     noLiked: "You haven't liked any videos yet.",
+    loadMore: "Load more",
     myList: "My Lists",
     newListName: "New list name",
     create: "Create",
@@ -4,6 +4,8 @@ export interface Notification {
   id: string;
   type: "vote" | "follow";
   actor: UserBrief;
+  actor_count: number;
+  recent_actors: UserBrief[];
   video_id: string | null;
   video_title: string | null;
   is_read: boolean;
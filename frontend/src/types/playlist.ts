@@ -11,6 +11,7 @@ export interface Playlist {
 export interface PlaylistDetail extends Playlist {
   owner: UserBrief;
   videos: Video[];
+  next_cursor: string | null;
 }
 
 export interface PlaylistListResponse {
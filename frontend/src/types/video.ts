@@ -10,7 +10,8 @@ export interface Video {
   platform: "x" | "youtube" | "tiktok";
   author_name: string | null;
   author_url: string | null;
-  oembed_html: string | null;
+  /** Omitted by list endpoints in lite mode; see /api/videos/embeds */
+  oembed_html?: string | null;
   title: string | null;
   comment: string | null;
   categories: Category[];